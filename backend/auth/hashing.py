@@ -0,0 +1,145 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from passlib.context import CryptContext
+
+from backend.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+class HashingPoolBusy(Exception):
+    """
+    Raised when the hashing pool already has as many jobs as it is allowed to hold.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop on a bounded worker pool.
+
+    executor_kind:
+      - "thread": ThreadPoolExecutor (bcrypt releases the GIL while hashing)
+      - "process": ProcessPoolExecutor
+      - "inline": hash on the event loop (the old behaviour, kept for benchmarking)
+
+    At most `max_workers + max_queue` jobs are admitted at once; anything beyond
+    that fails fast with HashingPoolBusy instead of queueing without bound. A job
+    holds its slot until the pool is done with it, even when the request waiting
+    for it was cancelled (e.g. the client went away).
+    """
+
+    def __init__(self, executor_kind: str, max_workers: int, max_queue: int):
+        if executor_kind not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown password hash executor: {executor_kind}")
+        self.executor_kind = executor_kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_kind,
+            "in_flight": self.in_flight,
+            "capacity": self.capacity,
+            "rejected": self.rejected,
+        }
+
+    async def _submit(self, fn: Callable, *args):
+        if self.executor_kind == "inline":
+            return fn(*args)
+
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise HashingPoolBusy()
+
+        try:
+            return await self._run(fn, *args)
+        except BrokenExecutor:
+            # The broken pool was dropped by _run; try once more on a fresh one
+            return await self._run(fn, *args)
+
+    async def _run(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenExecutor:
+            self._discard(executor)
+            raise
+        self.in_flight += 1
+
+        def done(_):
+            # Runs in a pool thread once the job has finished or was cancelled before starting
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                pass  # the loop is already closed
+
+        future.add_done_callback(done)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenExecutor:
+            self._discard(executor)
+            raise
+
+    def _discard(self, executor: Executor) -> None:
+        """
+        A process pool whose worker died (killed by the OOM killer, say) refuses all
+        further jobs, so it is replaced on next use.
+        """
+        if self._executor is executor:
+            print("Password hashing pool is broken, starting a new one")
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                # bcrypt only needs passlib, so workers start from a clean interpreter
+                # instead of a fork of the running server (its sockets, its Mongo client)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
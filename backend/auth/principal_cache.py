@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from backend.config import settings
+from backend.models.user import UserResponse
+
+PrincipalLoader = Callable[[str], Awaitable[Optional[UserResponse]]]
+
+
+class PrincipalCache:
+    """
+    In-process TTL + LRU cache of authenticated users, keyed by the token subject (email).
+    Concurrent misses for the same subject are coalesced into a single loader call.
+    If the request running that call is cancelled, the ones waiting on it retry
+    rather than fail with it.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, UserResponse]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    async def get(self, subject: str, loader: PrincipalLoader) -> Optional[UserResponse]:
+        if not self.enabled:
+            return await loader(subject)
+
+        entry = self._entries.get(subject)
+        if entry is not None:
+            expires_at, principal = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(subject)
+                self.hits += 1
+                return principal
+            del self._entries[subject]
+
+        self.misses += 1
+        while (pending := self._inflight.get(subject)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Only swallow the cancellation of the loading request, not our own
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[subject] = future
+        try:
+            principal = await loader(subject)
+        except asyncio.CancelledError:
+            self._release(subject, future)
+            future.cancel()
+            raise
+        except Exception as exc:
+            self._release(subject, future)
+            future.set_exception(exc)
+            # Mark the exception as retrieved in case nobody else was waiting on it
+            future.exception()
+            raise
+
+        # Only store the result if the subject wasn't invalidated while we were loading
+        if self._release(subject, future) and principal is not None:
+            self._store(subject, principal)
+        future.set_result(principal)
+        return principal
+
+    def invalidate(self, subject: str) -> None:
+        """
+        Drop a cached principal. Call this whenever the user document changes.
+        """
+        self._entries.pop(subject, None)
+        self._inflight.pop(subject, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _release(self, subject: str, future: asyncio.Future) -> bool:
+        if self._inflight.get(subject) is future:
+            del self._inflight[subject]
+            return True
+        return False
+
+    def _store(self, subject: str, principal: UserResponse) -> None:
+        self._entries[subject] = (time.monotonic() + self.ttl_seconds, principal)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
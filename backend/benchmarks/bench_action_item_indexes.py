@@ -0,0 +1,88 @@
+"""
+Action item index benchmark.
+
+Seeds one user's action items spread over many meetings in the configured MongoDB
+and runs `explain` (executionStats) on each GET /action-items/ query shape, so the
+keys and documents examined per returned item show whether an index serves the
+whole filter. The meeting filter is also run against the (user_id, status, _id)
+index it used to fall back to, for comparison:
+
+    python backend/benchmarks/bench_action_item_indexes.py --items 20000 --meetings 200
+
+The user's action items are removed again at the end.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from bson import ObjectId  # noqa: E402
+
+from backend.database import db  # noqa: E402
+from backend.indexes import _plan_stages, ensure_indexes  # noqa: E402
+
+
+async def seed(user_id: str, items: int, meeting_ids: list):
+    start = datetime(2024, 1, 1, 9)
+    await db.action_items.insert_many([{
+        "description": f"Task: benchmark follow-up {n}",
+        "action_type": "Task",
+        "status": "Pending" if n % 4 else "Executed",
+        "owner": f"person{n % 7}@example.com",
+        "due_date": start + timedelta(days=n % 30),
+        "meeting_id": meeting_ids[n % len(meeting_ids)],
+        "user_id": user_id,
+    } for n in range(items)])
+
+
+async def explain(query: dict, sort: list, limit: int, hint=None) -> dict:
+    command = {"find": "action_items", "filter": query, "sort": dict(sort), "limit": limit}
+    if hint:
+        command["hint"] = hint
+    started = time.perf_counter()
+    result = await db.command("explain", command, verbosity="executionStats")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats = result["executionStats"]
+    stages = _plan_stages(result["queryPlanner"]["winningPlan"])
+    index_names = [stage["indexName"] for stage in stages if "indexName" in stage]
+    return {
+        "index": ", ".join(index_names) or "COLLSCAN",
+        "keys": stats["totalKeysExamined"],
+        "docs": stats["totalDocsExamined"],
+        "returned": stats["nReturned"],
+        "ms": elapsed_ms,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20000, help="action items for the user")
+    parser.add_argument("--meetings", type=int, default=200, help="meetings the items are spread over")
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    args = parser.parse_args()
+
+    await ensure_indexes()
+    user_id = str(ObjectId())
+    meeting_ids = [str(ObjectId()) for _ in range(args.meetings)]
+    shapes = [
+        ("status", {"user_id": user_id, "status": "Pending"}, [("_id", 1)], None),
+        ("status, due_date", {"user_id": user_id, "status": {"$in": ["Pending", "Executed"]}}, [("due_date", 1), ("_id", 1)], None),
+        ("meeting, status", {"user_id": user_id, "status": "Pending", "meeting_id": meeting_ids[-1]}, [("_id", 1)], None),
+        ("meeting, status (old index)", {"user_id": user_id, "status": "Pending", "meeting_id": meeting_ids[-1]}, [("_id", 1)], "user_status_id"),
+    ]
+    try:
+        await seed(user_id, args.items, meeting_ids)
+        print(f"{'query':<28} {'index':<24} {'keys':>7} {'docs':>7} {'returned':>9} {'ms':>8}")
+        for name, query, sort, hint in shapes:
+            result = await explain(query, sort, args.limit, hint)
+            print(f"{name:<28} {result['index']:<24} {result['keys']:>7} {result['docs']:>7} {result['returned']:>9} {result['ms']:>8.1f}")
+    finally:
+        await db.action_items.delete_many({"user_id": user_id})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""
+Email delivery throughput benchmark.
+
+Sends --messages emails to an SMTP server and reports messages per second for:
+
+  connection per message   connect, send, quit for every message (the naive way)
+  pooled + batched         EmailDeliveryService over SMTPTransport
+
+By default a local aiosmtpd sink is started as the server (pip install aiosmtpd);
+pass --host/--port to benchmark against a real relay instead:
+
+    python backend/benchmarks/bench_email_delivery.py --messages 2000 --pool-size 4 --batch-size 50
+"""
+import argparse
+import asyncio
+import os
+import smtplib
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.services.email_delivery import EmailDeliveryService, SMTPTransport  # noqa: E402
+
+
+class Sink:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+
+def start_sink():
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        print("No --host given and aiosmtpd is not installed: pip install aiosmtpd")
+        exit(1)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    sink = Sink()
+    controller = Controller(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    return controller, port
+
+
+def make_message(n: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "bench@example.com"
+    message["To"] = f"recipient{n}@example.com"
+    message["Subject"] = f"Benchmark message {n}"
+    message.set_content("Action item: follow up on the quarterly report.\n" * 5)
+    return message
+
+
+def connection_per_message(host, port, messages, concurrency):
+    def send(message):
+        with smtplib.SMTP(host, port, timeout=30) as connection:
+            connection.send_message(message)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, messages))
+
+
+async def pooled(host, port, messages, pool_size, batch_size):
+    transport = SMTPTransport(host, port, pool_size=pool_size)
+    delivery = EmailDeliveryService(transport, batch_size=batch_size, linger_seconds=0.005, rate_per_minute=0, burst=0)
+    delivery.start()
+    try:
+        await asyncio.gather(*(delivery.send(f"user-{n % 50}", message) for n, message in enumerate(messages)))
+        return delivery.stats()
+    finally:
+        await delivery.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="SMTP server to use instead of a local aiosmtpd sink")
+    parser.add_argument("--port", type=int, default=25)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=4, help="connections (and threads for the naive run)")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    controller = None
+    host, port = args.host, args.port
+    if not host:
+        controller, port = start_sink()
+        host = "127.0.0.1"
+
+    messages = [make_message(n) for n in range(args.messages)]
+    try:
+        started = time.perf_counter()
+        connection_per_message(host, port, messages, args.pool_size)
+        naive_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        stats = asyncio.run(pooled(host, port, messages, args.pool_size, args.batch_size))
+        pooled_elapsed = time.perf_counter() - started
+    finally:
+        if controller is not None:
+            controller.stop()
+
+    print(f"{'mode':<24} {'messages/s':>12} {'connections':>12}")
+    print(f"{'connection per message':<24} {args.messages / naive_elapsed:>12,.0f} {args.messages:>12}")
+    print(f"{'pooled + batched':<24} {args.messages / pooled_elapsed:>12,.0f} "
+          f"{stats['transport']['connections_opened']:>12}")
+    print(f"batches: {stats['batches']}, avg size {stats['avg_batch_size']:.1f}, "
+          f"avg latency {stats['avg_latency_ms']:.1f} ms, failed {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
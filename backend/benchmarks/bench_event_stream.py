@@ -0,0 +1,165 @@
+"""
+Event stream load test.
+
+Opens --connections idle GET /events/stream connections against a running server,
+spread over --users users (keep it within EVENTS_MAX_CONNECTIONS_PER_USER per
+user), then has every user create action items and measures how long each event
+takes to reach all of that user's streams:
+
+    python backend/benchmarks/bench_event_stream.py --url http://localhost:8000 \\
+        --connections 5000 --users 1000 --rounds 3 --server-pid $(pgrep -f "backend/main.py")
+
+With --server-pid the server's resident memory is read from /proc before and
+after the streams are opened, giving the memory cost per idle connection. Both
+this process and the server need a file descriptor limit above --connections
+(ulimit -n). The users and action items the test creates are not removed.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+PASSWORD = "password123"
+
+
+def server_rss_mb(pid: Optional[int]) -> Optional[float]:
+    if not pid:
+        return None
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+class Stream:
+    """
+    A bare-bones SSE client on a raw socket, to keep the load generator cheap at
+    thousands of connections.
+    """
+
+    def __init__(self, host: str, port: int, token: str):
+        self.host, self.port, self.token = host, port, token
+        self.opened = asyncio.Event()
+        self.waiter: Optional[asyncio.Future] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(
+            f"GET /events/stream?token={self.token} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Accept: text/event-stream\r\n\r\n".encode()
+        )
+        await writer.drain()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                # Chunk size lines of the chunked encoding are skipped along with the rest
+                if line.startswith(b"event: hello"):
+                    self.opened.set()
+                elif line.startswith(b"data: "):
+                    data = json.loads(line[len(b"data: "):])
+                    if data.get("type") == "action_item.created" and self.waiter and not self.waiter.done():
+                        self.waiter.set_result(time.perf_counter())
+        finally:
+            writer.close()
+
+    def expect(self) -> asyncio.Future:
+        """
+        Resolves with the arrival time of the next action_item.created event.
+        """
+        self.waiter = asyncio.get_running_loop().create_future()
+        return self.waiter
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3, help="action items created per user")
+    parser.add_argument("--server-pid", type=int, help="read the server's RSS from /proc")
+    args = parser.parse_args()
+
+    target = urlsplit(args.url)
+    host, port = target.hostname, target.port or 80
+    run_id = uuid.uuid4().hex[:8]
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+        print(f"Signing up {args.users} users...")
+        semaphore = asyncio.Semaphore(20)
+
+        async def login(n: int) -> str:
+            credentials = {"email": f"bench_events_{run_id}_{n}@example.com", "password": PASSWORD}
+            async with semaphore:
+                await client.post("/auth/signup", json=credentials)
+                response = await client.post("/auth/login", json=credentials)
+            return response.json()["access_token"]
+
+        tokens = await asyncio.gather(*(login(n) for n in range(args.users)))
+
+        rss_before = server_rss_mb(args.server_pid)
+        streams: List[Stream] = [Stream(host, port, tokens[n % args.users]) for n in range(args.connections)]
+        started = time.perf_counter()
+        for stream in streams:
+            stream.task = asyncio.create_task(stream.run())
+        await asyncio.wait_for(asyncio.gather(*(stream.opened.wait() for stream in streams)), timeout=120)
+        open_seconds = time.perf_counter() - started
+        # Let the server settle before measuring its memory
+        await asyncio.sleep(1)
+        rss_after = server_rss_mb(args.server_pid)
+        print(f"Opened {args.connections} streams in {open_seconds:.1f}s")
+        if rss_before is not None and rss_after is not None:
+            per_connection_kb = (rss_after - rss_before) * 1024 / args.connections
+            print(f"Server RSS {rss_before:.0f} MB -> {rss_after:.0f} MB, ~{per_connection_kb:.1f} KB per idle stream")
+
+        streams_by_token: Dict[str, List[Stream]] = {}
+        for stream in streams:
+            streams_by_token.setdefault(stream.token, []).append(stream)
+
+        latencies = []
+        for round_number in range(args.rounds):
+            async def create(token: str):
+                headers = {"Authorization": f"Bearer {token}"}
+                async with semaphore:
+                    # The event can arrive before the response, so wait for it first
+                    waiters = [stream.expect() for stream in streams_by_token[token]]
+                    sent = time.perf_counter()
+                    await client.post(
+                        "/action-items/", json={"description": f"Bench {round_number}", "action_type": "Task"}, headers=headers
+                    )
+                try:
+                    arrived = await asyncio.wait_for(asyncio.gather(*waiters), timeout=30)
+                except asyncio.TimeoutError:
+                    return None
+                # Time until the last of the user's streams had the event
+                return (max(arrived) - sent) * 1000
+
+            results = await asyncio.gather(*(create(token) for token in tokens))
+            latencies.extend(result for result in results if result is not None)
+            missed = sum(result is None for result in results)
+            print(f"Round {round_number + 1}: {len(results) - missed} events fanned out, {missed} missed")
+
+        if latencies:
+            latencies.sort()
+            print(f"Fan-out latency: p50 {statistics.median(latencies):.1f} ms, "
+                  f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f} ms, max {latencies[-1]:.1f} ms")
+
+        health = (await client.get("/healthz")).json()
+        print(f"Broker: {health.get('events')}")
+
+        for stream in streams:
+            stream.task.cancel()
+        await asyncio.gather(*(stream.task for stream in streams), return_exceptions=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""
+Action item extraction micro-benchmark.
+
+Generates synthetic meeting transcripts (1 MB and 50 MB by default, about one
+action line in ten), then reports lines per second and peak traced memory for:
+
+  split + 3x re.match   the previous extract_action_items_from_text
+  engine (text)         ActionExtractor over an in-memory string
+  engine (stream)       ActionExtractor over the open transcript file
+
+    python backend/benchmarks/bench_extraction.py --sizes 1 50
+
+Throughput and memory are measured in separate runs because tracemalloc slows
+every allocation down. The peak of the text runs includes the transcript itself.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.models.action_item import ActionStatus, ActionType  # noqa: E402
+from backend.services.extraction import action_extractor  # noqa: E402
+
+CHATTER = [
+    "Alice: I think we should revisit the onboarding numbers before the board meeting.",
+    "Bob: Agreed, the drop-off after the second step is still too high.",
+    "Carol: Marketing wants a decision by the end of the quarter.",
+    "Dave: Let's keep the scope small for the first iteration.",
+]
+ACTIONS = [
+    "Action: Update the onboarding funnel report due 2024-03-01",
+    "Email: Send the revised numbers to the board",
+    "Invite: Schedule a follow-up with marketing",
+    "TODO: Draft the first iteration scope",
+    "Next Step: Review drop-off analytics, deadline 2024-04-15",
+]
+
+
+def legacy_extract(text):
+    """
+    The previous implementation, kept here for comparison.
+    """
+    items = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        description = None
+        action_type = ActionType.TASK
+        action_match = re.match(r"^(?:Action|Task|TODO|Next Step):\s*(.*)", line, re.IGNORECASE)
+        email_match = re.match(r"^(?:Email|Contact):\s*(.*)", line, re.IGNORECASE)
+        invite_match = re.match(r"^(?:Invite|Schedule):\s*(.*)", line, re.IGNORECASE)
+        if email_match:
+            description = line
+            action_type = ActionType.EMAIL
+        elif invite_match:
+            description = line
+            action_type = ActionType.INVITE
+        elif action_match:
+            description = action_match.group(1).strip()
+        if description:
+            items.append({"description": description, "action_type": action_type, "status": ActionStatus.PENDING})
+    return items
+
+
+def write_transcript(path, size_mb):
+    target = size_mb * 1024 * 1024
+    written = lines = 0
+    with open(path, "w") as f:
+        while written < target:
+            line = ACTIONS[lines // 10 % len(ACTIONS)] if lines % 10 == 9 else CHATTER[lines % len(CHATTER)]
+            f.write(line + "\n")
+            written += len(line) + 1
+            lines += 1
+    return lines
+
+
+def run_legacy(path):
+    with open(path) as f:
+        return len(legacy_extract(f.read()))
+
+
+def run_engine_text(path):
+    with open(path) as f:
+        return sum(1 for _ in action_extractor.extract_text(f.read()))
+
+
+def run_engine_stream(path):
+    with open(path) as f:
+        return sum(1 for _ in action_extractor.extract(f))
+
+
+def measure(run, path):
+    started = time.perf_counter()
+    items = run(path)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    run(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50], help="transcript sizes in MB")
+    args = parser.parse_args()
+
+    runs = [("split + 3x re.match", run_legacy), ("engine (text)", run_engine_text), ("engine (stream)", run_engine_stream)]
+    print(f"{'size':>6} {'path':<20} {'items':>8} {'lines/s':>12} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"transcript_{size}mb.txt")
+            lines = write_transcript(path, size)
+            for name, run in runs:
+                items, elapsed, peak = measure(run, path)
+                print(f"{size:>4}MB {name:<20} {items:>8} {lines / elapsed:>12,.0f} {peak / 2 ** 20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
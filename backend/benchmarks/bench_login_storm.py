@@ -0,0 +1,89 @@
+"""
+Login storm benchmark.
+
+Fires concurrent /auth/login requests at a running server while a probe
+thread keeps calling an unrelated endpoint, then reports the probe's latency
+percentiles. Run it once against a server started with
+PASSWORD_HASH_EXECUTOR=inline (bcrypt on the event loop, the old behaviour)
+and once with PASSWORD_HASH_EXECUTOR=thread to compare:
+
+    python backend/benchmarks/bench_login_storm.py --logins 16 --duration 10
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+
+
+def make_request(host, port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        conn.request(method, path, body, headers or {})
+        response = conn.getresponse()
+        return response.status, response.read().decode()
+    finally:
+        conn.close()
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--logins", type=int, default=16, help="concurrent login threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="storm duration in seconds")
+    parser.add_argument("--probe-path", default="/healthz", help="unrelated endpoint to measure")
+    args = parser.parse_args()
+
+    headers = {"Content-type": "application/json"}
+    email = f"storm_tester{random.randint(1000, 9999)}@example.com"
+    credentials = json.dumps({"email": email, "password": "password123"})
+    status, _ = make_request(args.host, args.port, "POST", "/auth/signup", credentials, headers)
+    if status not in (201, 400):
+        print(f"Signup failed with status {status}")
+        exit(1)
+
+    stop_at = time.monotonic() + args.duration
+    login_statuses = {}
+    probe_latencies = []
+    lock = threading.Lock()
+
+    def login_worker():
+        while time.monotonic() < stop_at:
+            status, _ = make_request(args.host, args.port, "POST", "/auth/login", credentials, headers)
+            with lock:
+                login_statuses[status] = login_statuses.get(status, 0) + 1
+
+    def probe_worker():
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            make_request(args.host, args.port, "GET", args.probe_path)
+            probe_latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=login_worker) for _ in range(args.logins)]
+    threads.append(threading.Thread(target=probe_worker))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"--- Login storm: {args.logins} threads for {args.duration}s ---")
+    print(f"Login responses by status: {login_statuses}")
+    print(f"Probe {args.probe_path}: {len(probe_latencies)} requests")
+    for pct in (50, 90, 99):
+        print(f"  p{pct}: {percentile(probe_latencies, pct):.1f} ms")
+    print(f"  max: {max(probe_latencies, default=0):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Action item extraction write-path benchmark.
+
+Calls process_meeting_actions directly against the configured MongoDB for
+summaries of 10, 100 and 1000 action lines and reports the Mongo round-trips
+and latency of each run, next to the previous per-item insert_one + find_one
+loop for comparison:
+
+    python backend/benchmarks/bench_process_meeting.py --sizes 10 100 1000 --repeat 3
+
+Every document the benchmark creates is removed again at the end.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+
+class CommandCounter(monitoring.CommandListener):
+    """
+    Counts the commands sent to MongoDB, i.e. the round-trips.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name in ("insert", "find", "update", "delete"):
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Must be registered before the Motor client is created
+counter = CommandCounter()
+monitoring.register(counter)
+
+from bson import ObjectId  # noqa: E402
+
+from backend.database import db  # noqa: E402
+from backend.models.action_item import ActionItem  # noqa: E402
+from backend.models.user import UserResponse  # noqa: E402
+from backend.routers.action_items import extract_action_items_from_text, process_meeting_actions  # noqa: E402
+
+PREFIXES = ["Action", "Task", "Email", "Invite", "TODO", "Schedule"]
+
+
+def build_summary(lines: int) -> str:
+    return "\n".join(f"{PREFIXES[i % len(PREFIXES)]}: follow up on item {i}" for i in range(lines))
+
+
+async def per_item_loop(meeting_id: str, summary_text: str, current_user: UserResponse):
+    """
+    The previous implementation: one insert_one and one find_one per item.
+    """
+    await db.meetings.find_one({"_id": ObjectId(meeting_id), "user_id": ObjectId(current_user.id)})
+    created_items = []
+    for item_data in extract_action_items_from_text(summary_text):
+        new_item = ActionItem(**item_data, user_id=current_user.id, meeting_id=meeting_id)
+        result = await db.action_items.insert_one(new_item.model_dump(by_alias=True, exclude=["id"]))
+        created_items.append(await db.action_items.find_one({"_id": result.inserted_id}))
+    return created_items
+
+
+async def measure(path, meeting_id: str, summary_text: str, user: UserResponse, repeat: int):
+    latencies = []
+    round_trips = 0
+    for _ in range(repeat):
+        counter.count = 0
+        started = time.perf_counter()
+        await path(meeting_id, summary_text, user)
+        latencies.append((time.perf_counter() - started) * 1000)
+        round_trips = counter.count
+    return round_trips, sorted(latencies)[len(latencies) // 2]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="action lines per summary")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size, the median latency is reported")
+    args = parser.parse_args()
+
+    user_id = ObjectId()
+    user = UserResponse(_id=str(user_id), email=f"bench_{user_id}@example.com")
+    meeting = await db.meetings.insert_one({"user_id": user_id, "title": "Benchmark meeting"})
+    meeting_id = str(meeting.inserted_id)
+
+    print(f"{'lines':>6} {'path':<14} {'round-trips':>12} {'median ms':>10}")
+    try:
+        for size in args.sizes:
+            summary_text = build_summary(size)
+            for name, path in (("per-item loop", per_item_loop), ("insert_many", process_meeting_actions)):
+                round_trips, latency = await measure(path, meeting_id, summary_text, user, args.repeat)
+                print(f"{size:>6} {name:<14} {round_trips:>12} {latency:>10.1f}")
+    finally:
+        await db.action_items.delete_many({"user_id": str(user_id)})
+        await db.meetings.delete_one({"_id": meeting.inserted_id})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""
+List endpoint serialization benchmark.
+
+Drives the app in-process (httpx over ASGI) against the configured MongoDB and
+reports requests per second for full pages of GET /meetings/ and GET /action-items/,
+once through the response_model path and once through the fast path of
+backend/serialization.py, and checks both return the same JSON:
+
+    python backend/benchmarks/bench_serialization.py --documents 1000 --requests 50
+
+The routes are switched by changing FAST_SERIALIZATION_ROUTES in-process. The
+user, meetings and action items the benchmark creates are removed again at the end.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from bson import ObjectId  # noqa: E402
+
+from backend.config import settings  # noqa: E402
+from backend.database import db  # noqa: E402
+from backend.indexes import ensure_indexes  # noqa: E402
+from backend.main import app  # noqa: E402
+
+PASSWORD = "password123"
+
+
+async def seed(user_id: str, documents: int):
+    start = datetime(2024, 1, 1, 9)
+    await db.meetings.insert_many([{
+        "user_id": ObjectId(user_id),
+        "google_event_id": f"bench-{n}",
+        "title": f"Benchmark meeting {n}",
+        "start_time": start + timedelta(minutes=30 * n),
+        "end_time": start + timedelta(minutes=30 * n + 25),
+        "is_online": n % 2 == 0,
+        "location": "https://meet.example.com/bench",
+        "participants": [f"person{n % 7}@example.com", f"person{n % 11}@example.com"],
+        "status": "pending",
+    } for n in range(documents)])
+    await db.action_items.insert_many([{
+        "description": f"Task: benchmark follow-up {n}",
+        "action_type": "Task",
+        "status": "Pending",
+        "owner": f"person{n % 7}@example.com",
+        "due_date": start + timedelta(days=n % 30),
+        "meeting_id": str(ObjectId()),
+        "user_id": user_id,
+        "created_at": start + timedelta(seconds=n),
+    } for n in range(documents)])
+
+
+async def throughput(client, url, headers, requests):
+    body = (await client.get(url, headers=headers)).content
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(url, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code}: {response.text}")
+    return requests / (time.perf_counter() - started), body
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1000, help="meetings and action items per page")
+    parser.add_argument("--requests", type=int, default=50, help="requests per endpoint and mode")
+    args = parser.parse_args()
+
+    await ensure_indexes()
+    email = f"bench_serialization_{uuid.uuid4().hex[:8]}@example.com"
+    credentials = {"email": email, "password": PASSWORD}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/signup", json=credentials)
+        token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        user_id = (await client.get("/auth/me", headers=headers)).json()["_id"]
+
+        endpoints = [
+            ("GET /meetings/", "read_meetings", f"/meetings/?limit={args.documents}"),
+            ("GET /action-items/", "get_action_items", f"/action-items/?limit={args.documents}"),
+        ]
+        configured = settings.FAST_SERIALIZATION_ROUTES
+        try:
+            await seed(user_id, args.documents)
+            print(f"{'endpoint':<20} {'response_model req/s':>21} {'fast req/s':>11} {'speedup':>8}")
+            for name, route, url in endpoints:
+                settings.FAST_SERIALIZATION_ROUTES = ""
+                baseline, expected = await throughput(client, url, headers, args.requests)
+                settings.FAST_SERIALIZATION_ROUTES = route
+                fast, body = await throughput(client, url, headers, args.requests)
+                if body != expected:
+                    raise RuntimeError(f"{name}: the fast path returned different JSON")
+                print(f"{name:<20} {baseline:>21,.1f} {fast:>11,.1f} {fast / baseline:>7.2f}x")
+        finally:
+            settings.FAST_SERIALIZATION_ROUTES = configured
+            await db.action_items.delete_many({"user_id": user_id})
+            await db.meetings.delete_many({"user_id": ObjectId(user_id)})
+            await db.users.delete_one({"email": email})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
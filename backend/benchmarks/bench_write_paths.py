@@ -0,0 +1,137 @@
+"""
+Write path round-trip benchmark.
+
+Drives the app in-process (httpx over ASGI, no network hop to the API) against
+the configured MongoDB and reports, per mutating endpoint, the Mongo commands
+each request issues and the median latency:
+
+    python backend/benchmarks/bench_write_paths.py --repeat 50
+
+The authenticated principal is warmed before every measured request, so the
+counts are the endpoint's own round-trips. Run the script on an older revision
+to compare against the find -> update -> find versions. Every user, meeting and
+action item the benchmark creates is removed again at the end.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+
+class CommandCounter(monitoring.CommandListener):
+    """
+    Counts the commands sent to MongoDB, i.e. the round-trips.
+    """
+
+    IGNORED = {"hello", "isMaster", "ismaster", "endSessions", "ping"}
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in self.IGNORED:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Must be registered before the Motor client is created
+counter = CommandCounter()
+monitoring.register(counter)
+
+from bson import ObjectId  # noqa: E402
+
+from backend.database import db  # noqa: E402
+from backend.indexes import ensure_indexes  # noqa: E402
+from backend.main import app  # noqa: E402
+
+PASSWORD = "password123"
+
+
+async def measure(client, auth_headers, repeat, request):
+    round_trips, latencies = [], []
+    for i in range(repeat):
+        if auth_headers:
+            await client.get("/auth/me", headers=auth_headers)
+        counter.count = 0
+        started = time.perf_counter()
+        response = await request(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+        round_trips.append(counter.count)
+        if response.status_code >= 500:
+            raise RuntimeError(f"{response.status_code}: {response.text}")
+    return max(round_trips), statistics.median(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="requests per endpoint")
+    args = parser.parse_args()
+
+    await ensure_indexes()
+    run_id = uuid.uuid4().hex[:8]
+    email = f"bench_writes_{run_id}@example.com"
+    credentials = {"email": email, "password": PASSWORD}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/signup", json=credentials)
+        token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+        auth_headers = {"Authorization": f"Bearer {token}"}
+        user = (await client.get("/auth/me", headers=auth_headers)).json()
+
+        meeting = await db.meetings.insert_one({
+            "user_id": ObjectId(user["_id"]),
+            "title": "Benchmark meeting",
+            "start_time": "2024-01-01T09:00:00",
+            "end_time": "2024-01-01T10:00:00",
+            "status": "pending",
+        })
+        meeting_id = str(meeting.inserted_id)
+        item = await db.action_items.insert_one({
+            "description": "Benchmark item", "action_type": "Task", "status": "Pending",
+            "user_id": user["_id"], "meeting_id": meeting_id,
+        })
+        item_id = str(item.inserted_id)
+
+        endpoints = [
+            ("POST /auth/signup", None, lambda i: client.post(
+                "/auth/signup", json={"email": f"bench_writes_{run_id}_{i}@example.com", "password": PASSWORD})),
+            ("POST /auth/signup (duplicate)", None, lambda i: client.post("/auth/signup", json=credentials)),
+            ("PATCH /meetings/{id}/status", auth_headers, lambda i: client.patch(
+                f"/meetings/{meeting_id}/status", json={"status": f"processed-{i}"}, headers=auth_headers)),
+            ("POST /action-items/", auth_headers, lambda i: client.post(
+                "/action-items/", json={"description": f"Bench {i}", "action_type": "Task"}, headers=auth_headers)),
+            ("PATCH /action-items/{id}", auth_headers, lambda i: client.patch(
+                f"/action-items/{item_id}", json={"owner": f"owner-{i}"}, headers=auth_headers)),
+            ("POST /action-items/{id}/execute", auth_headers, lambda i: client.post(
+                f"/action-items/{item_id}/execute", headers=auth_headers)),
+            ("PATCH /user/integrations/", auth_headers, lambda i: client.patch(
+                "/user/integrations/", json={"notion": bool(i % 2)}, headers=auth_headers)),
+        ]
+
+        print(f"{'endpoint':<34} {'round-trips':>12} {'median ms':>10}")
+        try:
+            for name, headers, request in endpoints:
+                round_trips, latency = await measure(client, headers, args.repeat, request)
+                print(f"{name:<34} {round_trips:>12} {latency:>10.1f}")
+        finally:
+            await db.action_items.delete_many({"user_id": user["_id"]})
+            await db.meetings.delete_one({"_id": meeting.inserted_id})
+            await db.users.delete_many({"email": {"$regex": f"^bench_writes_{run_id}"}})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,12 +6,160 @@ class Settings(BaseSettings):
     APP_ENV: str = "development"
     PORT: int = 8000
     MONGODB_URI: str
+
+    # Mongo client (see database.py). Timeouts in milliseconds; None keeps the
+    # driver default (no wait queue timeout, no idle limit, no socket timeout)
+    MONGO_MAX_POOL_SIZE: int = 100
+    # Connections opened at startup and kept open
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_CONNECT_TIMEOUT_MS: int = 10000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    # Wire compression in order of preference, e.g. "zstd,snappy,zlib"; zstd and
+    # snappy need the driver extras (pip install "pymongo[zstd,snappy]") and are
+    # skipped with a warning without them. Empty sends uncompressed
+    MONGO_COMPRESSORS: str = ""
+    MONGO_APP_NAME: str = "flying-salamander"
+    # Client-wide defaults; empty MONGO_WRITE_CONCERN keeps the server's default.
+    # Write concerns are a node count or "majority"
+    MONGO_READ_PREFERENCE: str = "primary"
+    MONGO_WRITE_CONCERN: str = ""
+    # Per-endpoint overrides by function name, e.g. "get_dashboard=secondaryPreferred"
+    # and "process_meetings_batch=1". Secondaries can lag behind the change versions
+    # the ETags and response cache are keyed by, so a route reading from them may
+    # serve a list older than its tag until the next change
+    MONGO_ROUTE_READ_PREFERENCES: str = ""
+    MONGO_ROUTE_WRITE_CONCERNS: str = ""
     JWT_SECRET: str
     JWT_EXPIRES_IN: int = 86400
     CORS_ORIGINS: str = "http://localhost:5173"
+    # Comma-separated emails allowed to use the /admin endpoints
+    ADMIN_EMAILS: str = ""
+
+    # GET /meetings page size; the default matches the old to_list(1000) cap so
+    # clients that don't paginate keep seeing the same meetings
+    MEETINGS_PAGE_SIZE: int = 1000
+    MEETINGS_MAX_PAGE_SIZE: int = 1000
+    # GET /action-items page size; the default matches the old to_list(100) cap
+    ACTION_ITEMS_PAGE_SIZE: int = 100
+    ACTION_ITEMS_MAX_PAGE_SIZE: int = 1000
+    # Endpoints (by function name) that skip response_model and serialize through
+    # backend/serialization.py; empty puts every route back on the response_model path
+    FAST_SERIALIZATION_ROUTES: str = "read_meetings,get_action_items"
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
     OPENAI_API_KEY: Optional[str] = None
+    GOOGLE_TOKEN_URI: str = "https://oauth2.googleapis.com/token"
+    # Override the Calendar API base URL, e.g. http://localhost:8765/calendar/v3/ for a fake server
+    GOOGLE_CALENDAR_API_URL: Optional[str] = None
+    GOOGLE_API_WORKERS: int = 8
+    GOOGLE_API_TIMEOUT_SECONDS: int = 30
+
+    # Calendar sync: full syncs cover [now - DAYS_BACK, now + DAYS_AHEAD]; events are
+    # fetched PAGE_SIZE at a time and written to Mongo BATCH_SIZE operations at a time
+    GOOGLE_SYNC_DAYS_BACK: int = 1
+    GOOGLE_SYNC_DAYS_AHEAD: int = 2
+    GOOGLE_SYNC_PAGE_SIZE: int = 250
+    GOOGLE_SYNC_BATCH_SIZE: int = 500
+
+    # Background calendar sync (see services/sync_scheduler.py)
+    SYNC_SCHEDULER_ENABLED: bool = True
+    SYNC_SCHEDULER_INTERVAL_SECONDS: int = 300
+    SYNC_SCHEDULER_CONCURRENCY: int = 4
+    SYNC_SCHEDULER_JITTER_SECONDS: float = 5.0
+    SYNC_SCHEDULER_LEASE_SECONDS: int = 600
+    # Failed syncs back off exponentially from the interval up to this
+    SYNC_SCHEDULER_MAX_BACKOFF_SECONDS: int = 21600
+
+    # Authenticated principal cache (see auth/principal_cache.py)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt worker pool (see auth/hashing.py): "thread", "process" or "inline"
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Action item extraction pool for batch processing (see services/extraction.py):
+    # "process" or "thread"
+    EXTRACTION_EXECUTOR: str = "process"
+    EXTRACTION_WORKERS: int = 4
+    # Most meetings or action items a single batch/bulk request may name
+    ACTION_ITEMS_MAX_BATCH_SIZE: int = 200
+
+    # Action execution queue (see services/action_jobs.py): workers per action type,
+    # retries back off exponentially from BACKOFF_SECONDS up to BACKOFF_MAX_SECONDS
+    ACTION_JOBS_ENABLED: bool = True
+    ACTION_JOBS_EMAIL_CONCURRENCY: int = 4
+    ACTION_JOBS_INVITE_CONCURRENCY: int = 2
+    ACTION_JOBS_TASK_CONCURRENCY: int = 4
+    ACTION_JOBS_POLL_SECONDS: float = 2.0
+    ACTION_JOBS_LEASE_SECONDS: int = 300
+    ACTION_JOBS_MAX_ATTEMPTS: int = 5
+    ACTION_JOBS_BACKOFF_SECONDS: float = 2.0
+    ACTION_JOBS_BACKOFF_MAX_SECONDS: float = 600.0
+
+    # Email delivery for Email action items (see services/email_delivery.py); the
+    # simulated executor stays in place while SMTP_HOST is unset
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_STARTTLS: bool = True
+    SMTP_FROM: str = "no-reply@localhost"
+    SMTP_POOL_SIZE: int = 4
+    SMTP_TIMEOUT_SECONDS: int = 30
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_BATCH_LINGER_MS: int = 20
+    # Per-user send rate; 0 disables rate limiting
+    EMAIL_RATE_PER_MINUTE: float = 30
+    EMAIL_RATE_BURST: int = 10
+
+    # Server-sent change events (see services/change_events.py): "auto" uses Mongo
+    # change streams when the deployment supports them, else in-process events;
+    # "change_streams" or "memory" force one
+    EVENTS_SOURCE: str = "auto"
+    # Frames buffered per stream before a slow client gets a resync event instead
+    EVENTS_QUEUE_SIZE: int = 64
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_MAX_CONNECTIONS: int = 10000
+    EVENTS_MAX_CONNECTIONS_PER_USER: int = 10
+    # Streams are ended (and reconnected by the client) after this long
+    EVENTS_MAX_STREAM_SECONDS: int = 300
+    EVENTS_RETRY_MS: int = 3000
+
+    # Response cache for the list endpoints (see services/response_cache.py):
+    # "memory" (per worker), "redis" (shared, needs the redis package) or "none"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Health monitor behind /livez, /readyz and /healthz (see services/health.py)
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_LOOP_LAG_INTERVAL_SECONDS: float = 0.25
+    # /readyz fails above this event loop lag or share of the pool checked out
+    HEALTH_MAX_LOOP_LAG_MS: float = 500
+    HEALTH_MAX_POOL_UTILIZATION: float = 0.95
+
+    # Prometheus metrics at /metrics and the Server-Timing header (see metrics.py)
+    METRICS_ENABLED: bool = True
+
+    # On-demand sampling profiler (see profiling.py). Set PROFILING_SECRET to allow
+    # arming through a signed X-Profile header as well as POST /admin/profiles
+    PROFILING_ENABLED: bool = True
+    PROFILING_SECRET: str = ""
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_REQUESTS: int = 1000
+    PROFILING_MAX_SECONDS: float = 300
+    # Distinct stacks kept per profile, and finished profiles kept for download
+    PROFILING_MAX_STACKS: int = 20000
+    PROFILING_KEEP: int = 5
 
     class Config:
         env_file = os.path.join(os.path.dirname(__file__), ".env")
@@ -1,5 +1,259 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+"""
+The Mongo client and database.
+
+The client is created by `connect()` in the app lifespan, with the pool,
+timeout, compression and read/write settings from config.py, and its pool is
+warmed up to MONGO_MIN_POOL_SIZE connections before the first request. Code that
+runs without the lifespan (benchmarks, scripts) gets the same client on first use.
+
+`db` stands in for the database so modules can keep `from backend.database import db`
+at import time. `route_db(route)` is the database with the read preference and
+write concern configured for one endpoint (MONGO_ROUTE_READ_PREFERENCES,
+MONGO_ROUTE_WRITE_CONCERNS), or `db` when there is no override. Those settings are
+checked by `connect()`, so a bad value stops the app from starting rather than
+failing the endpoint's requests.
+"""
+import asyncio
+import threading
+from typing import Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ReadPreference, WriteConcern, monitoring
+
+from backend import metrics
 from backend.config import settings
 
-client = AsyncIOMotorClient(settings.MONGODB_URI)
-db = client.get_database()
\ No newline at end of file
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters from pymongo's pool events. The events are published
+    on pymongo's threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pools = 0
+        self.created = 0
+        self.closed = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.cleared = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pools": self.pools,
+                "open": self.created - self.closed,
+                "created": self.created,
+                "closed": self.closed,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": round(self.wait_seconds * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+                "cleared": self.cleared,
+            }
+
+    def pool_created(self, event):
+        with self._lock:
+            self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.cleared += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.closed += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        duration = event.duration or 0.0
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.wait_seconds += duration
+            self.max_wait_seconds = max(self.max_wait_seconds, duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+
+pool_monitor = PoolMonitor()
+
+_client: Optional[AsyncIOMotorClient] = None
+_database: Optional[AsyncIOMotorDatabase] = None
+_route_databases: Dict[str, AsyncIOMotorDatabase] = {}
+_route_options: Optional[Dict[str, dict]] = None
+
+
+def _w(value: str):
+    """
+    A write concern's w: a node count or "majority".
+    """
+    if value.isdigit():
+        return int(value)
+    if value != "majority":
+        raise ValueError(f"Invalid write concern {value!r}, expected a node count or 'majority'")
+    return value
+
+
+def _route_settings(value: str) -> Dict[str, str]:
+    """
+    Parses "route=value,route=value".
+    """
+    pairs = (entry.split("=", 1) for entry in value.split(",") if "=" in entry)
+    return {route.strip(): setting.strip() for route, setting in pairs}
+
+
+def route_options() -> Dict[str, dict]:
+    """
+    The with_options() arguments per route, from MONGO_ROUTE_READ_PREFERENCES and
+    MONGO_ROUTE_WRITE_CONCERNS. Raises ValueError for an unknown value.
+    """
+    global _route_options
+    if _route_options is None:
+        options: Dict[str, dict] = {}
+        for route, read_preference in _route_settings(settings.MONGO_ROUTE_READ_PREFERENCES).items():
+            if read_preference not in READ_PREFERENCES:
+                raise ValueError(
+                    f"Invalid read preference {read_preference!r} for {route} in MONGO_ROUTE_READ_PREFERENCES, "
+                    f"expected one of {', '.join(READ_PREFERENCES)}"
+                )
+            options.setdefault(route, {})["read_preference"] = READ_PREFERENCES[read_preference]
+        for route, write_concern in _route_settings(settings.MONGO_ROUTE_WRITE_CONCERNS).items():
+            try:
+                w = _w(write_concern)
+            except ValueError:
+                raise ValueError(
+                    f"Invalid write concern {write_concern!r} for {route} in MONGO_ROUTE_WRITE_CONCERNS, "
+                    "expected a node count or 'majority'"
+                ) from None
+            options.setdefault(route, {})["write_concern"] = WriteConcern(w=w)
+        _route_options = options
+    return _route_options
+
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+        "readPreference": settings.MONGO_READ_PREFERENCE,
+        "appname": settings.MONGO_APP_NAME,
+        "event_listeners": [pool_monitor, metrics.mongo_command_metrics] if settings.METRICS_ENABLED else [pool_monitor],
+    }
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    if settings.MONGO_WRITE_CONCERN:
+        options["w"] = _w(settings.MONGO_WRITE_CONCERN)
+    # None means the driver default
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def get_client() -> AsyncIOMotorClient:
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(settings.MONGODB_URI, **client_options())
+    return _client
+
+
+def get_database() -> AsyncIOMotorDatabase:
+    global _database
+    if _database is None:
+        _database = get_client().get_database()
+    return _database
+
+
+async def connect() -> None:
+    """
+    Create the client and open MONGO_MIN_POOL_SIZE connections up front, so the
+    first requests after a start don't pay for the TCP/TLS handshakes. pymongo
+    keeps the pool at that size afterwards. Invalid Mongo settings raise here.
+    """
+    route_options()
+    client = get_client()
+    warmup = max(1, settings.MONGO_MIN_POOL_SIZE)
+    try:
+        # Concurrent pings each need their own connection
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(warmup)))
+        print(f"Mongo: connected, {pool_monitor.stats()['open']} pooled connections open")
+    except Exception as e:
+        print(f"Mongo: warm-up failed, connections will be opened on demand: {e}")
+
+
+def close() -> None:
+    global _client, _database
+    if _client is not None:
+        _client.close()
+        _client = None
+    _database = None
+    _route_databases.clear()
+
+
+def route_db(route: str) -> AsyncIOMotorDatabase:
+    """
+    The database for the endpoint function named `route`, with its configured read
+    preference and write concern applied.
+    """
+    database = _route_databases.get(route)
+    if database is None:
+        options = route_options().get(route)
+        database = get_database().with_options(**options) if options else get_database()
+        _route_databases[route] = database
+    return database
+
+
+class _Database:
+    """
+    Resolves attribute and item access against the current client's database.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(get_database(), name)
+
+    def __getitem__(self, name: str):
+        return get_database()[name]
+
+
+db = _Database()
@@ -0,0 +1,74 @@
+from datetime import date as date_type, datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import HTTPException, status
+
+
+def parse_timezone(tz: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown timezone: {tz}")
+
+
+def _parse_instant(value: str, zone: ZoneInfo, field: str) -> datetime:
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid '{field}' value, expected an ISO 8601 date or datetime",
+        )
+    # Naive values (including bare dates) are wall-clock times in the requested timezone
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=zone)
+    return parsed.astimezone(timezone.utc)
+
+
+def day_range(day: str, zone: ZoneInfo) -> Tuple[datetime, datetime]:
+    """
+    UTC [start, end) of a calendar day (YYYY-MM-DD) as observed in `zone`.
+    """
+    try:
+        parsed = date_type.fromisoformat(day)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid 'date' value, expected YYYY-MM-DD")
+    start = datetime.combine(parsed, time.min, tzinfo=zone)
+    end = datetime.combine(parsed + timedelta(days=1), time.min, tzinfo=zone)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+def resolve_time_range(
+    day: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    tz: Optional[str] = None,
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Turn the `date` / `from` / `to` / `tz` query parameters into a UTC [start, end) range.
+    Either bound may be None when the caller left it open.
+    """
+    zone = parse_timezone(tz)
+    if day:
+        if start or end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either 'date' or 'from'/'to', not both",
+            )
+        return day_range(day, zone)
+
+    range_start = _parse_instant(start, zone, "from") if start else None
+    range_end = _parse_instant(end, zone, "to") if end else None
+    if range_start and range_end and range_start >= range_end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'from' must be before 'to'")
+    return range_start, range_end
+
+
+def range_filter(range_start: Optional[datetime], range_end: Optional[datetime]) -> Optional[dict]:
+    bounds = {}
+    if range_start:
+        bounds["$gte"] = range_start
+    if range_end:
+        bounds["$lt"] = range_end
+    return bounds or None
@@ -0,0 +1,48 @@
+import hashlib
+from typing import Optional, Sequence
+
+from fastapi import Request, Response
+
+from backend.services import change_versions
+
+# Browsers may keep the response but must revalidate it before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(user_id: str, versions: dict, query: str, variant: str = "") -> str:
+    """
+    ETag for a list response: the user's change versions of the scopes it covers
+    plus everything else that selects its content (query string, resolved defaults).
+    """
+    key = "|".join([user_id, query, variant] + [f"{scope}={version}" for scope, version in sorted(versions.items())])
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def not_modified(
+    request: Request,
+    response: Response,
+    user_id: str,
+    scopes: Sequence[str],
+    variant: str = "",
+) -> Optional[Response]:
+    """
+    Tag `response` with the ETag for the current versions of `scopes`. Returns the
+    304 response to send instead when the request's If-None-Match already holds
+    that tag; endpoints must call this before running their query.
+    `variant` covers inputs the query string doesn't, e.g. a defaulted date.
+    """
+    versions = await change_versions.get_versions(user_id, scopes)
+    etag = compute_etag(user_id, versions, request.url.query, variant)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,178 @@
+"""
+A tiny stand-in for the Google Calendar v3 events API and OAuth token endpoint.
+
+Run it standalone and point the backend at it:
+
+    python -m backend.fake_calendar_api --port 8765
+    GOOGLE_CALENDAR_API_URL=http://localhost:8765/calendar/v3/ \
+    GOOGLE_TOKEN_URI=http://localhost:8765/token python backend/main.py
+
+or start it in-process from a test script with FakeCalendarServer().start().
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+EVENTS_PATH = "/calendar/v3/calendars/primary/events"
+
+
+def sample_event(event_id: str, title: str, start: datetime, minutes: int = 30, **extra) -> dict:
+    event = {
+        "id": event_id,
+        "status": "confirmed",
+        "summary": title,
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": (start + timedelta(minutes=minutes)).isoformat()},
+    }
+    event.update(extra)
+    return event
+
+
+class FakeCalendarServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        # event id -> (change version, event); cancelled events are kept as tombstones
+        self._events = {}
+        self.version = 0
+        self.expired_sync_tokens = set()
+        self.pages_served = 0
+        self.delay_seconds = 0.0
+        self.valid_tokens = {"fake-access-token"}
+        self.issued_tokens = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def calendar_url(self) -> str:
+        return f"{self.base_url}/calendar/v3/"
+
+    @property
+    def token_url(self) -> str:
+        return f"{self.base_url}/token"
+
+    def start(self) -> "FakeCalendarServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def put_event(self, event: dict) -> None:
+        with self._lock:
+            self.version += 1
+            self._events[event["id"]] = (self.version, event)
+
+    def cancel_event(self, event_id: str) -> None:
+        with self._lock:
+            self.version += 1
+            self._events[event_id] = (self.version, {"id": event_id, "status": "cancelled"})
+
+    def list_events(self, params: dict):
+        """
+        Returns (status, body) for an events.list call.
+        Full listings skip cancelled events; a syncToken returns every change since it was issued.
+        """
+        with self._lock:
+            sync_token = params.get("syncToken")
+            if sync_token is not None:
+                if sync_token in self.expired_sync_tokens or not sync_token.startswith("sync-"):
+                    return 410, {"error": {"code": 410, "message": "Sync token is no longer valid, a full sync is required."}}
+                since = int(sync_token.split("-", 1)[1])
+                items = [event for version, event in self._events.values() if version > since]
+            else:
+                items = [
+                    event for _, event in self._events.values()
+                    if event.get("status") != "cancelled" and self._in_window(event, params)
+                ]
+            self.pages_served += 1
+            max_results = int(params.get("maxResults", 250))
+            offset = int(params.get("pageToken", "page-0").split("-", 1)[1])
+            body = {"kind": "calendar#events", "items": items[offset:offset + max_results]}
+            if offset + max_results < len(items):
+                body["nextPageToken"] = f"page-{offset + max_results}"
+            else:
+                # Like Google, the sync token is only handed out on the last page
+                body["nextSyncToken"] = f"sync-{self.version}"
+            return 200, body
+
+    @staticmethod
+    def _in_window(event: dict, params: dict) -> bool:
+        start = datetime.fromisoformat(event["start"]["dateTime"])
+        end = datetime.fromisoformat(event["end"]["dateTime"])
+        if "timeMin" in params and end <= datetime.fromisoformat(params["timeMin"].replace("Z", "+00:00")):
+            return False
+        if "timeMax" in params and start >= datetime.fromisoformat(params["timeMax"].replace("Z", "+00:00")):
+            return False
+        return True
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                with server._lock:
+                    server.requests.append(("POST", self.path))
+                if urlparse(self.path).path != "/token":
+                    return self._send(404, {"error": "not_found"})
+                with server._lock:
+                    server.issued_tokens += 1
+                    token = f"fake-refreshed-token-{server.issued_tokens}"
+                    server.valid_tokens.add(token)
+                self._send(200, {"access_token": token, "expires_in": 3600, "token_type": "Bearer"})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                with server._lock:
+                    server.requests.append(("GET", self.path))
+                if url.path != EVENTS_PATH:
+                    return self._send(404, {"error": "not_found"})
+                token = (self.headers.get("Authorization") or "").replace("Bearer ", "")
+                if token not in server.valid_tokens:
+                    return self._send(401, {"error": {"code": 401, "message": "Invalid Credentials"}})
+                if server.delay_seconds:
+                    time.sleep(server.delay_seconds)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                status, body = server.list_events(params)
+                self._send(status, body)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Google Calendar API")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    fake = FakeCalendarServer(port=args.port)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    fake.put_event(sample_event("fake-standup", "Daily Standup", now, location="zoom.us/j/1"))
+    fake.put_event(sample_event("fake-review", "Design Review", now + timedelta(hours=2), minutes=60))
+    print(f"Fake Calendar API on {fake.calendar_url} (token endpoint {fake.token_url})")
+    fake._httpd.serve_forever()
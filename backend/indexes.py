@@ -0,0 +1,217 @@
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from backend.database import db
+from backend.models.action_item import ActionStatus, ActionType
+from backend.models.action_job import JobStatus
+from backend.models.user import UserResponse
+
+# Every index the routers and background services rely on, per collection.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        # Background sync scheduler looks up Google-connected users
+        IndexModel(
+            [("integrations.google_calendar", ASCENDING)],
+            name="google_calendar_connected",
+            partialFilterExpression={"integrations.google_calendar": True},
+        ),
+    ],
+    "meetings": [
+        # Also serves GET /meetings keyset pagination on (start_time, _id)
+        IndexModel(
+            [("user_id", ASCENDING), ("start_time", ASCENDING), ("_id", ASCENDING)],
+            name="user_start_time_id",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("google_event_id", ASCENDING)],
+            name="user_google_event_unique",
+            unique=True,
+        ),
+    ],
+    "action_items": [
+        # GET /action-items: (user_id, status) filters sorted by creation (_id) or due date
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("_id", ASCENDING)],
+            name="user_status_id",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("due_date", ASCENDING), ("_id", ASCENDING)],
+            name="user_status_due_date_id",
+        ),
+        # GET /action-items?meeting_id=: a meeting's items of one status, by creation
+        IndexModel(
+            [("user_id", ASCENDING), ("meeting_id", ASCENDING), ("status", ASCENDING), ("_id", ASCENDING)],
+            name="user_meeting_status_id",
+        ),
+        IndexModel([("meeting_id", ASCENDING)], name="meeting_id"),
+    ],
+    "action_jobs": [
+        IndexModel(
+            [("user_id", ASCENDING), ("idempotency_key", ASCENDING)],
+            name="user_idempotency_key_unique",
+            unique=True,
+        ),
+        # Workers claim the oldest due job of their type
+        IndexModel(
+            [("action_type", ASCENDING), ("status", ASCENDING), ("run_at", ASCENDING)],
+            name="action_type_status_run_at",
+        ),
+    ],
+    "calendar_sync_state": [
+        IndexModel([("user_id", ASCENDING)], name="user_unique", unique=True),
+        # Background sync scheduler reads the states that are due
+        IndexModel([("last_synced_at", ASCENDING)], name="last_synced_at"),
+    ],
+}
+
+
+async def ensure_indexes() -> dict:
+    """
+    Create any missing indexes and verify that every expected index exists.
+    Returns {collection: {"present": [...], "missing": [...]}}. A missing index is
+    only logged, since queries still work without it, except for the unique ones:
+    signup and job idempotency rely on them to reject duplicates, so those raise
+    RuntimeError and keep the API from starting.
+    """
+    for collection, models in INDEXES.items():
+        try:
+            await db[collection].create_indexes(models)
+        except PyMongoError as e:
+            print(f"Failed to create indexes on {collection}: {e}")
+    report = await verify_indexes()
+    missing_unique = []
+    for collection, result in report.items():
+        if result["missing"]:
+            print(f"Missing indexes on {collection}: {', '.join(result['missing'])}")
+        missing_unique += [
+            f"{collection}.{model.document['name']}" for model in INDEXES[collection]
+            if model.document.get("unique") and model.document["name"] in result["missing"]
+        ]
+    if missing_unique:
+        raise RuntimeError(f"Required unique indexes are missing: {', '.join(missing_unique)}")
+    return report
+
+
+async def verify_indexes() -> dict:
+    report = {}
+    for collection, models in INDEXES.items():
+        try:
+            existing = await db[collection].index_information()
+        except PyMongoError:
+            existing = {}
+        existing_keys = {tuple(info["key"]) for info in existing.values()}
+        present, missing = [], []
+        for model in models:
+            spec = model.document
+            keys = tuple(spec["key"].items())
+            (present if keys in existing_keys else missing).append(spec["name"])
+        report[collection] = {"present": present, "missing": missing}
+    return report
+
+
+class AuditedQuery(NamedTuple):
+    name: str
+    collection: str
+    # Builds (filter, sort) for the query shape using the auditing user's ids
+    build: Callable[[UserResponse], tuple]
+
+
+# The query shapes issued by the routers and services, checked by /admin/index-audit.
+AUDITED_QUERIES: List[AuditedQuery] = [
+    AuditedQuery("auth.current_user", "users", lambda u: ({"email": u.email}, None)),
+    AuditedQuery("sync_scheduler.connected_users", "users", lambda u: ({
+        "integrations.google_calendar": True,
+        "integrations.google_refresh_token": {"$nin": [None, ""]},
+    }, None)),
+    AuditedQuery("sync_scheduler.due_states", "calendar_sync_state", lambda u: ({"$and": [
+        {"$or": [{"last_synced_at": None}, {"last_synced_at": {"$lt": datetime(2000, 1, 1)}}]},
+        {"$or": [{"lease_until": None}, {"lease_until": {"$lt": datetime(2000, 1, 1)}}]},
+        {"$or": [{"next_attempt_at": None}, {"next_attempt_at": {"$lte": datetime(2000, 1, 1)}}]},
+    ]}, None)),
+    AuditedQuery("meetings.read_meetings", "meetings", lambda u: (
+        {"user_id": ObjectId(u.id), "start_time": {"$gte": datetime(2000, 1, 1), "$lt": datetime(2000, 1, 2)}},
+        {"start_time": 1, "_id": 1})),
+    AuditedQuery("dashboard.day_meetings", "meetings", lambda u: (
+        {"user_id": ObjectId(u.id), "start_time": {"$gte": datetime(2000, 1, 1), "$lt": datetime(2000, 1, 2)}},
+        {"start_time": 1, "_id": 1})),
+    AuditedQuery("action_items.process_meetings_batch", "meetings", lambda u: (
+        {"_id": {"$in": [ObjectId(), ObjectId()]}, "user_id": ObjectId(u.id)}, None)),
+    AuditedQuery("meetings.update_meeting_status", "meetings", lambda u: (
+        {"_id": ObjectId(), "user_id": ObjectId(u.id)}, None)),
+    AuditedQuery("calendar_sync.meeting_upsert", "meetings", lambda u: (
+        {"user_id": ObjectId(u.id), "google_event_id": "audit"}, None)),
+    AuditedQuery("calendar_sync.remove_stale_meetings", "meetings", lambda u: (
+        {"user_id": ObjectId(u.id), "sync_run": {"$ne": "audit"},
+         "start_time": {"$gte": datetime(2000, 1, 1), "$lt": datetime(2000, 1, 4)}}, None)),
+    AuditedQuery("change_versions.by_user", "change_versions", lambda u: ({"_id": u.id}, None)),
+    AuditedQuery("calendar_sync.state", "calendar_sync_state", lambda u: ({"user_id": ObjectId(u.id)}, None)),
+    AuditedQuery("action_items.get_action_items", "action_items", lambda u: (
+        {"user_id": u.id, "status": ActionStatus.PENDING.value}, {"_id": 1})),
+    AuditedQuery("action_items.get_action_items_by_due_date", "action_items", lambda u: (
+        {"user_id": u.id, "status": {"$in": [ActionStatus.PENDING.value, ActionStatus.EXECUTED.value]}},
+        {"due_date": 1, "_id": 1})),
+    AuditedQuery("action_items.get_action_items_for_meeting", "action_items", lambda u: (
+        {"user_id": u.id, "status": ActionStatus.PENDING.value, "meeting_id": str(ObjectId())}, {"_id": 1})),
+    AuditedQuery("action_items.by_id", "action_items", lambda u: ({"_id": ObjectId(), "user_id": u.id}, None)),
+    AuditedQuery("action_items.bulk_owned_ids", "action_items", lambda u: (
+        {"_id": {"$in": [ObjectId(), ObjectId()]}, "user_id": u.id}, None)),
+    AuditedQuery("action_jobs.claim", "action_jobs", lambda u: ({
+        "action_type": ActionType.TASK.value,
+        "$or": [
+            {"status": JobStatus.QUEUED.value, "run_at": {"$lte": datetime(2000, 1, 1)}},
+            {"status": JobStatus.RUNNING.value, "lease_until": {"$lt": datetime(2000, 1, 1)}},
+        ],
+    }, {"run_at": 1})),
+    AuditedQuery("action_jobs.get_job", "action_jobs", lambda u: ({"_id": ObjectId(), "user_id": u.id}, None)),
+    # Also the dashboard's $lookup of a meeting's action items
+    AuditedQuery("action_items.by_meeting", "action_items", lambda u: ({"meeting_id": str(ObjectId())}, None)),
+]
+
+
+def _plan_stages(plan: dict) -> List[dict]:
+    stages = [plan]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def audit_queries(user: UserResponse) -> dict:
+    """
+    Run `explain` on every audited query shape and report the ones whose winning
+    plan falls back to a collection scan.
+    """
+    results = []
+    for query in AUDITED_QUERIES:
+        query_filter, sort = query.build(user)
+        command = {"find": query.collection, "filter": query_filter}
+        if sort:
+            command["sort"] = sort
+        try:
+            explain = await db.command("explain", command, verbosity="queryPlanner")
+        except PyMongoError as e:
+            results.append({"name": query.name, "collection": query.collection, "error": str(e)})
+            continue
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        stages = _plan_stages(winning_plan)
+        index_names = [stage["indexName"] for stage in stages if "indexName" in stage]
+        results.append({
+            "name": query.name,
+            "collection": query.collection,
+            "stages": [stage.get("stage") for stage in stages],
+            "indexes": index_names,
+            "covered": not any(stage.get("stage") == "COLLSCAN" for stage in stages),
+            # A blocking SORT stage means the index doesn't provide the requested order
+            "in_memory_sort": any(stage.get("stage") == "SORT" for stage in stages),
+        })
+    return {
+        "queries": results,
+        "uncovered": [r["name"] for r in results if not r.get("covered", False)],
+    }
@@ -1,22 +1,99 @@
 import sys
 import os
+import asyncio
+import signal
+import threading
 import uvicorn
+from contextlib import asynccontextmanager
 
 # Add the parent directory to sys.path to allow absolute imports from backend.*
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import settings
-from backend.database import client
-from backend.routers import auth, meetings, action_items, integrations
+from backend import database, metrics
+from backend.profiling import ProfilingMiddleware, profiler
+from backend.auth.principal_cache import principal_cache
+from backend.auth.hashing import password_hasher
+from backend.services import extraction, google_calendar
+from backend.services.sync_scheduler import sync_scheduler
+from backend.services.action_jobs import action_job_workers
+from backend.services.action_executors import EmailExecutor
+from backend.services.email_delivery import email_delivery
+from backend.services.change_events import change_broker
+from backend.services.response_cache import response_cache
+from backend.services.health import health_monitor
+from backend.models.action_item import ActionType
+from backend.indexes import ensure_indexes
+from backend.pagination import NEXT_CURSOR_HEADER
+from backend.routers import auth, meetings, action_items, integrations, admin, dashboard, events
 
-app = FastAPI()
+def on_shutdown_signal():
+    """
+    Runs as soon as SIGINT/SIGTERM arrives. uvicorn only runs the lifespan shutdown
+    once every connection has closed, so anything that helps connections close
+    (or tells load balancers to stop sending more) has to happen here.
+    """
+    health_monitor.begin_shutdown()
+    change_broker.close_streams()
+
+
+def install_shutdown_signal_hook():
+    # Chained in front of the handlers uvicorn installed before startup; signal
+    # handlers can only be set from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(sig)
+
+        def handler(signum, frame, previous=previous):
+            loop.call_soon_threadsafe(on_shutdown_signal)
+            if callable(previous):
+                previous(signum, frame)
+
+        signal.signal(sig, handler)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    install_shutdown_signal_hook()
+    await database.connect()
+    await ensure_indexes()
+    change_broker.start()
+    response_cache.start()
+    health_monitor.start()
+    if settings.SYNC_SCHEDULER_ENABLED:
+        sync_scheduler.start()
+    if email_delivery is not None:
+        email_delivery.start()
+        action_job_workers.register_executor(ActionType.EMAIL, EmailExecutor(email_delivery, settings.SMTP_FROM))
+    if settings.ACTION_JOBS_ENABLED:
+        action_job_workers.start()
+    yield
+    profiler.disarm()
+    await health_monitor.stop()
+    await change_broker.stop()
+    await response_cache.stop()
+    await sync_scheduler.stop()
+    await action_job_workers.stop()
+    if email_delivery is not None:
+        await email_delivery.stop()
+    password_hasher.shutdown()
+    google_calendar.shutdown()
+    extraction.shutdown()
+    database.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(auth.router)
 app.include_router(meetings.router)
 app.include_router(action_items.router)
 app.include_router(integrations.router)
+app.include_router(admin.router)
+app.include_router(dashboard.router)
+app.include_router(events.router)
 
 # CORS Configuration
 origins = settings.CORS_ORIGINS.split(",")
@@ -27,19 +104,58 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing"],
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+if settings.METRICS_ENABLED:
+    # Added last so it is the outermost middleware and times everything below it
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.stats_collector.register("mongo_pool", database.pool_monitor.stats)
+    metrics.stats_collector.register("principal_cache", principal_cache.stats)
+    metrics.stats_collector.register("sync_scheduler", sync_scheduler.stats)
+    metrics.stats_collector.register("action_jobs", action_job_workers.stats)
+    if email_delivery is not None:
+        metrics.stats_collector.register("email_delivery", email_delivery.stats)
+    metrics.stats_collector.register("events", change_broker.stats)
+    metrics.stats_collector.register("response_cache", response_cache.stats)
+    metrics.stats_collector.register("health", health_monitor.stats)
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/livez")
+async def liveness_check():
+    """
+    The process is up and its event loop is serving requests.
+    """
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readiness_check():
+    """
+    Whether this worker should get traffic, from the health monitor's cached probes.
+    """
+    readiness = health_monitor.readiness()
+    if readiness["ready"]:
+        return {"status": "ready", "checks": readiness["checks"]}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "not_ready", "failures": readiness["failures"], "checks": readiness["checks"]},
+    )
+
 @app.get("/healthz")
 # Trigger reload for env update
 async def health_check():
-    try:
-        # Ping the database to check connection
-        await client.admin.command('ping')
-        db_status = "connected"
-    except Exception:
-        db_status = "disconnected"
-    
-    return {"status": "ok", "db": db_status}
+    # "db" is the health monitor's last probe, not a ping per request. Component
+    # figures are on /metrics and GET /admin/stats, not on this unauthenticated route
+    return {"status": "ok", "db": health_monitor.db_status}
 
 if __name__ == "__main__":
     print(f"Starting server on port {settings.PORT}...")
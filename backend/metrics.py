@@ -0,0 +1,273 @@
+"""
+Prometheus metrics, served at GET /metrics.
+
+  http_*        per-route request counts and latency, from MetricsMiddleware
+  mongo_*       command counts and latency per command and collection, from the
+                CommandListener registered on the Mongo client; each request's share
+                is also totalled per route
+  event_loop_*  lag sampled by the health monitor (services/health.py)
+  google_api_*  Calendar API calls and token refreshes
+  extraction_*  summaries and action items extracted, and the time it took
+  app_*         every component's stats() (the figures /healthz shows), read at
+                scrape time
+
+Each worker process serves its own figures; scrape every worker (or aggregate
+them in Prometheus) when running several. Set METRICS_ENABLED=false to drop the
+middleware and the command listener altogether.
+
+Routes are labelled with their path template ("/action-items/{item_id}"), so label
+values stay bounded. Requests that match no route share the "unmatched" label.
+
+Each request also gets a Server-Timing header with its time spent in Mongo ("db",
+across every command it ran), in authentication ("auth", which includes the
+principal lookup's own db time) and in encoding the response body ("serialize"),
+plus the total ("app"). Everything is measured up to the moment the response
+starts; streamed bodies aren't covered.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests", ["method", "route", "status"])
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time until the response started", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being handled")
+REQUEST_MONGO_SECONDS = Histogram(
+    "http_request_mongo_seconds", "Mongo command time per request", ["route"], buckets=LATENCY_BUCKETS
+)
+REQUEST_MONGO_COMMANDS = Histogram(
+    "http_request_mongo_commands", "Mongo commands per request", ["route"], buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100)
+)
+
+MONGO_COMMANDS = Counter("mongo_commands_total", "Mongo commands", ["command", "collection", "outcome"])
+MONGO_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "Mongo command latency", ["command", "collection"], buckets=LATENCY_BUCKETS
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a timer", buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+
+GOOGLE_API_CALLS = Counter("google_api_calls_total", "Google API calls", ["operation", "outcome"])
+GOOGLE_API_LATENCY = Histogram("google_api_call_duration_seconds", "Google API call latency", ["operation"], buckets=LATENCY_BUCKETS)
+
+EXTRACTION_SUMMARIES = Counter("extraction_summaries_total", "Meeting summaries run through extraction", ["mode"])
+EXTRACTION_ITEMS = Counter("extraction_action_items_total", "Action items extracted", ["mode"])
+EXTRACTION_SECONDS = Histogram(
+    "extraction_duration_seconds", "Time to extract one request's summaries", ["mode"], buckets=LATENCY_BUCKETS
+)
+
+
+class RequestTiming:
+    """
+    Time spent per phase within one request. Mongo commands are reported from
+    the driver's threads, hence the lock.
+    """
+    __slots__ = ("started", "phases", "db_seconds", "db_commands", "_lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.db_seconds = 0.0
+        self.db_commands = 0
+        self._lock = threading.Lock()
+
+    def add_db(self, seconds: float) -> None:
+        with self._lock:
+            self.db_seconds += seconds
+            self.db_commands += 1
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        entries = [("db", self.db_seconds)] + list(self.phases.items()) + [("app", time.perf_counter() - self.started)]
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in entries)
+
+
+# Set per request by MetricsMiddleware. Motor runs commands with a copy of the
+# caller's context, so the command listener sees the same RequestTiming.
+_current_timing: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar("request_timing", default=None)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to the current request's `phase`.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing = _current_timing.get()
+        if timing is not None:
+            timing.add(phase, time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware, so it adds no task or body buffering per request and
+    leaves streaming responses alone.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        status_code = 500
+        duration: Optional[float] = None
+
+        async def send_with_timing(message):
+            nonlocal status_code, duration
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration = time.perf_counter() - timing.started
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _current_timing.reset(token)
+            # FastAPI puts the matched route in the scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            if duration is None:
+                duration = time.perf_counter() - timing.started
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_LATENCY.labels(method, route).observe(duration)
+            REQUEST_MONGO_SECONDS.labels(route).observe(timing.db_seconds)
+            REQUEST_MONGO_COMMANDS.labels(route).observe(timing.db_commands)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Mongo command counts and latency, and each request's share of them. Only the
+    started event carries the command document, so the collection is remembered
+    until the command finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: Dict[Tuple[object, int], str] = {}
+
+    @staticmethod
+    def _collection(event: monitoring.CommandStartedEvent) -> str:
+        if event.command_name == "getMore":
+            return str(event.command.get("collection", ""))
+        target = event.command.get(event.command_name)
+        return target if isinstance(target, str) else ""
+
+    def started(self, event):
+        with self._lock:
+            self._collections[(event.connection_id, event.request_id)] = self._collection(event)
+
+    def succeeded(self, event):
+        self._finished(event, "ok")
+
+    def failed(self, event):
+        self._finished(event, "error")
+
+    def _finished(self, event, outcome: str) -> None:
+        with self._lock:
+            collection = self._collections.pop((event.connection_id, event.request_id), "")
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMANDS.labels(event.command_name, collection, outcome).inc()
+        MONGO_LATENCY.labels(event.command_name, collection).observe(seconds)
+        timing = _current_timing.get()
+        if timing is not None:
+            timing.add_db(seconds)
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+
+@contextmanager
+def google_api_call(operation: str) -> Iterator[None]:
+    """
+    Count a Google API call by outcome and time it.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        GOOGLE_API_LATENCY.labels(operation).observe(time.perf_counter() - started)
+        GOOGLE_API_CALLS.labels(operation, outcome).inc()
+
+
+class StatsCollector:
+    """
+    Exposes registered stats() functions as gauges: app_<component>_<field>.
+    Booleans become 0/1 and other non-numeric fields are skipped. A nested dict of
+    dicts (e.g. action_jobs "types") becomes a label named after its key.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], Optional[dict]]] = {}
+
+    def register(self, component: str, stats: Callable[[], Optional[dict]]) -> None:
+        self._sources[component] = stats
+
+    def collect(self):
+        families: Dict[str, GaugeMetricFamily] = {}
+        for component, stats in list(self._sources.items()):
+            try:
+                values = stats()
+            except Exception as e:
+                print(f"Metrics: {component} stats failed: {e}")
+                continue
+            if values:
+                self._add(families, f"app_{component}", component, values, {})
+        return families.values()
+
+    def _add(self, families: Dict[str, GaugeMetricFamily], prefix: str, component: str, values: dict, labels: Dict[str, str]) -> None:
+        for key, value in values.items():
+            name = f"{prefix}_{key}"
+            if isinstance(value, dict):
+                if value and all(isinstance(child, dict) for child in value.values()):
+                    label = key[:-1] if key.endswith("s") else key
+                    for child_key, child in value.items():
+                        self._add(families, prefix, component, child, {**labels, label: str(child_key)})
+                else:
+                    self._add(families, name, component, value, labels)
+                continue
+            if isinstance(value, bool):
+                value = int(value)
+            if not isinstance(value, (int, float)):
+                continue
+            family = families.get(name)
+            if family is None:
+                family = families[name] = GaugeMetricFamily(name, f"{key} from the {component} stats", labels=list(labels))
+            family.add_metric(list(labels.values()), value)
+
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    The /metrics body and its content type.
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
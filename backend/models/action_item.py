@@ -1,4 +1,4 @@
-from typing import Optional, Annotated
+from typing import List, Optional, Annotated
 from datetime import datetime
 from pydantic import BaseModel, Field, BeforeValidator, ConfigDict
 from bson import ObjectId
@@ -44,4 +44,33 @@ class ActionItem(ActionItemBase):
         populate_by_name=True,
         arbitrary_types_allowed=True,
         json_encoders={ObjectId: str},
-    )
\ No newline at end of file
+    )
+
+class MeetingSummary(BaseModel):
+    meeting_id: str
+    summary_text: str
+
+class ProcessBatchRequest(BaseModel):
+    meetings: List[MeetingSummary] = Field(..., min_length=1)
+
+class MeetingBatchResult(BaseModel):
+    meeting_id: str
+    action_items: List[ActionItem] = []
+    error: Optional[str] = None
+
+class BulkUpdateEntry(BaseModel):
+    id: str
+    update: ActionItemUpdate
+
+class BulkUpdateRequest(BaseModel):
+    items: List[BulkUpdateEntry] = Field(..., min_length=1)
+
+class BulkIdsRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+
+class BulkItemResult(BaseModel):
+    id: str
+    ok: bool = False
+    error: Optional[str] = None
+    # Set by bulk execute: the queued job to poll
+    job_id: Optional[str] = None
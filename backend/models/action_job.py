@@ -0,0 +1,43 @@
+from typing import Optional, Annotated
+from datetime import datetime
+from pydantic import BaseModel, Field, BeforeValidator, ConfigDict
+from bson import ObjectId
+from enum import Enum
+
+from backend.models.action_item import ActionType
+
+# Represents an ObjectId field in the database.
+# It will be represented as a `str` on the model so that it can be serialized to JSON.
+PyObjectId = Annotated[str, BeforeValidator(str)]
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class ActionJob(BaseModel):
+    id: Optional[PyObjectId] = Field(None, alias="_id")
+    user_id: PyObjectId
+    action_item_id: PyObjectId
+    action_type: ActionType
+    idempotency_key: str
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_attempts: int
+    run_at: datetime
+    last_error: Optional[str] = None
+    result: Optional[dict] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={ObjectId: str},
+    )
+
+class ExecuteAccepted(BaseModel):
+    job_id: PyObjectId
+    status: JobStatus
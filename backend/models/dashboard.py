@@ -0,0 +1,17 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+from backend.models.action_item import ActionItem
+from backend.models.meeting import Meeting
+
+class DashboardMeeting(Meeting):
+    action_items: List[ActionItem] = []
+
+class Dashboard(BaseModel):
+    date: str
+    timezone: str
+    meetings: List[DashboardMeeting]
+    # Meetings per meeting status, e.g. {"pending": 3, "processed": 1}
+    meeting_counts: Dict[str, int]
+    # Action items of the day's meetings per status; every status is present
+    action_item_counts: Dict[str, int]
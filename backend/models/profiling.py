@@ -0,0 +1,23 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+class ProfileRequest(BaseModel):
+    route: Optional[str] = Field(None, description="Path template to profile, e.g. /meetings/; any route when omitted")
+    requests: Optional[int] = Field(None, ge=1, description="Stop after this many matching requests")
+    seconds: Optional[float] = Field(None, gt=0, description="Stop after this long, default PROFILING_MAX_SECONDS")
+    interval_ms: Optional[float] = Field(None, ge=1, le=1000)
+
+class ProfileSummary(BaseModel):
+    id: str
+    route: Optional[str] = None
+    requests: Optional[int] = None
+    seconds: float
+    interval_ms: float
+    armed_by: str
+    started_at: datetime
+    ended_at: Optional[datetime] = None
+    profiled_requests: int
+    samples: int
+    dropped_samples: int
+    distinct_stacks: int
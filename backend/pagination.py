@@ -0,0 +1,63 @@
+import base64
+import binascii
+from typing import Any, List, Optional, Sequence, Tuple
+
+from bson import json_util
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+
+# Header carrying the opaque cursor for the next page; absent on the last page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortSpec = Sequence[Tuple[str, int]]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Opaque, URL-safe cursor holding the sort key values of the last returned document.
+    """
+    return base64.urlsafe_b64encode(json_util.dumps(list(values)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, binascii.Error, InvalidId, UnicodeDecodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def _after(field: str, direction: int, value: Any) -> Optional[dict]:
+    """
+    Condition for `field` sorting strictly after `value`. Mongo sorts null/missing
+    values before everything else, so they need explicit handling.
+    """
+    if value is None:
+        return {field: {"$ne": None}} if direction > 0 else None
+    if direction > 0:
+        return {field: {"$gt": value}}
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_filter(sort: SortSpec, values: Sequence[Any]) -> dict:
+    """
+    Filter matching the documents strictly after `values` in `sort` order, e.g. for
+    [("start_time", 1), ("_id", 1)]:
+        {"$or": [{"start_time": {"$gt": t}},
+                 {"start_time": t, "_id": {"$gt": id}}]}
+    """
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        after = _after(field, direction, values[position])
+        if after is None:
+            continue
+        equal_prefix = {prev_field: values[i] for i, (prev_field, _) in enumerate(sort[:position])}
+        clauses.append({**equal_prefix, **after})
+    return {"$or": clauses}
+
+
+def cursor_for(document: dict, sort: SortSpec) -> str:
+    return encode_cursor([document.get(field) for field, _ in sort])
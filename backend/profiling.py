@@ -0,0 +1,346 @@
+"""
+On-demand sampling profiler for live requests.
+
+Arming
+------
+A profile is armed for the next N requests to a route (its path template, e.g.
+"/meetings/", or any route), for a time window, or both, whichever ends first:
+
+  - POST /admin/profiles as an admin, or
+  - an X-Profile header on any request, when PROFILING_SECRET is set:
+
+        X-Profile: route=/meetings/;requests=20;seconds=60;expires=1790000000;signature=<hex>
+
+    signature is the HMAC-SHA256 of everything before ";signature=" keyed with
+    PROFILING_SECRET, and expires (unix time) bounds how long the header can be
+    replayed. `python -m backend.profiling --route /meetings/ --requests 20` prints
+    one. Headers with a bad signature or past their expiry are ignored.
+
+Profiles are per worker: they cover the requests of the worker that was armed.
+Only one profile runs at a time, and the last PROFILING_KEEP finished ones are
+kept in memory for GET /admin/profiles/{id}.
+
+Sampling
+--------
+While armed, a sampler thread wakes every PROFILING_INTERVAL_MS and records one
+stack for every in-flight request to the profiled route. For the request that
+holds the event loop at that moment this is the loop thread's actual stack (from
+sys._current_frames); for the others it is the chain of coroutines they are
+suspended in, ending in "(await)", so time spent waiting on Mongo or Google
+shows up next to CPU time. Stacks are written root first in the collapsed format
+flamegraph.pl, speedscope and similar tools read: "frame;frame;frame count".
+
+Cost
+----
+Disarmed, the middleware does one attribute check per request (and looks for the
+header when a secret is set); there is no sampler thread. Armed, the sampler
+holds the GIL briefly per tick, and profiles are capped at PROFILING_MAX_SECONDS
+and PROFILING_MAX_STACKS distinct stacks.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from types import CodeType, FrameType
+from typing import Dict, List, Optional
+
+from backend.config import settings
+
+HEADER = b"x-profile"
+MAX_DEPTH = 128
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def sign(payload: str, secret: str) -> str:
+    return hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+
+def parse_arm_header(value: str, secret: str) -> Optional[dict]:
+    """
+    The arming parameters of a valid X-Profile header, else None.
+    """
+    payload, separator, signature = value.rpartition(";signature=")
+    if not separator or not hmac.compare_digest(sign(payload, secret), signature.strip()):
+        return None
+    try:
+        fields = dict(entry.split("=", 1) for entry in payload.split(";"))
+        if float(fields["expires"]) < time.time():
+            return None
+        return {
+            "route": fields.get("route") or None,
+            "requests": int(fields["requests"]) if fields.get("requests") else None,
+            "seconds": float(fields["seconds"]) if fields.get("seconds") else None,
+        }
+    except (KeyError, ValueError):
+        return None
+
+
+class Profile:
+    def __init__(self, route: Optional[str], requests: Optional[int], seconds: Optional[float], interval_ms: float, armed_by: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.route = route
+        self.requests = requests
+        self.seconds = seconds
+        self.interval_ms = interval_ms
+        self.armed_by = armed_by
+        self.started_at = datetime.now(timezone.utc)
+        self.ended_at: Optional[datetime] = None
+        self.deadline = time.monotonic() + seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.dropped_samples = 0
+        self.profiled_requests = 0
+
+    def matches(self, route: Optional[str]) -> bool:
+        return self.route is None or route == self.route
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "route": self.route,
+            "requests": self.requests,
+            "seconds": self.seconds,
+            "interval_ms": self.interval_ms,
+            "armed_by": self.armed_by,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "profiled_requests": self.profiled_requests,
+            "samples": self.samples,
+            "dropped_samples": self.dropped_samples,
+            "distinct_stacks": len(self.stacks),
+        }
+
+    def collapsed(self) -> str:
+        # Copied first, the sampler thread may still be adding to a running profile
+        stacks = sorted(dict(self.stacks).items(), key=lambda item: -item[1])
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+class SamplingProfiler:
+    def __init__(self, interval_ms: float, max_requests: int, max_seconds: float, max_stacks: int, keep: int, secret: str):
+        self.interval_ms = interval_ms
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+        self.max_stacks = max_stacks
+        self.keep = keep
+        self.secret = secret
+        # The running profile; the middleware's fast path only checks this
+        self.active: Optional[Profile] = None
+        self.finished: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Requests in flight while armed: task -> ASGI scope
+        self._requests: Dict[asyncio.Task, dict] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._frame_names: Dict[CodeType, str] = {}
+
+    def arm(
+        self,
+        route: Optional[str] = None,
+        requests: Optional[int] = None,
+        seconds: Optional[float] = None,
+        interval_ms: Optional[float] = None,
+        armed_by: str = "admin",
+    ) -> Profile:
+        """
+        Start a profile, ended after `requests` matching requests or `seconds`,
+        whichever comes first (capped by the PROFILING_MAX_* settings).
+        """
+        requests = min(requests, self.max_requests) if requests else None
+        seconds = min(seconds, self.max_seconds) if seconds else self.max_seconds
+        with self._lock:
+            if self.active is not None:
+                raise ProfilerBusy(f"Profile {self.active.id} is already running")
+            profile = Profile(route, requests, seconds, interval_ms or self.interval_ms, armed_by)
+            self.active = profile
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        threading.Thread(target=self._sample, args=(profile,), name=f"profiler-{profile.id}", daemon=True).start()
+        print(f"Profiler: armed {profile.id} (route {route or 'any'}, {requests or 'any number of'} requests, {seconds}s)")
+        return profile
+
+    def disarm(self) -> Optional[Profile]:
+        with self._lock:
+            profile = self.active
+            if profile is None:
+                return None
+            self.active = None
+            profile.ended_at = datetime.now(timezone.utc)
+            self._requests.clear()
+            self.finished[profile.id] = profile
+            while len(self.finished) > self.keep:
+                self.finished.popitem(last=False)
+        print(f"Profiler: finished {profile.id} with {profile.samples} samples of {profile.profiled_requests} requests")
+        return profile
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        active = self.active
+        if active is not None and active.id == profile_id:
+            return active
+        return self.finished.get(profile_id)
+
+    def profiles(self) -> List[dict]:
+        profiles = list(self.finished.values())
+        if self.active is not None:
+            profiles.append(self.active)
+        return [profile.summary() for profile in reversed(profiles)]
+
+    def _arm_from_header(self, scope) -> None:
+        for name, value in scope["headers"]:
+            if name == HEADER:
+                params = parse_arm_header(value.decode("latin-1"), self.secret)
+                if params is None:
+                    print("Profiler: ignoring an X-Profile header with a bad signature or expiry")
+                    return
+                try:
+                    self.arm(**params, armed_by="header")
+                except ProfilerBusy:
+                    pass
+                return
+
+    def _request_finished(self, profile: Profile, scope) -> None:
+        if self.active is not profile or not profile.matches(getattr(scope.get("route"), "path", None)):
+            return
+        profile.profiled_requests += 1
+        if profile.requests is not None and profile.profiled_requests >= profile.requests:
+            self.disarm()
+
+    def _sample(self, profile: Profile) -> None:
+        interval = profile.interval_ms / 1000
+        while self.active is profile:
+            time.sleep(interval)
+            if time.monotonic() >= profile.deadline:
+                self.disarm()
+                return
+            try:
+                self._take_sample(profile)
+            except Exception as e:
+                # The loop thread keeps running while we look at its frames
+                profile.dropped_samples += 1
+                if profile.dropped_samples == 1:
+                    print(f"Profiler: sample failed: {e}")
+
+    def _take_sample(self, profile: Profile) -> None:
+        requests = list(self._requests.items())
+        if not requests:
+            return
+        frames = sys._current_frames()
+        # Read from this thread without the loop's help; a plain dict lookup
+        running = getattr(asyncio.tasks, "_current_tasks", {}).get(self._loop)
+        for task, scope in requests:
+            route = getattr(scope.get("route"), "path", None)
+            if route is None or not profile.matches(route):
+                continue
+            if task is running:
+                stack = self._thread_stack(frames.get(self._loop_thread_id), task)
+            else:
+                stack = self._await_stack(task) + ["(await)"]
+            self._record(profile, [f"{scope['method']} {route}"] + stack)
+
+    def _record(self, profile: Profile, stack: List[str]) -> None:
+        key = ";".join(stack)
+        if key in profile.stacks or len(profile.stacks) < self.max_stacks:
+            profile.stacks[key] += 1
+            profile.samples += 1
+        else:
+            profile.dropped_samples += 1
+
+    def _frame_name(self, code: CodeType) -> str:
+        name = self._frame_names.get(code)
+        if name is None:
+            filename = code.co_filename
+            if filename.startswith(REPO_ROOT):
+                filename = os.path.relpath(filename, REPO_ROOT)
+            elif "site-packages/" in filename:
+                filename = filename.rpartition("site-packages/")[2]
+            name = self._frame_names[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+        return name
+
+    def _thread_stack(self, frame: Optional[FrameType], task: asyncio.Task) -> List[str]:
+        """
+        The loop thread's stack below the task's outermost coroutine.
+        """
+        root = getattr(task.get_coro(), "cr_code", None)
+        stack = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            stack.append(frame.f_code)
+            if frame.f_code is root:
+                break
+            frame = frame.f_back
+        return [self._frame_name(code) for code in reversed(stack)]
+
+    def _await_stack(self, task: asyncio.Task) -> List[str]:
+        """
+        The coroutines a suspended task is waiting in, outermost first.
+        """
+        stack = []
+        awaitable = task.get_coro()
+        while awaitable is not None and len(stack) < MAX_DEPTH:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None) or getattr(awaitable, "ag_frame", None)
+            if frame is None:
+                break
+            stack.append(self._frame_name(frame.f_code))
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None) or getattr(awaitable, "ag_await", None)
+        return stack
+
+
+class ProfilingMiddleware:
+    """
+    Tracks requests while a profile is armed. Pure ASGI, so the disarmed path is a
+    single check before handing the request on.
+    """
+
+    def __init__(self, app, profiler: "SamplingProfiler"):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        profiler = self.profiler
+        if scope["type"] == "http" and profiler.secret:
+            profiler._arm_from_header(scope)
+        profile = profiler.active
+        if profile is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        profiler._requests[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler._requests.pop(task, None)
+            profiler._request_finished(profile, scope)
+
+
+profiler = SamplingProfiler(
+    interval_ms=settings.PROFILING_INTERVAL_MS,
+    max_requests=settings.PROFILING_MAX_REQUESTS,
+    max_seconds=settings.PROFILING_MAX_SECONDS,
+    max_stacks=settings.PROFILING_MAX_STACKS,
+    keep=settings.PROFILING_KEEP,
+    secret=settings.PROFILING_SECRET,
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print a signed X-Profile header (needs PROFILING_SECRET).")
+    parser.add_argument("--route", default="", help="path template, e.g. /meetings/; empty for any route")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--valid-for", type=int, default=300, help="seconds the header can be used for")
+    args = parser.parse_args()
+    if not settings.PROFILING_SECRET:
+        sys.exit("PROFILING_SECRET is not set")
+    payload = f"route={args.route};requests={args.requests};seconds={args.seconds};expires={int(time.time()) + args.valid_for}"
+    print(f"X-Profile: {payload};signature={sign(payload, settings.PROFILING_SECRET)}")
@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status, Body
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import List, Literal, Optional
 from datetime import datetime
-import re
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 
-from backend.database import db
-from backend.models.action_item import ActionItem, ActionItemCreate, ActionItemUpdate, ActionType, ActionStatus
+from backend import etags, serialization
+from backend.config import settings
+from backend.database import db, route_db
+from backend.pagination import NEXT_CURSOR_HEADER, cursor_for, decode_cursor, keyset_filter
+from backend.models.action_item import (
+    ActionItem, ActionItemCreate, ActionItemUpdate, ActionStatus,
+    BulkIdsRequest, BulkItemResult, BulkUpdateRequest, MeetingBatchResult, ProcessBatchRequest,
+)
+from backend.models.action_job import ActionJob, ExecuteAccepted
 from backend.models.user import UserResponse
 from backend.auth.security import get_current_user
+from backend.services import action_jobs, change_versions, extraction
+from backend.services.response_cache import response_cache
 
 router = APIRouter(
     prefix="/action-items",
@@ -20,47 +31,67 @@ def extract_action_items_from_text(text: str) -> List[dict]:
     """
     Heuristic-based extraction of action items from text.
     Looks for patterns like "Action:", "Task:", "Email:", etc.
+    See backend.services.extraction for the rules.
     """
-    items = []
-    lines = text.split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        description = None
-        action_type = ActionType.TASK
-        
-        # patterns
-        action_match = re.match(r"^(?:Action|Task|TODO|Next Step):\s*(.*)", line, re.IGNORECASE)
-        email_match = re.match(r"^(?:Email|Contact):\s*(.*)", line, re.IGNORECASE)
-        invite_match = re.match(r"^(?:Invite|Schedule):\s*(.*)", line, re.IGNORECASE)
-        
-        if email_match:
-            description = line # Keep full context for email
-            action_type = ActionType.EMAIL
-        elif invite_match:
-            description = line
-            action_type = ActionType.INVITE
-        elif action_match:
-            description = action_match.group(1).strip()
-            action_type = ActionType.TASK
-        
-        if description:
-            # Simple due date extraction (heuristic)
-            # Looks for "due by Friday", "due: 2023-01-01" etc at the end of string
-            # We won't try to parse natural language dates into datetime objects in this regex pass
-            # as that requires more complex NLP libraries not present (like dateparser).
-            # We will just extract the item.
-            
-            items.append({
-                "description": description,
-                "action_type": action_type,
-                "status": ActionStatus.PENDING
-            })
-
-    return items
+    return extraction.extract_one(text)
+
+def _check_batch_size(size: int, noun: str):
+    if size > settings.ACTION_ITEMS_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.ACTION_ITEMS_MAX_BATCH_SIZE} {noun} per batch",
+        )
+
+def _bulk_results(ids: List[str]) -> tuple:
+    """
+    Result placeholders in request order, plus the ObjectIds of the valid ids.
+    """
+    results = [BulkItemResult(id=item_id) for item_id in ids]
+    object_ids = {}
+    for result in results:
+        if ObjectId.is_valid(result.id):
+            object_ids[result.id] = ObjectId(result.id)
+        else:
+            result.error = "Invalid action item id"
+    return results, object_ids
+
+async def _owned_ids(object_ids: List[ObjectId], user_id: str) -> set:
+    cursor = db.action_items.find({"_id": {"$in": object_ids}, "user_id": user_id}, {"_id": 1})
+    return {str(item["_id"]) async for item in cursor}
+
+async def _apply_bulk_updates(updates: List[tuple], user_id: str) -> List[BulkItemResult]:
+    """
+    Apply (item_id, $set fields) pairs scoped to `user_id` with one bulk_write.
+    Ownership is only looked up when fewer items matched than were sent, so a batch
+    of the user's own items costs a single round-trip.
+    """
+    results, object_ids = _bulk_results([item_id for item_id, _ in updates])
+    operations = [
+        UpdateOne({"_id": object_ids[result.id], "user_id": user_id}, {"$set": fields})
+        for result, (_, fields) in zip(results, updates)
+        if result.error is None and fields
+    ]
+    matched = 0
+    if operations:
+        matched = (await db.action_items.bulk_write(operations, ordered=False)).matched_count
+
+    valid = [result for result in results if result.error is None]
+    if matched == len(valid):
+        owned = {result.id for result in valid}
+    else:
+        # Some items weren't matched, or had nothing to update and still need their
+        # ownership checked
+        owned = await _owned_ids(list(object_ids.values()), user_id)
+    for result in valid:
+        result.ok = result.id in owned
+        if not result.ok:
+            result.error = "Action item not found"
+    if matched:
+        await change_versions.record_change(
+            user_id, change_versions.ACTION_ITEMS, "action_item.updated",
+            [result.id for result in valid if result.ok],
+        )
+    return results
 
 # --- Routes ---
 
@@ -80,41 +111,241 @@ async def process_meeting_actions(
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     extracted_data = extract_action_items_from_text(summary_text)
-    
-    created_items = []
-    for item_data in extracted_data:
-        new_item = ActionItem(
-            **item_data,
-            user_id=current_user.id,
-            meeting_id=meeting_id
+    if not extracted_data:
+        return []
+
+    new_items = [
+        ActionItem(**item_data, user_id=current_user.id, meeting_id=meeting_id).model_dump(by_alias=True, exclude=["id"])
+        for item_data in extracted_data
+    ]
+    # One round-trip for the whole summary; the inserted documents are the response,
+    # so there is nothing to read back.
+    result = await db.action_items.insert_many(new_items, ordered=True)
+    await change_versions.record_change(
+        current_user.id, change_versions.ACTION_ITEMS, "action_item.created", result.inserted_ids, meeting_id=meeting_id
+    )
+    for new_item, inserted_id in zip(new_items, result.inserted_ids):
+        new_item["_id"] = inserted_id
+
+    return new_items
+
+@router.post("/meetings/process-batch", response_model=List[MeetingBatchResult])
+async def process_meetings_batch(
+    batch: ProcessBatchRequest,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Extract action items for many meetings at once.
+    Ownership is checked with one query, the summaries are extracted in parallel on
+    the extraction pool and every item is written with one insert_many. Results come
+    back in request order; a meeting that can't be processed gets an `error` instead
+    of failing the whole batch.
+    """
+    _check_batch_size(len(batch.meetings), "meetings")
+
+    results = [MeetingBatchResult(meeting_id=entry.meeting_id) for entry in batch.meetings]
+    object_ids = {}
+    for result in results:
+        if ObjectId.is_valid(result.meeting_id):
+            object_ids[result.meeting_id] = ObjectId(result.meeting_id)
+        else:
+            result.error = "Invalid meeting id"
+
+    owned = set()
+    if object_ids:
+        cursor = db.meetings.find(
+            {"_id": {"$in": list(object_ids.values())}, "user_id": ObjectId(current_user.id)},
+            {"_id": 1},
+        )
+        owned = {str(meeting["_id"]) async for meeting in cursor}
+
+    pending = []
+    for result, entry in zip(results, batch.meetings):
+        if result.error is None and result.meeting_id not in owned:
+            result.error = "Meeting not found"
+        if result.error is None:
+            pending.append((result, entry.summary_text))
+
+    extracted = await extraction.extract_many([summary_text for _, summary_text in pending])
+
+    new_items = []
+    for (result, _), item_datas in zip(pending, extracted):
+        result.action_items = [
+            ActionItem(**item_data, user_id=current_user.id, meeting_id=result.meeting_id)
+            for item_data in item_datas
+        ]
+        new_items.extend(item.model_dump(by_alias=True, exclude=["id"]) for item in result.action_items)
+
+    if new_items:
+        inserted = await route_db("process_meetings_batch").action_items.insert_many(new_items, ordered=True)
+        await change_versions.record_change(
+            current_user.id, change_versions.ACTION_ITEMS, "action_item.created", inserted.inserted_ids
         )
-        result = await db.action_items.insert_one(new_item.model_dump(by_alias=True, exclude=["id"]))
-        created_item = await db.action_items.find_one({"_id": result.inserted_id})
-        created_items.append(created_item)
-        
-    return created_items
+        inserted_ids = iter(inserted.inserted_ids)
+        for result, _ in pending:
+            for item in result.action_items:
+                item.id = str(next(inserted_ids))
+
+    return results
+
+# Sort orders for GET /action-items; _id doubles as creation time and tiebreaker
+ACTION_ITEM_SORTS = {
+    "created_at": [("_id", 1)],
+    "due_date": [("due_date", 1), ("_id", 1)],
+}
+# Fields a list view may ask for with `fields=`
+ACTION_ITEM_FIELDS = {"_id", "description", "action_type", "status", "owner", "due_date", "meeting_id", "user_id"}
+
+def _parse_fields(fields: str) -> List[str]:
+    requested = []
+    for field in fields.split(","):
+        field = field.strip()
+        if not field:
+            continue
+        field = "_id" if field == "id" else field
+        if field not in ACTION_ITEM_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {field}")
+        requested.append(field)
+    return requested
 
 @router.get("/", response_model=List[ActionItem])
 async def get_action_items(
+    request: Request,
+    response: Response,
     current_user: UserResponse = Depends(get_current_user),
-    status: Optional[ActionStatus] = None
+    status: Optional[List[ActionStatus]] = Query(None, description="Repeat to match several statuses, default Pending"),
+    meeting_id: Optional[str] = None,
+    sort: Literal["created_at", "due_date"] = "created_at",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(settings.ACTION_ITEMS_PAGE_SIZE, ge=1, le=settings.ACTION_ITEMS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. description,status"),
 ):
+    """
+    Action items of the current user, one page at a time.
+    When more items remain, the X-Next-Cursor header holds the cursor for the next page.
+    """
     query = {"user_id": current_user.id}
-    if status:
-        query["status"] = status
+    # The PRD's "GET /action-items: Get all pending action items for the current user"
+    # means Pending is the default when no status is given.
+    statuses = [s.value for s in status] if status else [ActionStatus.PENDING.value]
+    query["status"] = statuses[0] if len(statuses) == 1 else {"$in": statuses}
+    if meeting_id:
+        query["meeting_id"] = meeting_id
+
+    direction = 1 if order == "asc" else -1
+    sort_spec = [(field, direction) for field, _ in ACTION_ITEM_SORTS[sort]]
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort_spec, decode_cursor(cursor, len(sort_spec)))]}
+
+    projection = None
+    if fields:
+        requested = _parse_fields(fields)
+        # Sort keys are always fetched so the next cursor can be built
+        projection = {field: 1 for field in requested + [field for field, _ in sort_spec]}
+
+    unchanged = await etags.not_modified(request, response, current_user.id, [change_versions.ACTION_ITEMS])
+    if unchanged:
+        return unchanged
+    cached = await response_cache.lookup("get_action_items", current_user.id, response)
+    if cached:
+        return cached
+
+    # Fetch one extra document to know whether there is a next page
+    items = await route_db("get_action_items").action_items.find(query, projection).sort(sort_spec).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = cursor_for(items[-1], sort_spec)
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if projection is None:
+        rendered = serialization.render_list("get_action_items", ActionItem, items, response)
     else:
-        # Default to showing pending items if not specified? 
-        # Or showing all? PRD says "Get all pending action items" in the goals list usually, 
-        # but standard GET often returns all. 
-        # The prompt says: "GET /action-items: Get all pending action items for the current user."
-        # So let's default to Pending if not specified, or explicitly filter in the frontend.
-        # Let's filter for non-completed/executed by default if deemed "pending", 
-        # OR just return everything and let frontend filter.
-        # Given "Get all pending action items" instruction:
-        query["status"] = ActionStatus.PENDING
-
-    items = await db.action_items.find(query).to_list(100)
-    return items
+        # Partial documents can't satisfy the ActionItem response model, so return them as-is
+        partial_items = [{field: item[field] for field in ["_id"] + requested if field in item} for item in items]
+        if serialization.enabled("get_action_items"):
+            rendered = serialization.json_response(partial_items, response)
+        else:
+            rendered = JSONResponse(
+                content=jsonable_encoder(partial_items, custom_encoder={ObjectId: str}),
+                headers=serialization.carried_headers(response),
+            )
+    return await response_cache.store("get_action_items", current_user.id, [change_versions.ACTION_ITEMS], response, rendered)
+
+# Bulk routes are declared before the /{item_id} routes so "bulk" isn't taken for an id
+
+@router.post("/bulk/update", response_model=List[BulkItemResult])
+async def bulk_update_action_items(
+    request: BulkUpdateRequest,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Apply a separate update to each listed action item in one bulk write.
+    Results come back in request order with `ok` and an `error` per item.
+    """
+    _check_batch_size(len(request.items), "action items")
+    updates = [
+        (entry.id, {k: v for k, v in entry.update.model_dump().items() if v is not None})
+        for entry in request.items
+    ]
+    return await _apply_bulk_updates(updates, current_user.id)
+
+@router.post("/bulk/execute", response_model=List[BulkItemResult], status_code=status.HTTP_202_ACCEPTED)
+async def bulk_execute_action_items(
+    request: BulkIdsRequest,
+    idempotency_key: Optional[str] = Header(None),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Queue every listed action item for execution with one insert.
+    Each result carries the `job_id` to poll at GET /action-items/jobs/{job_id}.
+    """
+    _check_batch_size(len(request.ids), "action items")
+    results, object_ids = _bulk_results(request.ids)
+    owned = {}
+    if object_ids:
+        cursor = db.action_items.find(
+            {"_id": {"$in": list(object_ids.values())}, "user_id": current_user.id}, {"action_type": 1}
+        )
+        owned = {str(item["_id"]): item async for item in cursor}
+
+    jobs = await action_jobs.enqueue_many(list(owned.values()), current_user.id, idempotency_key)
+    for result in results:
+        if result.error is None:
+            job = jobs.get(result.id)
+            result.ok = job is not None
+            if job is None:
+                result.error = "Action item not found"
+            else:
+                result.job_id = str(job["_id"])
+    return results
+
+@router.post("/bulk/delete", response_model=List[BulkItemResult])
+async def bulk_delete_action_items(
+    request: BulkIdsRequest,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Delete every listed action item of the current user.
+    Deleted documents can't be told apart from missing ones afterwards, so the owned
+    ids are looked up first and then removed with one delete_many.
+    """
+    _check_batch_size(len(request.ids), "action items")
+    results, object_ids = _bulk_results(request.ids)
+    owned = await _owned_ids(list(object_ids.values()), current_user.id) if object_ids else set()
+    if owned:
+        await route_db("bulk_delete_action_items").action_items.delete_many(
+            {"_id": {"$in": [object_ids[item_id] for item_id in owned]}, "user_id": current_user.id}
+        )
+        await change_versions.record_change(current_user.id, change_versions.ACTION_ITEMS, "action_item.deleted", owned)
+    for result in results:
+        if result.error is None:
+            result.ok = result.id in owned
+            if not result.ok:
+                result.error = "Action item not found"
+    return results
 
 @router.post("/", response_model=ActionItem)
 async def create_action_item(
@@ -125,8 +356,12 @@ async def create_action_item(
         **item.model_dump(),
         user_id=current_user.id
     )
-    result = await db.action_items.insert_one(new_item.model_dump(by_alias=True, exclude=["id"]))
-    created_item = await db.action_items.find_one({"_id": result.inserted_id})
+    created_item = new_item.model_dump(by_alias=True, exclude=["id"])
+    result = await db.action_items.insert_one(created_item)
+    await change_versions.record_change(
+        current_user.id, change_versions.ACTION_ITEMS, "action_item.created", [result.inserted_id]
+    )
+    created_item["_id"] = result.inserted_id
     return created_item
 
 @router.patch("/{item_id}", response_model=ActionItem)
@@ -135,21 +370,26 @@ async def update_action_item(
     update_data: ActionItemUpdate, 
     current_user: UserResponse = Depends(get_current_user)
 ):
-    # Ensure item belongs to user
-    item = await db.action_items.find_one({"_id": ObjectId(item_id), "user_id": current_user.id})
-    if not item:
-        raise HTTPException(status_code=404, detail="Action item not found")
-
     # Filter out None values
     update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
 
+    # Ownership is part of the filter, so a foreign item simply doesn't match
+    item_filter = {"_id": ObjectId(item_id), "user_id": current_user.id}
     if update_dict:
-        await db.action_items.update_one(
-            {"_id": ObjectId(item_id)},
-            {"$set": update_dict}
+        updated_item = await db.action_items.find_one_and_update(
+            item_filter,
+            {"$set": update_dict},
+            return_document=ReturnDocument.AFTER,
         )
-
-    updated_item = await db.action_items.find_one({"_id": ObjectId(item_id)})
+        if updated_item:
+            event = "action_item.status_changed" if "status" in update_dict else "action_item.updated"
+            await change_versions.record_change(
+                current_user.id, change_versions.ACTION_ITEMS, event, [item_id], status=updated_item["status"]
+            )
+    else:
+        updated_item = await db.action_items.find_one(item_filter)
+    if not updated_item:
+        raise HTTPException(status_code=404, detail="Action item not found")
     return updated_item
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -160,25 +400,38 @@ async def delete_action_item(
     result = await db.action_items.delete_one({"_id": ObjectId(item_id), "user_id": current_user.id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Action item not found")
+    await change_versions.record_change(current_user.id, change_versions.ACTION_ITEMS, "action_item.deleted", [item_id])
     return
 
-@router.post("/{item_id}/execute")
+@router.get("/jobs/{job_id}", response_model=ActionJob)
+async def get_action_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Status of an execution job queued by POST /action-items/{item_id}/execute.
+    """
+    job = await action_jobs.get_job(ObjectId(job_id), current_user.id) if ObjectId.is_valid(job_id) else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/{item_id}/execute", response_model=ExecuteAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def execute_action_item(
     item_id: str,
+    idempotency_key: Optional[str] = Header(None),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
-    Simulate execution of an action item.
-    Updates the status to 'Executed'.
+    Queue the action item for execution and return immediately.
+    The status flips to 'Executed' once a worker has run it; poll
+    GET /action-items/jobs/{job_id} for progress. Repeating the call (with the same
+    Idempotency-Key header, or none) returns the existing job; without a header, an
+    item whose job has failed for good is queued again.
     """
-    # Ensure item belongs to user
-    item = await db.action_items.find_one({"_id": ObjectId(item_id), "user_id": current_user.id})
+    item = await db.action_items.find_one({"_id": ObjectId(item_id), "user_id": current_user.id}, {"action_type": 1})
     if not item:
         raise HTTPException(status_code=404, detail="Action item not found")
 
-    await db.action_items.update_one(
-        {"_id": ObjectId(item_id)},
-        {"$set": {"status": ActionStatus.EXECUTED}}
-    )
-
-    return {"status": "executed"}
\ No newline at end of file
+    job = await action_jobs.enqueue(item, current_user.id, idempotency_key)
+    return {"job_id": job["_id"], "status": job["status"]}
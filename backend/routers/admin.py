@@ -0,0 +1,104 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from backend import database
+from backend.auth.principal_cache import principal_cache
+from backend.auth.security import get_current_admin
+from backend.config import settings
+from backend.indexes import audit_queries, verify_indexes
+from backend.models.profiling import ProfileRequest, ProfileSummary
+from backend.models.user import UserResponse
+from backend.profiling import ProfilerBusy, profiler
+from backend.services.action_jobs import action_job_workers
+from backend.services.change_events import change_broker
+from backend.services.email_delivery import email_delivery
+from backend.services.health import health_monitor
+from backend.services.response_cache import response_cache
+from backend.services.sync_scheduler import sync_scheduler
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"]
+)
+
+@router.get("/indexes")
+async def get_indexes(current_admin: UserResponse = Depends(get_current_admin)):
+    """
+    Expected indexes per collection and whether each one exists.
+    """
+    return await verify_indexes()
+
+@router.get("/index-audit")
+async def get_index_audit(current_admin: UserResponse = Depends(get_current_admin)):
+    """
+    Explain every router query shape and list the ones not served by an index.
+    """
+    return await audit_queries(current_admin)
+
+@router.get("/stats")
+async def get_stats(current_admin: UserResponse = Depends(get_current_admin)):
+    """
+    Every component's counters, as /healthz used to show them.
+    """
+    return {
+        "health": health_monitor.stats(),
+        "mongo_pool": database.pool_monitor.stats(),
+        "principal_cache": principal_cache.stats(),
+        "sync_scheduler": sync_scheduler.stats(),
+        "action_jobs": action_job_workers.stats(),
+        "email_delivery": email_delivery.stats() if email_delivery is not None else None,
+        "events": change_broker.stats(),
+        "response_cache": response_cache.stats(),
+    }
+
+def _check_profiling_enabled():
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+async def list_profiles(current_admin: UserResponse = Depends(get_current_admin)):
+    """
+    The running profile, if any, and the finished ones kept for download; newest first.
+    Profiles are per worker.
+    """
+    _check_profiling_enabled()
+    return profiler.profiles()
+
+@router.post("/profiles", response_model=ProfileSummary, status_code=status.HTTP_201_CREATED)
+async def arm_profile(request: ProfileRequest, current_admin: UserResponse = Depends(get_current_admin)):
+    """
+    Sample the next `requests` requests to `route`, or every request for `seconds`.
+    """
+    _check_profiling_enabled()
+    try:
+        profile = profiler.arm(request.route, request.requests, request.seconds, request.interval_ms, armed_by=current_admin.email)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return profile.summary()
+
+@router.delete("/profiles/active", response_model=ProfileSummary)
+async def stop_profile(current_admin: UserResponse = Depends(get_current_admin)):
+    """
+    End the running profile now.
+    """
+    _check_profiling_enabled()
+    profile = profiler.disarm()
+    if profile is None:
+        raise HTTPException(status_code=404, detail="No profile is running")
+    return profile.summary()
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, current_admin: UserResponse = Depends(get_current_admin)):
+    """
+    The profile's samples as collapsed stacks, for flamegraph.pl or speedscope.
+    """
+    _check_profiling_enabled()
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(
+        content=profile.collapsed(),
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile.id}.collapsed"'},
+    )
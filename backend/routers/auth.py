@@ -4,12 +4,15 @@ from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 from google_auth_oauthlib.flow import Flow
 from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
 import json
 
 from backend.database import db
 from backend.models.user import UserCreate, UserResponse, Token, UserLogin
 from backend.auth.security import get_password_hash, verify_password, create_access_token, get_current_user
+from backend.auth.principal_cache import principal_cache
 from backend.config import settings
+from backend.services import calendar_sync
 
 router = APIRouter(
     prefix="/auth",
@@ -18,22 +21,22 @@ router = APIRouter(
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def signup(user: UserCreate):
-    # Check if user already exists
-    if await db.users.find_one({"email": user.email}):
+    # Hash password and create user
+    user_dict = user.model_dump()
+    user_dict["hashed_password"] = await get_password_hash(user_dict.pop("password"))
+    user_dict["is_active"] = True
+
+    # The unique index on email rejects duplicates atomically, so there is no pre-check
+    try:
+        new_user = await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    
-    # Hash password and create user
-    user_dict = user.model_dump()
-    user_dict["hashed_password"] = get_password_hash(user_dict.pop("password"))
-    user_dict["is_active"] = True
-    
-    new_user = await db.users.insert_one(user_dict)
-    created_user = await db.users.find_one({"_id": new_user.inserted_id})
-    
-    return UserResponse(**created_user)
+
+    user_dict["_id"] = new_user.inserted_id
+    return UserResponse(**user_dict)
 
 class GoogleAuthCode(BaseModel):
     code: str
@@ -114,14 +117,16 @@ async def google_login(auth_data: GoogleAuthCode):
                     "google_access_token": credentials.token
                 }
             }
-            new_user = await db.users.insert_one(user_dict)
-            user = await db.users.find_one({"_id": new_user.inserted_id})
+            user_id = (await db.users.insert_one(user_dict)).inserted_id
         else:
             # Update existing user tokens
             await db.users.update_one(
                 {"_id": user["_id"]},
                 {"$set": update_data}
             )
+            user_id = user["_id"]
+        principal_cache.invalidate(email)
+        await calendar_sync.ensure_sync_state(user_id)
             
         access_token = create_access_token(data={"sub": email})
         return {"access_token": access_token, "token_type": "bearer"}
@@ -150,7 +155,7 @@ async def login(user_credentials: UserLogin):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(user_credentials.password, user["hashed_password"]):
+    if not await verify_password(user_credentials.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -171,7 +176,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(form_data.password, user["hashed_password"]):
+    if not await verify_password(form_data.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
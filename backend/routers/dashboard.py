@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from backend import etags, serialization
+from backend.auth.security import get_current_user
+from backend.database import route_db
+from backend.date_ranges import day_range, parse_timezone
+from backend.models.action_item import ActionStatus
+from backend.models.dashboard import Dashboard
+from backend.models.user import UserResponse
+from backend.services import change_versions
+from backend.services.response_cache import response_cache
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["dashboard"]
+)
+
+
+def dashboard_pipeline(user_id: str, range_start: datetime, range_end: datetime) -> list:
+    """
+    One aggregation for the whole dashboard: the day's meetings in start time order,
+    each with its action items, plus the per-status counts.
+    """
+    return [
+        # Served by the (user_id, start_time, _id) index, including the sort
+        {"$match": {"user_id": ObjectId(user_id), "start_time": {"$gte": range_start, "$lt": range_end}}},
+        {"$sort": {"start_time": 1, "_id": 1}},
+        # action_items.meeting_id holds the meeting id as a string; an equality
+        # lookup on it uses the meeting_id index
+        {"$addFields": {"meeting_key": {"$toString": "$_id"}}},
+        {"$lookup": {
+            "from": "action_items",
+            "localField": "meeting_key",
+            "foreignField": "meeting_id",
+            "as": "action_items",
+        }},
+        {"$addFields": {"action_items": {
+            "$filter": {"input": "$action_items", "cond": {"$eq": ["$$this.user_id", user_id]}},
+        }}},
+        {"$facet": {
+            "meetings": [{"$project": {"meeting_key": 0}}],
+            "meeting_counts": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "action_item_counts": [
+                {"$unwind": "$action_items"},
+                {"$group": {"_id": "$action_items.status", "count": {"$sum": 1}}},
+            ],
+        }},
+    ]
+
+
+@router.get("/", response_model=Dashboard)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    current_user: UserResponse = Depends(get_current_user),
+    date: Optional[str] = Query(None, description="Day to show (YYYY-MM-DD), default today in 'tz'"),
+    tz: Optional[str] = Query(None, description="IANA timezone the day is observed in, default UTC"),
+):
+    """
+    The day's meetings with their action items nested, and meeting and action item
+    counts per status, in one request and one database round-trip.
+    """
+    zone = parse_timezone(tz)
+    day = date or datetime.now(zone).date().isoformat()
+    range_start, range_end = day_range(day, zone)
+
+    # The resolved day is part of the tag, "today" changes without a write
+    unchanged = await etags.not_modified(
+        request, response, current_user.id,
+        [change_versions.MEETINGS, change_versions.ACTION_ITEMS], variant=f"{day}|{zone.key}",
+    )
+    if unchanged:
+        return unchanged
+    cached = await response_cache.lookup("get_dashboard", current_user.id, response)
+    if cached:
+        return cached
+
+    pipeline = dashboard_pipeline(current_user.id, range_start, range_end)
+    result = (await route_db("get_dashboard").meetings.aggregate(pipeline).to_list(1))[0]
+
+    action_item_counts = {s.value: 0 for s in ActionStatus}
+    action_item_counts.update({group["_id"]: group["count"] for group in result["action_item_counts"]})
+    dashboard = {
+        "date": day,
+        "timezone": zone.key,
+        "meetings": result["meetings"],
+        "meeting_counts": {group["_id"]: group["count"] for group in result["meeting_counts"]},
+        "action_item_counts": action_item_counts,
+    }
+    rendered = serialization.model_response(Dashboard, dashboard, response)
+    return await response_cache.store(
+        "get_dashboard", current_user.id, [change_versions.MEETINGS, change_versions.ACTION_ITEMS], response, rendered,
+    )
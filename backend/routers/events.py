@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from backend.auth.security import get_current_user_for_stream
+from backend.config import settings
+from backend.models.user import UserResponse
+from backend.services import change_versions
+from backend.services.change_events import HEARTBEAT, TooManySubscribers, change_broker, encode_event
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"]
+)
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    current_user: UserResponse = Depends(get_current_user_for_stream),
+):
+    """
+    Server-sent events for the current user's meetings and action items, e.g.
+    `meetings.synced`, `action_item.created`, `action_item.status_changed`. Each
+    event's data names its scope, the scope's new version and, when there are few
+    enough, the ids involved. The stream opens with a `hello` event holding the
+    current versions (the same ones the list ETags are built from) and may send
+    `resync` when events had to be dropped; refetch in both cases if in doubt.
+
+    EventSource can't set headers, so the access token may be passed as ?token=.
+    """
+    try:
+        change_broker.check_capacity(current_user.id)
+    except TooManySubscribers as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, settings.EVENTS_RETRY_MS // 1000))},
+        )
+    versions = await change_versions.get_versions(current_user.id)
+
+    async def events():
+        # Subscribed inside the generator so the finally below always runs for it
+        subscription = change_broker.subscribe(current_user.id)
+        try:
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n".encode() + encode_event("hello", {"versions": versions})
+            while True:
+                frame = await subscription.queue.get()
+                if not frame or change_broker.expired(subscription):
+                    return
+                if frame is HEARTBEAT and await request.is_disconnected():
+                    return
+                yield frame
+        finally:
+            change_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # No caching, and no buffering by reverse proxies such as nginx
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, Body, HTTPException, status
 from backend.models.user import UserResponse, UserIntegrations
 from backend.auth.security import get_current_user
+from backend.auth.principal_cache import principal_cache
 from backend.database import db
+from backend.services import calendar_sync
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 router = APIRouter(
     prefix="/user/integrations",
@@ -47,13 +50,16 @@ async def update_integrations(
          # "accepts a partial dict" implies we just apply what works.
          return current_user.integrations
 
-    await db.users.update_one(
+    updated_user = await db.users.find_one_and_update(
         {"_id": ObjectId(current_user.id)},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"integrations": 1},
+        return_document=ReturnDocument.AFTER,
     )
-    
-    # Fetch updated user to return correct state
-    updated_user = await db.users.find_one({"_id": ObjectId(current_user.id)})
-    
-    # Map to UserResponse to ensure everything is parsed correctly, then extract integrations
-    return UserResponse(**updated_user).integrations
\ No newline at end of file
+    principal_cache.invalidate(current_user.email)
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if update_data.get("integrations.google_calendar"):
+        await calendar_sync.ensure_sync_state(updated_user["_id"])
+
+    return UserIntegrations(**updated_user.get("integrations", {}))
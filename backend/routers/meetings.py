@@ -1,18 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone
 from bson import ObjectId
-import random
+from pymongo import ReturnDocument
+import uuid
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
-
-from backend.database import db
+from backend import etags, serialization
+from backend.config import settings
+from backend.database import db, route_db
+from backend.date_ranges import range_filter, resolve_time_range
+from backend.pagination import NEXT_CURSOR_HEADER, cursor_for, decode_cursor, keyset_filter
 from backend.auth.security import get_current_user
 from backend.models.user import UserResponse
 from backend.models.meeting import Meeting, MeetingUpdate, MeetingBase
-from backend.config import settings
+from backend.services import calendar_sync, change_versions
+from backend.services.response_cache import response_cache
 
 router = APIRouter(
     prefix="/meetings",
@@ -20,34 +22,62 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+MEETING_SORT = [("start_time", 1), ("_id", 1)]
+
 @router.get("/", response_model=List[Meeting])
 async def read_meetings(
+    request: Request,
+    response: Response,
     current_user: UserResponse = Depends(get_current_user),
-    date: Optional[str] = None # Optional date filter YYYY-MM-DD
+    date: Optional[str] = None, # Optional date filter YYYY-MM-DD
+    start: Optional[str] = Query(None, alias="from", description="ISO 8601 lower bound on start_time (inclusive)"),
+    end: Optional[str] = Query(None, alias="to", description="ISO 8601 upper bound on start_time (exclusive)"),
+    tz: Optional[str] = Query(None, description="IANA timezone for 'date' and naive 'from'/'to' values, default UTC"),
+    limit: int = Query(settings.MEETINGS_PAGE_SIZE, ge=1, le=settings.MEETINGS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ):
+    """
+    Meetings ordered by start time, optionally limited to a day or a from/to range.
+    When more meetings remain, the X-Next-Cursor header holds the cursor for the next page.
+    """
     query = {"user_id": ObjectId(current_user.id)}
-    
-    # In a real app, we would parse the date and filter by start_time range
-    # For now, we'll just return all meetings for the user
-    
-    meetings = await db.meetings.find(query).to_list(1000)
-    return meetings
+
+    start_time_range = range_filter(*resolve_time_range(date, start, end, tz))
+    if start_time_range:
+        query["start_time"] = start_time_range
+    if cursor:
+        query = {"$and": [query, keyset_filter(MEETING_SORT, decode_cursor(cursor, len(MEETING_SORT)))]}
+
+    unchanged = await etags.not_modified(request, response, current_user.id, [change_versions.MEETINGS])
+    if unchanged:
+        return unchanged
+    cached = await response_cache.lookup("read_meetings", current_user.id, response)
+    if cached:
+        return cached
+
+    # Fetch one extra document to know whether there is a next page
+    meetings = await route_db("read_meetings").meetings.find(query).sort(MEETING_SORT).limit(limit + 1).to_list(limit + 1)
+    if len(meetings) > limit:
+        meetings = meetings[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = cursor_for(meetings[-1], MEETING_SORT)
+    rendered = serialization.render_list("read_meetings", Meeting, meetings, response)
+    return await response_cache.store("read_meetings", current_user.id, [change_versions.MEETINGS], response, rendered)
 
 @router.post("/sync", response_model=dict)
 async def sync_meetings(
     source: str = "mock",
+    days_back: Optional[int] = Query(None, ge=0, le=365),
+    days_ahead: Optional[int] = Query(None, ge=0, le=365),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
     Sync meetings from a source.
     source='mock': Generates sample meeting documents.
     source='google': Syncs from Google Calendar (Real).
+    days_back/days_ahead: Google full-sync window around now. Either one left out
+    keeps the value of the user's last sync (or the default from settings).
     """
     
-    # 1. Clear existing meetings for this user before syncing (as requested)
-    #    This ensures "mock data" and "real data" don't mix confusingly.
-    await db.meetings.delete_many({"user_id": ObjectId(current_user.id)})
-
     if source == "mock":
         # Generate data relative to "now" to simulate today's schedule
         now = datetime.now()
@@ -55,7 +85,7 @@ async def sync_meetings(
         
         sample_meetings = [
             {
-                "google_event_id": f"evt_{random.randint(1000, 9999)}",
+                "google_event_id": f"mock_{today_start:%Y%m%d}_1",
                 "title": "Daily Standup",
                 "start_time": today_start,
                 "end_time": today_start + timedelta(minutes=30),
@@ -68,7 +98,7 @@ async def sync_meetings(
                 "user_id": ObjectId(current_user.id)
             },
             {
-                "google_event_id": f"evt_{random.randint(1000, 9999)}",
+                "google_event_id": f"mock_{today_start:%Y%m%d}_2",
                 "title": "Client Pitch - Project Alpha",
                 "start_time": today_start + timedelta(hours=2),
                 "end_time": today_start + timedelta(hours=3),
@@ -81,7 +111,7 @@ async def sync_meetings(
                 "user_id": ObjectId(current_user.id)
             },
             {
-                "google_event_id": f"evt_{random.randint(1000, 9999)}",
+                "google_event_id": f"mock_{today_start:%Y%m%d}_3",
                 "title": "Team Brainstorm Session",
                 "start_time": today_start + timedelta(hours=5),
                 "end_time": today_start + timedelta(hours=6, minutes=30),
@@ -94,7 +124,7 @@ async def sync_meetings(
                 "user_id": ObjectId(current_user.id)
             },
             {
-                "google_event_id": f"evt_{random.randint(1000, 9999)}",
+                "google_event_id": f"mock_{today_start:%Y%m%d}_4",
                 "title": "1:1 with John",
                 "start_time": today_start + timedelta(hours=7),
                 "end_time": today_start + timedelta(hours=7, minutes=30),
@@ -108,9 +138,16 @@ async def sync_meetings(
             }
         ]
         
-        # Insert them into the database
-        result = await db.meetings.insert_many(sample_meetings)
-        return {"message": "Mock data loaded", "synced_count": len(result.inserted_ids)}
+        # Upsert them and drop whatever else the user had, so "mock data" and
+        # "real data" don't mix confusingly. Re-syncing keeps each meeting's _id and status.
+        sync_run = uuid.uuid4().hex
+        synced_count = await calendar_sync.apply_meeting_operations(
+            ObjectId(current_user.id),
+            [calendar_sync.meeting_upsert(meeting, sync_run) for meeting in sample_meetings],
+        )
+        await calendar_sync.remove_stale_meetings(ObjectId(current_user.id), sync_run)
+        await calendar_sync.reset_sync_state(ObjectId(current_user.id))
+        return {"message": "Mock data loaded", "synced_count": synced_count}
 
     elif source == "google":
         # Check if user has google connected and tokens available
@@ -118,112 +155,19 @@ async def sync_meetings(
              return {"message": "Google Calendar is not connected. Please connect in settings.", "synced_count": 0, "status": "skipped"}
 
         try:
-            # Construct Credentials object
-            creds = Credentials(
-                token=current_user.integrations.google_access_token,
-                refresh_token=current_user.integrations.google_refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=settings.GOOGLE_CLIENT_ID,
-                client_secret=settings.GOOGLE_CLIENT_SECRET,
-            )
-
-            # Refresh token if expired (though 'googleapiclient' handles this if we pass a Request)
-            if creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                    # Update DB with new access token if refreshed
-                    await db.users.update_one(
-                        {"_id": ObjectId(current_user.id)},
-                        {"$set": {"integrations.google_access_token": creds.token}}
-                    )
-                except Exception as e:
-                    print(f"Failed to refresh token: {e}")
-                    return {"message": "Failed to refresh Google token. Please reconnect.", "synced_count": 0, "status": "error"}
-
-            service = build('calendar', 'v3', credentials=creds)
-
-            # Fetch events for a wider range (Yesterday + Today + Tomorrow) to handle timezone overlaps
-            now = datetime.now(timezone.utc)
-            start_of_range = now - timedelta(days=1)
-            end_of_range = now + timedelta(days=2)
-            
-            # Formatting to RFC3339 timestamp
-            time_min = start_of_range.isoformat().replace("+00:00", "Z")
-            time_max = end_of_range.isoformat().replace("+00:00", "Z")
-
-            events_result = service.events().list(
-                calendarId='primary', timeMin=time_min, timeMax=time_max,
-                singleEvents=True, orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            fetched_meetings = []
-
-            for event in events:
-                # Skip cancelled events
-                if event.get('status') == 'cancelled':
-                    continue
-                    
-                # Handle all-day events (date vs dateTime)
-                start = event.get('start')
-                end = event.get('end')
-                
-                start_dt = start.get('dateTime') or start.get('date') # If date, it's YYYY-MM-DD
-                end_dt = end.get('dateTime') or end.get('date')
-
-                # Basic parsing
-                try:
-                    if 'T' in start_dt:
-                        # Parse ISO format (e.g. 2025-12-10T01:00:00+05:00)
-                        start_obj = datetime.fromisoformat(start_dt)
-                        end_obj = datetime.fromisoformat(end_dt)
-                        
-                        # Convert to UTC to ensure consistent storage
-                        if start_obj.tzinfo:
-                            start_obj = start_obj.astimezone(timezone.utc)
-                        else:
-                            # If naive, assume UTC
-                            start_obj = start_obj.replace(tzinfo=timezone.utc)
-                            
-                        if end_obj.tzinfo:
-                            end_obj = end_obj.astimezone(timezone.utc)
-                        else:
-                            end_obj = end_obj.replace(tzinfo=timezone.utc)
-
-                    else:
-                        # All day event (YYYY-MM-DD)
-                        # Treat as start of day UTC
-                        start_obj = datetime.strptime(start_dt, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                        end_obj = datetime.strptime(end_dt, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                except ValueError:
-                    # Fallback
-                    start_obj = datetime.now(timezone.utc)
-                    end_obj = start_obj + timedelta(hours=1)
-
-                is_online = 'conferenceData' in event or 'location' in event and ('zoom' in event['location'] or 'meet' in event['location'])
-                
-                attendees = [a.get('email') for a in event.get('attendees', []) if a.get('email')]
-
-                meeting_doc = {
-                    "google_event_id": event['id'],
-                    "title": event.get('summary', 'No Title'),
-                    "start_time": start_obj,
-                    "end_time": end_obj,
-                    "is_online": is_online,
-                    "location": event.get('location'),
-                    "participants": attendees,
-                    "summary_link": None,
-                    "is_recorded": False, # Cannot determine easily from Calendar API
-                    "status": "pending",
-                    "user_id": ObjectId(current_user.id)
-                }
-                fetched_meetings.append(meeting_doc)
-
-            if fetched_meetings:
-                await db.meetings.insert_many(fetched_meetings)
-            
-            return {"message": "Google Calendar sync completed", "synced_count": len(fetched_meetings), "status": "success"}
-
+            window = None
+            if days_back is not None or days_ahead is not None:
+                current = await calendar_sync.stored_window(ObjectId(current_user.id))
+                window = calendar_sync.SyncWindow(
+                    days_back=current.days_back if days_back is None else days_back,
+                    days_ahead=current.days_ahead if days_ahead is None else days_ahead,
+                )
+            result = await calendar_sync.sync_google_calendar(current_user, window)
+            return {"message": "Google Calendar sync completed", "status": "success", **result}
+
+        except calendar_sync.GoogleTokenRefreshError as e:
+            print(f"Failed to refresh token: {e}")
+            return {"message": "Failed to refresh Google token. Please reconnect.", "synced_count": 0, "status": "error"}
         except Exception as e:
             print(f"Google Sync Error: {e}")
             raise HTTPException(status_code=500, detail=f"Google Sync failed: {str(e)}")
@@ -237,18 +181,23 @@ async def update_meeting_status(
     status_update: MeetingUpdate,
     current_user: UserResponse = Depends(get_current_user)
 ):
-    # Verify meeting exists and belongs to user
-    meeting = await db.meetings.find_one({"_id": ObjectId(meeting_id), "user_id": ObjectId(current_user.id)})
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-    
     update_data = {k: v for k, v in status_update.model_dump().items() if v is not None}
-    
+
+    # Ownership is part of the filter, so a foreign meeting simply doesn't match
+    meeting_filter = {"_id": ObjectId(meeting_id), "user_id": ObjectId(current_user.id)}
     if update_data:
-        await db.meetings.update_one(
-            {"_id": ObjectId(meeting_id)},
-            {"$set": update_data}
+        updated_meeting = await db.meetings.find_one_and_update(
+            meeting_filter,
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
         )
-        
-    updated_meeting = await db.meetings.find_one({"_id": ObjectId(meeting_id)})
-    return updated_meeting
\ No newline at end of file
+        if updated_meeting:
+            event = "meeting.status_changed" if "status" in update_data else "meeting.updated"
+            await change_versions.record_change(
+                current_user.id, change_versions.MEETINGS, event, [meeting_id], status=updated_meeting["status"]
+            )
+    else:
+        updated_meeting = await db.meetings.find_one(meeting_filter)
+    if not updated_meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return updated_meeting
@@ -0,0 +1,123 @@
+"""
+Fast JSON responses for the list endpoints.
+
+Returning raw Mongo documents through `response_model=List[Model]` makes FastAPI
+build a model instance per document before serializing them (older FastAPI
+releases then also ran them through jsonable_encoder). For pages of hundreds of
+documents that dominates the request.
+
+The fast path validates the documents once against a TypedDict generated from the
+response model: same keys (aliases, so "_id"), same field types and validators,
+missing fields filled with the model's defaults and unknown fields dropped, but
+plain dicts come out instead of model instances. orjson then writes those, handling
+datetimes itself and ObjectIds through `_default`. The adapters are built once per
+model and cached.
+
+Routes opt in by name through FAST_SERIALIZATION_ROUTES, so a route can be switched
+back to the response_model path without a deploy of new code. Routes whose
+responses are cached need the encoded body either way and use `render_list`, whose
+fallback (`model_response`) does what the response_model path would have done.
+"""
+import functools
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import Annotated, TypedDict
+
+from backend import metrics
+from backend.config import settings
+
+# Aware UTC datetimes end in "Z", as pydantic writes them
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def enabled(route: str) -> bool:
+    """
+    Whether the endpoint function named `route` should use the fast path.
+    """
+    return route in {name.strip() for name in settings.FAST_SERIALIZATION_ROUTES.split(",")}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@functools.lru_cache(maxsize=None)
+def document_adapter(model: Type[BaseModel]) -> Tuple[TypeAdapter, Dict[str, Any]]:
+    """
+    A TypeAdapter validating a list of `model` documents into dicts, and the
+    defaults to fill in for fields a document lacks.
+    """
+    fields, defaults = {}, {}
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        fields[key] = Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+        if not field.is_required():
+            defaults[key] = field.get_default(call_default_factory=True)
+    document = TypedDict(f"{model.__name__}Document", fields)
+    return TypeAdapter(List[document]), defaults
+
+
+@functools.lru_cache(maxsize=None)
+def model_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=JSON_OPTIONS)
+
+
+def carried_headers(response: Optional[Response]) -> Optional[dict]:
+    """
+    Headers set on an injected `response` (e.g. X-Next-Cursor, ETag). FastAPI ignores
+    them once an endpoint returns a Response itself, so they have to be copied over.
+    """
+    if response is None:
+        return None
+    return {key: value for key, value in response.headers.items() if key != "content-length"}
+
+
+def json_response(content: Any, response: Optional[Response] = None) -> Response:
+    """
+    `content` as an orjson-encoded response, with the headers of `response`.
+    """
+    with metrics.timed("serialize"):
+        body = dumps(content)
+    return Response(content=body, media_type="application/json", headers=carried_headers(response))
+
+
+def list_response(model: Type[BaseModel], documents: Sequence[dict], response: Optional[Response] = None) -> Response:
+    """
+    Validates `documents` as `model` and returns them as a JSON array, the fast
+    equivalent of returning them through `response_model=List[model]`.
+    """
+    adapter, defaults = document_adapter(model)
+    with metrics.timed("serialize"):
+        items = adapter.validate_python([{**defaults, **document} for document in documents])
+    return json_response(items, response)
+
+
+def model_response(response_type: Any, content: Any, response: Optional[Response] = None) -> Response:
+    """
+    `content` validated and serialized as `response_type` the way FastAPI does for
+    `response_model=response_type`, as a response with the headers of `response`.
+    """
+    adapter = model_adapter(response_type)
+    with metrics.timed("serialize"):
+        body = adapter.dump_json(adapter.validate_python(content), by_alias=True)
+    return Response(content=body, media_type="application/json", headers=carried_headers(response))
+
+
+def render_list(route: str, model: Type[BaseModel], documents: Sequence[dict], response: Optional[Response] = None) -> Response:
+    """
+    `documents` as an encoded JSON array of `model`: the fast path when `route` is
+    enabled, else the response_model equivalent. Both produce the same bytes.
+    """
+    if enabled(route):
+        return list_response(model, documents, response)
+    return model_response(List[model], documents, response)
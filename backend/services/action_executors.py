@@ -0,0 +1,91 @@
+import asyncio
+import re
+import smtplib
+from email.message import EmailMessage
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from backend.services.email_delivery import EmailDeliveryService
+
+EMAIL_ADDRESS = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+class PermanentActionError(Exception):
+    """
+    Raised by an executor when retrying can't help, e.g. the action is malformed.
+    The job fails immediately instead of backing off.
+    """
+
+
+class RetryLater(Exception):
+    """
+    Raised by an executor when the action can't run yet, e.g. a rate limit. The job
+    is rescheduled after `retry_after` seconds without using up an attempt.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class ActionExecutor:
+    """
+    Carries out one type of action item. Executors receive the action item document
+    and return a small JSON-serialisable result that is stored on the job.
+
+    Jobs are delivered at least once (a worker that dies mid-job has its job
+    re-claimed once the lease runs out), so executors should be safe to repeat.
+    """
+
+    async def execute(self, item: dict) -> Optional[dict]:
+        raise NotImplementedError
+
+
+class SimulatedExecutor(ActionExecutor):
+    """
+    Stand-in executor that only records the action, optionally after a delay and
+    after failing the first `fail_times` attempts. Used until a real integration is
+    configured for a type, and by the tests.
+    """
+
+    def __init__(self, delay_seconds: float = 0.0, fail_times: int = 0):
+        self.delay_seconds = delay_seconds
+        self.fail_times = fail_times
+        self.calls = 0
+
+    async def execute(self, item: dict) -> Optional[dict]:
+        self.calls += 1
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        if self.calls <= self.fail_times:
+            raise RuntimeError(f"Simulated failure {self.calls} of {self.fail_times}")
+        print(f"Simulated {item.get('action_type')} action: {item.get('description')}")
+        return {"simulated": True}
+
+
+class EmailExecutor(ActionExecutor):
+    """
+    Sends Email action items through the email delivery service. Recipients are the
+    addresses found in the item's owner and description.
+    """
+
+    def __init__(self, delivery: "EmailDeliveryService", sender: str):
+        self.delivery = delivery
+        self.sender = sender
+
+    async def execute(self, item: dict) -> Optional[dict]:
+        text = " ".join(filter(None, [item.get("owner"), item.get("description")]))
+        recipients = list(dict.fromkeys(EMAIL_ADDRESS.findall(text)))
+        if not recipients:
+            raise PermanentActionError("No recipient email address in the action item")
+
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(recipients)
+        message["Subject"] = f"Action item: {item['description'][:80]}"
+        message.set_content(item["description"])
+        try:
+            await self.delivery.send(str(item["user_id"]), message)
+        except smtplib.SMTPRecipientsRefused as e:
+            raise PermanentActionError(f"Recipients refused: {', '.join(e.recipients)}") from e
+        return {"recipients": recipients}
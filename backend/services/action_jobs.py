@@ -0,0 +1,361 @@
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from backend.config import settings
+from backend.database import db
+from backend.models.action_item import ActionStatus, ActionType
+from backend.models.action_job import JobStatus
+from backend.services import change_versions
+from backend.services.action_executors import ActionExecutor, PermanentActionError, RetryLater, SimulatedExecutor
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def job_idempotency_key(item_id: str, key: Optional[str] = None) -> str:
+    """
+    Without a client key an item has at most one live job: executing it again
+    returns that job, unless it failed for good, in which case a new one is queued.
+    A client key is scoped to the item, so one key can cover a whole bulk request.
+    """
+    return f"{key}:{item_id}" if key else f"execute:{item_id}"
+
+
+async def _retire_failed(job: dict) -> bool:
+    """
+    Move a failed job off its default key so the item can be queued again; the
+    job itself stays around for GET /action-items/jobs/{job_id}.
+    """
+    result = await db.action_jobs.update_one(
+        {"_id": job["_id"], "status": JobStatus.FAILED.value},
+        {"$set": {"idempotency_key": f"{job['idempotency_key']}:failed:{job['_id']}"}},
+    )
+    return bool(result.modified_count)
+
+
+def _new_job(item: dict, user_id: str, idempotency_key: str) -> dict:
+    now = datetime.utcnow()
+    return {
+        "user_id": user_id,
+        "action_item_id": item["_id"],
+        "action_type": ActionType(item["action_type"]).value,
+        "idempotency_key": idempotency_key,
+        "status": JobStatus.QUEUED.value,
+        "attempts": 0,
+        "max_attempts": settings.ACTION_JOBS_MAX_ATTEMPTS,
+        "run_at": now,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+async def enqueue(item: dict, user_id: str, idempotency_key: Optional[str] = None) -> dict:
+    """
+    Queue an action item for execution and return its job. Sending the same
+    idempotency key again returns the original job instead of queueing another.
+    """
+    key = job_idempotency_key(str(item["_id"]), idempotency_key)
+    while True:
+        job = _new_job(item, user_id, key)
+        try:
+            await db.action_jobs.insert_one(job)
+        except DuplicateKeyError:
+            existing = await db.action_jobs.find_one({"user_id": user_id, "idempotency_key": key})
+            # No job on the key any more (a failed one was retired meanwhile): insert again
+            if existing is None:
+                continue
+            if idempotency_key or not await _retire_failed(existing):
+                return existing
+            continue
+        action_job_workers.notify(ActionType(job["action_type"]))
+        return job
+
+
+async def enqueue_many(items: List[dict], user_id: str, idempotency_key: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Queue many action items with one insert_many. Returns {item id: job}; items whose
+    key was already used get their existing job (or a new one, as in `enqueue`).
+    """
+    jobs = [_new_job(item, user_id, job_idempotency_key(str(item["_id"]), idempotency_key)) for item in items]
+    if not jobs:
+        return {}
+    duplicate_keys = await _insert_jobs(jobs)
+
+    if duplicate_keys:
+        existing = db.action_jobs.find({"user_id": user_id, "idempotency_key": {"$in": list(duplicate_keys)}})
+        existing_by_key = {job["idempotency_key"]: job async for job in existing}
+        for index, job in enumerate(jobs):
+            if job["idempotency_key"] not in duplicate_keys:
+                continue
+            found = existing_by_key.get(job["idempotency_key"])
+            if found is not None and (idempotency_key or found["status"] != JobStatus.FAILED.value):
+                jobs[index] = found
+            else:
+                # Failed for good, or gone meanwhile: queued one at a time
+                jobs[index] = await enqueue(items[index], user_id, idempotency_key)
+
+    for action_type in {ActionType(job["action_type"]) for job in jobs}:
+        action_job_workers.notify(action_type)
+    return {str(job["action_item_id"]): job for job in jobs}
+
+
+async def _insert_jobs(jobs: List[dict]) -> set:
+    """
+    insert_many that tolerates duplicate keys; returns the keys that were taken.
+    """
+    try:
+        await db.action_jobs.insert_many(jobs, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error["code"] != DUPLICATE_KEY_ERROR for error in errors):
+            raise
+        return {jobs[error["index"]]["idempotency_key"] for error in errors}
+    return set()
+
+
+async def get_job(job_id: ObjectId, user_id: str) -> Optional[dict]:
+    return await db.action_jobs.find_one({"_id": job_id, "user_id": user_id})
+
+
+class ActionJobWorkers:
+    """
+    Executes queued action jobs in the background.
+
+    Jobs live in the `action_jobs` collection, so they survive restarts and can be
+    worked by every app process at once. Each action type gets its own set of worker
+    tasks (its concurrency); a worker claims the oldest due job of its type with one
+    atomic find_one_and_update that also takes a lease, runs it through the type's
+    executor, and records the outcome. Failures are retried with exponential backoff
+    and jitter until `max_attempts`; a job whose worker died is re-claimed once its
+    lease expires.
+
+    Enqueueing in this process wakes the workers immediately; jobs queued elsewhere
+    are picked up within `poll_seconds`.
+    """
+
+    def __init__(
+        self,
+        executors: Dict[ActionType, ActionExecutor],
+        concurrency: Dict[ActionType, int],
+        poll_seconds: float,
+        lease_seconds: float,
+        backoff_seconds: float,
+        backoff_max_seconds: float,
+    ):
+        self.executors = executors
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._wakeups: Dict[ActionType, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+
+        self.running = {action_type: 0 for action_type in ActionType}
+        self.succeeded = {action_type: 0 for action_type in ActionType}
+        self.retried = {action_type: 0 for action_type in ActionType}
+        self.failed = {action_type: 0 for action_type in ActionType}
+
+    def register_executor(self, action_type: ActionType, executor: ActionExecutor) -> None:
+        self.executors[action_type] = executor
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        for action_type, workers in self.concurrency.items():
+            self._wakeups[action_type] = asyncio.Event()
+            for _ in range(workers):
+                self._tasks.append(asyncio.create_task(self._work(action_type)))
+
+    async def stop(self) -> None:
+        # A job interrupted here keeps its lease and is re-claimed once it expires
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeups = {}
+
+    def notify(self, action_type: ActionType) -> None:
+        wakeup = self._wakeups.get(action_type)
+        if wakeup is not None:
+            wakeup.set()
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._tasks),
+            "types": {
+                action_type.value: {
+                    "workers": self.concurrency.get(action_type, 0),
+                    "in_flight": self.running[action_type],
+                    "succeeded": self.succeeded[action_type],
+                    "retried": self.retried[action_type],
+                    "failed": self.failed[action_type],
+                }
+                for action_type in ActionType
+            },
+        }
+
+    async def run_pending(self, action_types: Optional[Iterable[ActionType]] = None) -> int:
+        """
+        Work every due job of the given types (default: all) until none is left.
+        Returns the number of jobs run. Meant for tests and one-off scripts.
+        """
+        count = 0
+        for action_type in action_types or list(ActionType):
+            while (job := await self._claim(action_type)) is not None:
+                await self._run(job)
+                count += 1
+        return count
+
+    async def _work(self, action_type: ActionType) -> None:
+        wakeup = self._wakeups[action_type]
+        while True:
+            # Cleared before claiming so a job enqueued meanwhile isn't missed
+            wakeup.clear()
+            try:
+                job = await self._claim(action_type)
+                if job is not None:
+                    await self._run(job)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Action job worker error ({action_type.value}): {e}")
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self, action_type: ActionType) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await db.action_jobs.find_one_and_update(
+            {
+                "action_type": action_type.value,
+                "$or": [
+                    {"status": JobStatus.QUEUED.value, "run_at": {"$lte": now}},
+                    # Lease ran out: the worker holding it died or was stopped
+                    {"status": JobStatus.RUNNING.value, "lease_until": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "lease_id": uuid.uuid4().hex,
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _run(self, job: dict) -> None:
+        action_type = ActionType(job["action_type"])
+        self.running[action_type] += 1
+        try:
+            item = await db.action_items.find_one({"_id": job["action_item_id"], "user_id": job["user_id"]})
+            if item is None:
+                raise PermanentActionError("Action item not found")
+            executor = self.executors.get(action_type)
+            if executor is None:
+                raise PermanentActionError(f"No executor registered for {action_type.value} actions")
+            result = await executor.execute(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._fail(job, e)
+        else:
+            await self._succeed(job, result)
+        finally:
+            self.running[action_type] -= 1
+
+    async def _finish(self, job: dict, update: dict) -> None:
+        # Only the worker holding the lease may record the outcome
+        await db.action_jobs.update_one(
+            {"_id": job["_id"], "lease_id": job["lease_id"]},
+            {**update, "$unset": {"lease_id": "", "lease_until": ""}},
+        )
+
+    async def _succeed(self, job: dict, result: Optional[dict]) -> None:
+        await db.action_items.update_one(
+            {"_id": job["action_item_id"], "user_id": job["user_id"]},
+            {"$set": {"status": ActionStatus.EXECUTED.value}},
+        )
+        await change_versions.record_change(
+            job["user_id"], change_versions.ACTION_ITEMS, "action_item.status_changed",
+            [job["action_item_id"]], status=ActionStatus.EXECUTED.value,
+        )
+        now = datetime.utcnow()
+        await self._finish(job, {"$set": {
+            "status": JobStatus.SUCCEEDED.value,
+            "result": result,
+            "last_error": None,
+            "updated_at": now,
+            "finished_at": now,
+        }})
+        self.succeeded[ActionType(job["action_type"])] += 1
+
+    async def _fail(self, job: dict, error: Exception) -> None:
+        action_type = ActionType(job["action_type"])
+        now = datetime.utcnow()
+        permanent = isinstance(error, PermanentActionError)
+        exhausted = job["attempts"] >= job["max_attempts"] and not isinstance(error, RetryLater)
+        if permanent or exhausted:
+            print(f"Action job {job['_id']} failed after {job['attempts']} attempt(s): {error}")
+            self.failed[action_type] += 1
+            await self._finish(job, {"$set": {
+                "status": JobStatus.FAILED.value,
+                "last_error": str(error),
+                "updated_at": now,
+                "finished_at": now,
+            }})
+            return
+
+        if isinstance(error, RetryLater):
+            # Not the action's fault (e.g. a rate limit), so it doesn't cost an attempt
+            await self._finish(job, {
+                "$set": {
+                    "status": JobStatus.QUEUED.value,
+                    "run_at": now + timedelta(seconds=error.retry_after),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": -1},
+            })
+            return
+
+        self.retried[action_type] += 1
+        await self._finish(job, {"$set": {
+            "status": JobStatus.QUEUED.value,
+            "last_error": str(error),
+            "run_at": now + timedelta(seconds=self.backoff_delay(job["attempts"])),
+            "updated_at": now,
+        }})
+
+    def backoff_delay(self, attempts: int) -> float:
+        """
+        Exponential backoff after the given number of attempts, with jitter so jobs
+        that failed together don't retry together.
+        """
+        delay = min(self.backoff_max_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+
+action_job_workers = ActionJobWorkers(
+    executors={action_type: SimulatedExecutor() for action_type in ActionType},
+    concurrency={
+        ActionType.EMAIL: settings.ACTION_JOBS_EMAIL_CONCURRENCY,
+        ActionType.INVITE: settings.ACTION_JOBS_INVITE_CONCURRENCY,
+        ActionType.TASK: settings.ACTION_JOBS_TASK_CONCURRENCY,
+    },
+    poll_seconds=settings.ACTION_JOBS_POLL_SECONDS,
+    lease_seconds=settings.ACTION_JOBS_LEASE_SECONDS,
+    backoff_seconds=settings.ACTION_JOBS_BACKOFF_SECONDS,
+    backoff_max_seconds=settings.ACTION_JOBS_BACKOFF_MAX_SECONDS,
+)
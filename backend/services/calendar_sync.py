@@ -0,0 +1,245 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+from google.oauth2.credentials import Credentials
+from googleapiclient.errors import HttpError
+from pymongo import DeleteOne, UpdateOne
+
+from backend.config import settings
+from backend.database import db
+from backend.auth.principal_cache import principal_cache
+from backend.models.user import UserResponse
+from backend.services import change_versions, google_calendar
+
+# Meeting fields owned by the app rather than the calendar. A re-sync only sets them
+# when the meeting is first inserted, so processing state survives every later sync.
+MEETING_STATE_FIELDS = ("status", "summary_link", "is_recorded")
+
+
+class GoogleTokenRefreshError(Exception):
+    """
+    Raised when the stored Google credentials can no longer be refreshed.
+    """
+
+
+def meeting_upsert(meeting: dict, sync_run: Optional[str] = None) -> UpdateOne:
+    """
+    Upsert keyed on (user_id, google_event_id) that refreshes the calendar fields
+    and leaves the app-owned state of an existing meeting untouched.
+    """
+    calendar_fields = {k: v for k, v in meeting.items() if k not in MEETING_STATE_FIELDS}
+    if sync_run:
+        calendar_fields["sync_run"] = sync_run
+    update = {"$set": calendar_fields}
+    state_fields = {k: meeting[k] for k in MEETING_STATE_FIELDS if k in meeting}
+    if state_fields:
+        update["$setOnInsert"] = state_fields
+    return UpdateOne(
+        {"user_id": meeting["user_id"], "google_event_id": meeting["google_event_id"]},
+        update,
+        upsert=True,
+    )
+
+
+async def apply_meeting_operations(user_id: ObjectId, operations: List) -> int:
+    """
+    Write a batch of meeting upserts/deletes for `user_id`. The user's meetings
+    version is only bumped when the batch actually changed something, so syncs that
+    find nothing new keep conditional GETs answering 304.
+    """
+    if not operations:
+        return 0
+    result = await db.meetings.bulk_write(operations, ordered=False)
+    if result.upserted_count or result.modified_count or result.deleted_count:
+        await change_versions.record_change(
+            user_id, change_versions.MEETINGS, "meetings.synced",
+            upserted=result.upserted_count, modified=result.modified_count, deleted=result.deleted_count,
+        )
+    return len(operations)
+
+
+async def remove_stale_meetings(
+    user_id: ObjectId, sync_run: str, start_min: Optional[datetime] = None, start_max: Optional[datetime] = None
+) -> int:
+    """
+    After a full sync, drop the user's meetings that the sync didn't touch.
+
+    A full Google sync only lists the events of its window, so it passes the window
+    as `start_min`/`start_max` and meetings starting outside it are kept.
+    """
+    query = {"user_id": user_id, "sync_run": {"$ne": sync_run}}
+    if start_min is not None or start_max is not None:
+        query["start_time"] = {}
+        if start_min is not None:
+            query["start_time"]["$gte"] = start_min
+        if start_max is not None:
+            query["start_time"]["$lt"] = start_max
+    result = await db.meetings.delete_many(query)
+    if result.deleted_count:
+        await change_versions.record_change(
+            user_id, change_versions.MEETINGS, "meetings.synced", deleted=result.deleted_count
+        )
+    return result.deleted_count
+
+
+async def ensure_sync_state(user_id: ObjectId) -> None:
+    """
+    Create the user's sync state when they connect Google, so the background
+    scheduler picks them up, and end any backoff left from an earlier connection.
+    """
+    await db.calendar_sync_state.update_one(
+        {"user_id": user_id},
+        {"$setOnInsert": {"user_id": user_id}, "$unset": {"failures": "", "next_attempt_at": ""}},
+        upsert=True,
+    )
+
+
+async def reset_sync_state(user_id: ObjectId) -> None:
+    """
+    Forget the stored sync token so the next Google sync is a full one.
+    """
+    await db.calendar_sync_state.update_one({"user_id": user_id}, {"$unset": {"sync_token": ""}})
+
+
+class SyncWindow(NamedTuple):
+    """
+    Days before and after now covered by a full sync.
+    """
+    days_back: int
+    days_ahead: int
+
+    @classmethod
+    def default(cls) -> "SyncWindow":
+        return cls(settings.GOOGLE_SYNC_DAYS_BACK, settings.GOOGLE_SYNC_DAYS_AHEAD)
+
+
+async def stored_window(user_id: ObjectId) -> SyncWindow:
+    """
+    The window of the user's last Google sync, or the default one.
+    """
+    state = await db.calendar_sync_state.find_one({"user_id": user_id}, {"window": 1})
+    stored = (state or {}).get("window")
+    return SyncWindow(*stored) if stored else SyncWindow.default()
+
+
+def _rfc3339(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+async def _sync_pages(creds: Credentials, user_id: ObjectId, params: dict, sync_run: Optional[str]) -> Tuple[int, Optional[str]]:
+    """
+    Stream every page of an events listing into Mongo, flushing a bulk write each time
+    GOOGLE_SYNC_BATCH_SIZE operations have accumulated, so memory stays bounded by
+    one page plus one batch regardless of the calendar size.
+    """
+    operations = []
+    synced_count = 0
+    next_sync_token = None
+    params = dict(params, maxResults=settings.GOOGLE_SYNC_PAGE_SIZE)
+    async for page in google_calendar.iter_event_pages(creds, **params):
+        for event in page.get('items', []):
+            if event.get('status') == 'cancelled':
+                operations.append(DeleteOne({"user_id": user_id, "google_event_id": event['id']}))
+            else:
+                operations.append(meeting_upsert(google_calendar.event_to_meeting(event, user_id), sync_run))
+            if len(operations) >= settings.GOOGLE_SYNC_BATCH_SIZE:
+                synced_count += await apply_meeting_operations(user_id, operations)
+                operations = []
+        # Google only hands out the next sync token on the last page
+        next_sync_token = page.get('nextSyncToken')
+
+    synced_count += await apply_meeting_operations(user_id, operations)
+    return synced_count, next_sync_token
+
+
+async def _full_sync(creds: Credentials, user_id: ObjectId, window: SyncWindow) -> Tuple[int, Optional[str]]:
+    now = datetime.now(timezone.utc)
+    time_min = now - timedelta(days=window.days_back)
+    time_max = now + timedelta(days=window.days_ahead)
+    params = {
+        "calendarId": "primary",
+        "timeMin": _rfc3339(time_min),
+        "timeMax": _rfc3339(time_max),
+        "singleEvents": True,
+    }
+    sync_run = uuid.uuid4().hex
+    synced_count, next_sync_token = await _sync_pages(creds, user_id, params, sync_run)
+    await remove_stale_meetings(user_id, sync_run, time_min, time_max)
+    return synced_count, next_sync_token
+
+
+async def _incremental_sync(creds: Credentials, user_id: ObjectId, sync_token: str) -> Tuple[int, Optional[str]]:
+    # timeMin/timeMax/orderBy are not allowed together with a sync token
+    params = {"calendarId": "primary", "syncToken": sync_token, "singleEvents": True}
+    return await _sync_pages(creds, user_id, params, sync_run=None)
+
+
+async def sync_google_calendar(user: UserResponse, window: Optional[SyncWindow] = None) -> dict:
+    """
+    Sync a user's primary Google Calendar into `meetings`.
+
+    The first sync (and any sync after Google answers 410 Gone for the stored token,
+    or with a `window` other than the stored one) is a full sync of the time window;
+    every other sync only applies the changes since the stored `nextSyncToken`.
+    Without a `window` the last one stored (or the default) is used.
+    """
+    user_id = ObjectId(user.id)
+    creds = google_calendar.build_credentials(user.integrations)
+    original_token = creds.token
+
+    try:
+        # Refresh token if expired (the authorized transport also refreshes on a 401)
+        if creds.expired and creds.refresh_token:
+            try:
+                await google_calendar.refresh_credentials(creds)
+            except Exception as e:
+                raise GoogleTokenRefreshError(str(e)) from e
+
+        state = await db.calendar_sync_state.find_one({"user_id": user_id})
+        sync_token = (state or {}).get("sync_token")
+        stored_window = (state or {}).get("window")
+        if window is None:
+            window = SyncWindow(*stored_window) if stored_window else SyncWindow.default()
+        elif stored_window and list(window) != stored_window:
+            # Events in the newly covered range only arrive with a full listing
+            sync_token = None
+
+        synced = None
+        if sync_token:
+            try:
+                synced = await _incremental_sync(creds, user_id, sync_token)
+                mode = "incremental"
+            except HttpError as e:
+                if e.resp.status != 410:
+                    raise
+                print(f"Calendar sync token expired for user {user.id}, running a full sync")
+        if synced is None:
+            synced = await _full_sync(creds, user_id, window)
+            mode = "full"
+        synced_count, next_sync_token = synced
+
+        # A successful sync, manual or not, also ends any background retry backoff
+        await db.calendar_sync_state.update_one(
+            {"user_id": user_id},
+            {
+                "$set": {
+                    "sync_token": next_sync_token,
+                    "window": list(window),
+                    "last_synced_at": datetime.now(timezone.utc),
+                },
+                "$unset": {"failures": "", "next_attempt_at": "", "last_error": ""},
+            },
+            upsert=True,
+        )
+    finally:
+        # Persist a refreshed access token even if the sync itself failed
+        if creds.token != original_token:
+            await db.users.update_one(
+                {"_id": user_id},
+                {"$set": {"integrations.google_access_token": creds.token}}
+            )
+            principal_cache.invalidate(user.email)
+
+    return {"synced_count": synced_count, "mode": mode}
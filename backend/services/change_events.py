@@ -0,0 +1,269 @@
+"""
+Per-user change events for GET /events/stream (server-sent events).
+
+Sources
+-------
+Every write path already reports its change through
+`change_versions.record_change`, which bumps the user's version and stores the
+change as `last_change.<scope>` on the user's `change_versions` document. Events
+come from there in one of two ways:
+
+  change_streams  each worker watches `change_versions` with a Mongo change stream,
+                  so a write on any worker (or the scheduler, or the job workers)
+                  reaches the subscribers on every worker. Needs a replica set.
+  memory          `record_change` hands the event straight to the local broker.
+                  Only subscribers on the worker that made the write are told.
+
+EVENTS_SOURCE=auto tries change streams and falls back to memory when the
+deployment doesn't support them.
+
+Fan-out
+-------
+A worker can hold thousands of idle streams, so per-connection cost is kept to a
+Subscription (a bounded queue) and the response's generator; there is no task or
+timer per connection:
+
+  - each event is encoded into its SSE frame once and the same bytes object is
+    queued for every subscriber of that user;
+  - each queue holds at most EVENTS_QUEUE_SIZE frames. A subscriber that falls
+    behind has its backlog dropped and gets one `resync` event instead, telling the
+    client to refetch, so a slow client can't grow memory without bound;
+  - one broker task queues a keep-alive comment for every idle subscriber each
+    EVENTS_HEARTBEAT_SECONDS. That keeps proxies from closing the connection and
+    is also where closed connections are noticed. Streams past
+    EVENTS_MAX_STREAM_SECONDS end with the next frame they get, and the browser's
+    EventSource reconnects on its own.
+
+Shutdown
+--------
+uvicorn waits for open connections to finish before it runs the lifespan shutdown,
+so streams can't be left for `stop()` to end. main.py calls `close_streams()` as
+soon as the shutdown signal arrives: every open stream ends right away and any
+stream opened after that ends straight after its `hello`.
+"""
+import asyncio
+import time
+from typing import Dict, Optional, Set
+
+from backend.config import settings
+from backend.database import db
+from backend.serialization import dumps
+
+HEARTBEAT = b": keep-alive\n\n"
+# Queued to end a stream, e.g. on shutdown; the only empty frame
+CLOSE = b""
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+def encode_event(event: str, data: dict, event_id: Optional[str] = None) -> bytes:
+    frame = f"event: {event}\n"
+    if event_id:
+        frame = f"id: {event_id}\n" + frame
+    return frame.encode() + b"data: " + dumps(data) + b"\n\n"
+
+
+class Subscription:
+    __slots__ = ("user_id", "queue", "opened_at", "overflows")
+
+    def __init__(self, user_id: str, queue_size: int):
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(queue_size)
+        self.opened_at = time.monotonic()
+        self.overflows = 0
+
+    def offer(self, frame: bytes) -> bool:
+        """
+        Queue `frame` without waiting. When the queue is full the backlog is replaced
+        by a single resync event; returns False in that case.
+        """
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            return False
+
+
+RESYNC = encode_event("resync", {"reason": "Too many events were missed, refetch everything"})
+
+
+class ChangeEventBroker:
+    def __init__(
+        self,
+        source: str,
+        queue_size: int,
+        heartbeat_seconds: float,
+        max_connections: int,
+        max_connections_per_user: int,
+        max_stream_seconds: float,
+    ):
+        self.source = source
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_connections = max_connections
+        self.max_connections_per_user = max_connections_per_user
+        self.max_stream_seconds = max_stream_seconds
+        # Where events come from right now; "memory" until a change stream is open
+        self.active_source = "memory"
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._tasks = []
+        self.closing = False
+
+        self.connections = 0
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        if self.source in ("auto", "change_streams"):
+            self._tasks.append(asyncio.create_task(self._watch()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self.active_source = "memory"
+        self.close_streams()
+
+    def close_streams(self) -> None:
+        """
+        End every open stream, and every stream opened from now on.
+        """
+        self.closing = True
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                self._close(subscription)
+
+    @staticmethod
+    def _close(subscription: Subscription) -> None:
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(CLOSE)
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._tasks),
+            "source": self.active_source,
+            "connections": self.connections,
+            "users": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+    def check_capacity(self, user_id: str) -> None:
+        if self.connections >= self.max_connections:
+            raise TooManySubscribers("This server can't take more event streams, retry later")
+        if len(self._subscribers.get(user_id, ())) >= self.max_connections_per_user:
+            raise TooManySubscribers("Too many open event streams for this user")
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        self.connections += 1
+        if self.closing:
+            self._close(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+        self.connections -= 1
+
+    def record(self, user_id: str, change: dict) -> None:
+        """
+        Called by change_versions.record_change for every change. Published here
+        unless a change stream is delivering the change to every worker instead.
+        """
+        if self.active_source == "memory":
+            self.publish(user_id, change)
+
+    def publish(self, user_id: str, change: dict) -> None:
+        self.published += 1
+        subscriptions = self._subscribers.get(user_id)
+        if not subscriptions:
+            return
+        frame = encode_event(change["type"], change, f"{change['scope']}-{change['version']}")
+        for subscription in subscriptions:
+            if subscription.offer(frame):
+                self.delivered += 1
+            else:
+                self.dropped += 1
+
+    def expired(self, subscription: Subscription) -> bool:
+        return time.monotonic() - subscription.opened_at > self.max_stream_seconds
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            for subscriptions in list(self._subscribers.values()):
+                for subscription in subscriptions:
+                    if subscription.queue.empty():
+                        subscription.queue.put_nowait(HEARTBEAT)
+
+    async def _watch(self) -> None:
+        resume_token = None
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+        while True:
+            try:
+                async with db.change_versions.watch(pipeline, resume_after=resume_token) as stream:
+                    if self.active_source != "change_streams":
+                        print("Change events: watching change_versions with a change stream")
+                    self.active_source = "change_streams"
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        self._publish_stream_change(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.active_source != "change_streams":
+                    if self.source == "auto":
+                        print(f"Change events: change streams unavailable ({e}), using in-process events")
+                        return
+                    print(f"Change events: can't open the change stream, retrying: {e}")
+                else:
+                    print(f"Change events: change stream interrupted, resuming: {e}")
+                # Events recorded meanwhile still reach this worker's subscribers
+                self.active_source = "memory"
+                await asyncio.sleep(1)
+
+    def _publish_stream_change(self, change: dict) -> None:
+        user_id = change["documentKey"]["_id"]
+        if change["operationType"] == "update":
+            fields = change["updateDescription"]["updatedFields"]
+            recorded = {key.split(".", 1)[1]: value for key, value in fields.items() if key.startswith("last_change.")}
+            # The first change recorded on an older document sets last_change whole
+            recorded.update(fields.get("last_change", {}))
+        else:
+            fields = change.get("fullDocument", {})
+            recorded = fields.get("last_change", {})
+        for scope, last_change in recorded.items():
+            if scope in fields:
+                self.publish(user_id, {**last_change, "scope": scope, "version": fields[scope]})
+
+change_broker = ChangeEventBroker(
+    source=settings.EVENTS_SOURCE,
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    heartbeat_seconds=settings.EVENTS_HEARTBEAT_SECONDS,
+    max_connections=settings.EVENTS_MAX_CONNECTIONS,
+    max_connections_per_user=settings.EVENTS_MAX_CONNECTIONS_PER_USER,
+    max_stream_seconds=settings.EVENTS_MAX_STREAM_SECONDS,
+)
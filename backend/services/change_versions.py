@@ -0,0 +1,67 @@
+"""
+Per-user change versions for meetings and action items.
+
+Every write path that changes a user's meetings or action items calls
+`record_change` once its write is done, which increments the user's counter for
+that scope in the `change_versions` collection. GET endpoints read the versions
+before running their query and derive their ETag from them (see backend/etags.py),
+so an unchanged list can be answered with 304 without querying it. The same
+versions key the server-side response cache (services/response_cache.py), whose
+entries for the scope are dropped here too.
+
+Bumping after the write and reading before the query means a response can be
+tagged with an older version than its data (the client simply refetches next
+time) but never with a newer one, which would hide the change behind a 304.
+"""
+from typing import Any, Dict, Iterable, Optional, Union
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from backend.database import db
+from backend.services.change_events import change_broker
+from backend.services.response_cache import response_cache
+
+MEETINGS = "meetings"
+ACTION_ITEMS = "action_items"
+SCOPES = (MEETINGS, ACTION_ITEMS)
+
+# Changes naming more documents than this carry no ids; clients refetch the list
+MAX_EVENT_IDS = 100
+
+
+async def record_change(
+    user_id: Union[str, ObjectId],
+    scope: str,
+    event: str,
+    ids: Optional[Iterable[Any]] = None,
+    **details: Any,
+) -> int:
+    """
+    Mark the user's `scope` as changed by `event` (e.g. "action_item.created") on
+    the documents `ids`. Call after the write has been applied. The change is kept
+    as `last_change.<scope>` and published to the user's event streams (see
+    services/change_events.py), and the user's cached responses for `scope` are
+    dropped. Returns the new version.
+    """
+    change = {"type": event, **details}
+    if ids is not None:
+        ids = [str(document_id) for document_id in ids]
+        if len(ids) <= MAX_EVENT_IDS:
+            change["ids"] = ids
+    document = await db.change_versions.find_one_and_update(
+        {"_id": str(user_id)},
+        {"$inc": {scope: 1}, "$set": {f"last_change.{scope}": change}},
+        projection={scope: 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    version = document[scope]
+    await response_cache.invalidate(str(user_id), scope)
+    change_broker.record(str(user_id), {**change, "scope": scope, "version": version})
+    return version
+
+
+async def get_versions(user_id: Union[str, ObjectId], scopes: Iterable[str] = SCOPES) -> Dict[str, int]:
+    document = await db.change_versions.find_one({"_id": str(user_id)}, {"last_change": 0}) or {}
+    return {scope: document.get(scope, 0) for scope in scopes}
@@ -0,0 +1,358 @@
+import asyncio
+import queue
+import smtplib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from typing import Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.services.action_executors import RetryLater
+
+# Per-user buckets kept before full (i.e. idle) ones are dropped
+MAX_TRACKED_USERS = 10000
+
+
+class EmailRateLimited(RetryLater):
+    """
+    Raised when a user has used up their send rate; `retry_after` says when the
+    next message would be accepted.
+    """
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Take a token. Returns 0 on success, else the seconds until one is available.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_second)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate_per_second
+
+    @property
+    def full(self) -> bool:
+        elapsed = time.monotonic() - self.updated
+        return self.tokens + elapsed * self.rate_per_second >= self.capacity
+
+
+class EmailTransport:
+    """
+    Delivers batches of messages. Implementations report a result per message
+    (None when it was sent) instead of failing the whole batch.
+    """
+
+    # Batches the transport can deliver at the same time
+    concurrency: int = 1
+
+    async def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class SMTPTransport(EmailTransport):
+    """
+    SMTP delivery over a pool of persistent connections.
+
+    smtplib is blocking, so each batch runs on a dedicated thread pool with one
+    connection checked out for the whole batch: the TCP/TLS handshake, EHLO and AUTH
+    are paid once per connection instead of once per message. Connections go back
+    to the pool afterwards; one the server has dropped is reopened and the message
+    retried once.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        pool_size: int = 4,
+        timeout_seconds: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.concurrency = pool_size
+        self.timeout_seconds = timeout_seconds
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+    async def send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._send_batch, messages)
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            try:
+                connection.quit()
+            except smtplib.SMTPException:
+                connection.close()
+            except OSError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.concurrency,
+            "idle_connections": self._idle.qsize(),
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="smtp")
+        return self._executor
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout_seconds)
+        if self.starttls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password or "")
+        self.connections_opened += 1
+        return connection
+
+    def _checkout(self) -> smtplib.SMTP:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+        self.connections_reused += 1
+        return connection
+
+    def _send_batch(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        results: List[Optional[Exception]] = []
+        connection = None
+        for message in messages:
+            try:
+                if connection is None:
+                    connection = self._checkout()
+                try:
+                    connection.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    connection = self._connect()
+                    connection.send_message(message)
+                results.append(None)
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError) as e:
+                # No usable connection, the rest of the batch would fail the same way
+                results.extend([e] * (len(messages) - len(results)))
+                return results
+            except smtplib.SMTPException as e:
+                results.append(e)
+                try:
+                    # Clear the failed transaction before the next message
+                    connection.rset()
+                except (smtplib.SMTPException, OSError):
+                    connection.close()
+                    connection = None
+
+        if connection is not None:
+            self._idle.put(connection)
+        return results
+
+
+class EmailDeliveryService:
+    """
+    Batches outgoing email, rate limits it per user and reports throughput.
+
+    `send` checks the sender's token bucket (EMAIL_RATE_PER_MINUTE with bursts of
+    EMAIL_RATE_BURST) and queues the message. A dispatcher collects queued messages
+    into batches of up to `batch_size`, waiting at most `linger_seconds` for a batch
+    to fill, and hands them to the transport with at most `transport.concurrency`
+    batches in flight. `send` returns once its own message was delivered.
+    """
+
+    def __init__(
+        self,
+        transport: EmailTransport,
+        batch_size: int,
+        linger_seconds: float,
+        rate_per_minute: float,
+        burst: int,
+    ):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.linger_seconds = linger_seconds
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._deliveries = set()
+
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.batches = 0
+        self.in_flight = 0
+        self._latency_total = 0.0
+        # (monotonic time, messages sent) per delivered batch over the last minute
+        self._recent: "deque[Tuple[float, int]]" = deque()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.transport.concurrency)
+            self._task = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Email delivery stopped"))
+        await self.transport.close()
+
+    async def send(self, user_id: str, message: EmailMessage) -> None:
+        if self._task is None:
+            raise RuntimeError("Email delivery is not running")
+        if self.rate_per_minute > 0:
+            retry_after = self._bucket(user_id).take()
+            if retry_after:
+                self.rate_limited += 1
+                raise EmailRateLimited(retry_after)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, future, time.monotonic()))
+        await future
+
+    def stats(self) -> dict:
+        self._trim_recent(time.monotonic())
+        delivered = self.sent + self.failed
+        return {
+            "running": self._task is not None,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self.in_flight,
+            "sent": self.sent,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "batches": self.batches,
+            "avg_batch_size": delivered / self.batches if self.batches else 0.0,
+            "avg_latency_ms": self._latency_total / delivered * 1000 if delivered else 0.0,
+            "sent_per_second_1m": sum(count for _, count in self._recent) / 60,
+            "transport": self.transport.stats(),
+        }
+
+    def _bucket(self, user_id: str) -> TokenBucket:
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_USERS:
+                self._buckets = {key: b for key, b in self._buckets.items() if not b.full}
+            bucket = TokenBucket(self.rate_per_minute / 60, self.burst)
+            self._buckets[user_id] = bucket
+        return bucket
+
+    def _trim_recent(self, now: float) -> None:
+        while self._recent and self._recent[0][0] < now - 60:
+            self._recent.popleft()
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.linger_seconds
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._deliver(batch))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, batch: list) -> None:
+        self.in_flight += len(batch)
+        try:
+            try:
+                results = await self.transport.send_batch([message for message, _, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+        finally:
+            self.in_flight -= len(batch)
+            self._slots.release()
+
+        now = time.monotonic()
+        self.batches += 1
+        sent = 0
+        for (_, future, queued_at), error in zip(batch, results):
+            self._latency_total += now - queued_at
+            if error is None:
+                sent += 1
+                if not future.done():
+                    future.set_result(None)
+            else:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(error)
+        self.sent += sent
+        self._recent.append((now, sent))
+        self._trim_recent(now)
+
+
+def build_email_delivery() -> Optional[EmailDeliveryService]:
+    """
+    The SMTP-backed delivery service, or None when no SMTP server is configured.
+    """
+    if not settings.SMTP_HOST:
+        return None
+    transport = SMTPTransport(
+        host=settings.SMTP_HOST,
+        port=settings.SMTP_PORT,
+        username=settings.SMTP_USERNAME,
+        password=settings.SMTP_PASSWORD,
+        starttls=settings.SMTP_STARTTLS,
+        pool_size=settings.SMTP_POOL_SIZE,
+        timeout_seconds=settings.SMTP_TIMEOUT_SECONDS,
+    )
+    return EmailDeliveryService(
+        transport,
+        batch_size=settings.EMAIL_BATCH_SIZE,
+        linger_seconds=settings.EMAIL_BATCH_LINGER_MS / 1000,
+        rate_per_minute=settings.EMAIL_RATE_PER_MINUTE,
+        burst=settings.EMAIL_RATE_BURST,
+    )
+
+
+email_delivery = build_email_delivery()
@@ -0,0 +1,193 @@
+import asyncio
+import multiprocessing
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from backend import metrics
+from backend.config import settings
+from backend.models.action_item import ActionStatus, ActionType
+
+# Line prefixes that mark an action item, per action type. Types are tried in this
+# order, so a line is an Email before it is an Invite before it is a Task.
+DEFAULT_KEYWORDS: Dict[ActionType, Sequence[str]] = {
+    ActionType.EMAIL: ("Email", "Contact"),
+    ActionType.INVITE: ("Invite", "Schedule"),
+    ActionType.TASK: ("Action", "Task", "TODO", "Next Step"),
+}
+# Words introducing an ISO date at the end of an item, e.g. "due: 2023-01-01"
+DEFAULT_DUE_KEYWORDS: Sequence[str] = ("due by", "due on", "due", "deadline")
+
+# Types whose description keeps the whole line for context
+FULL_LINE_TYPES = (ActionType.EMAIL, ActionType.INVITE)
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """
+    Lines of `text` one at a time, without materialising them as a list (or, unlike
+    io.StringIO, copying the text into a wider buffer).
+    """
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # Longest first so "due by" wins over "due"
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+class ActionExtractor:
+    """
+    Single-pass, line-oriented action item extraction.
+
+    Every keyword set is compiled into one alternation with a named group per action
+    type, so each line is classified by a single match instead of one regex per
+    type. `extract` is a generator over any iterable of lines (a list, an open file,
+    a request stream), so transcripts never have to be held in memory as a list of
+    lines.
+    """
+
+    def __init__(
+        self,
+        keywords: Optional[Dict[ActionType, Sequence[str]]] = None,
+        due_keywords: Optional[Sequence[str]] = None,
+    ):
+        keywords = keywords or DEFAULT_KEYWORDS
+        due_keywords = DEFAULT_DUE_KEYWORDS if due_keywords is None else due_keywords
+
+        self._group_types: Dict[str, ActionType] = {}
+        type_groups = []
+        for index, (action_type, words) in enumerate(keywords.items()):
+            group = f"type{index}"
+            self._group_types[group] = action_type
+            type_groups.append(f"(?P<{group}>{_alternation(words)})")
+
+        # The body is either "<text> <due keyword> <date>" followed by nothing but
+        # punctuation, or any text at all
+        if due_keywords:
+            due = rf"\b(?:{_alternation(due_keywords)})\s*:?\s*(?P<due>\d{{4}}-\d{{2}}-\d{{2}})\W*"
+            body = rf"(?P<body>.*?{due}|.*)"
+        else:
+            body = r"(?P<body>.*)"
+        self.pattern = re.compile(rf"(?:{'|'.join(type_groups)}):\s*{body}$", re.IGNORECASE)
+
+    def extract_line(self, line: str) -> Optional[dict]:
+        line = line.strip()
+        if not line:
+            return None
+        match = self.pattern.match(line)
+        if match is None:
+            return None
+
+        action_type = self._action_type(match)
+        if action_type in FULL_LINE_TYPES:
+            description = line
+        else:
+            description = match.group("body").strip()
+        if not description:
+            return None
+
+        return {
+            "description": description,
+            "action_type": action_type,
+            "status": ActionStatus.PENDING,
+            "due_date": self._due_date(match),
+        }
+
+    def extract(self, lines: Iterable[str]) -> Iterator[dict]:
+        for line in lines:
+            item = self.extract_line(line)
+            if item is not None:
+                yield item
+
+    def extract_text(self, text: str) -> Iterator[dict]:
+        return self.extract(iter_lines(text))
+
+    def _action_type(self, match: "re.Match") -> ActionType:
+        for group, action_type in self._group_types.items():
+            if match.group(group) is not None:
+                return action_type
+        raise ValueError("No action type group matched")
+
+    @staticmethod
+    def _due_date(match: "re.Match") -> Optional[datetime]:
+        due = match.groupdict().get("due")
+        if not due:
+            return None
+        try:
+            return datetime.fromisoformat(due)
+        except ValueError:
+            # Looks like a date but isn't one, e.g. 2023-13-40
+            return None
+
+
+action_extractor = ActionExtractor()
+
+
+# Batch processing extracts many summaries at once. The regex work holds the GIL, so
+# by default it runs on a process pool; it never runs on the event loop.
+_executor: Optional[Executor] = None
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.EXTRACTION_EXECUTOR == "process":
+            # Spawned rather than forked workers don't inherit the server's listening
+            # socket or its signal handlers, so they never outlive the app
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.EXTRACTION_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EXTRACTION_WORKERS, thread_name_prefix="extraction"
+            )
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def extract_summary(text: str) -> List[dict]:
+    return list(action_extractor.extract_text(text))
+
+
+def _observe(mode: str, results: Sequence[List[dict]], started: float) -> None:
+    # Counted here rather than in extract_summary, which also runs in pool processes
+    metrics.EXTRACTION_SECONDS.labels(mode).observe(time.perf_counter() - started)
+    metrics.EXTRACTION_SUMMARIES.labels(mode).inc(len(results))
+    metrics.EXTRACTION_ITEMS.labels(mode).inc(sum(len(items) for items in results))
+
+
+def extract_one(text: str) -> List[dict]:
+    """
+    Extract a single summary on the calling thread.
+    """
+    started = time.perf_counter()
+    items = extract_summary(text)
+    _observe("inline", [items], started)
+    return items
+
+
+async def extract_many(texts: Sequence[str]) -> List[List[dict]]:
+    """
+    Extract every summary in parallel on the extraction pool, in input order.
+    """
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    results = await asyncio.gather(*(loop.run_in_executor(executor, extract_summary, text) for text in texts))
+    _observe("batch", results, started)
+    return results
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+import httplib2
+import requests
+from bson import ObjectId
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+from backend import metrics
+from backend.config import settings
+from backend.models.user import UserIntegrations
+
+# The google client libraries are synchronous, so every network call goes through
+# this dedicated pool instead of running on the event loop. Each worker thread keeps
+# its own HTTP connections (see _thread_http / _thread_session) so they get reused
+# across syncs instead of paying a new TLS handshake per request.
+_executor: Optional[ThreadPoolExecutor] = None
+_thread_state = threading.local()
+_discovery_document: Optional[dict] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.GOOGLE_API_WORKERS, thread_name_prefix="google-api"
+        )
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _thread_http() -> httplib2.Http:
+    http = getattr(_thread_state, "http", None)
+    if http is None:
+        http = httplib2.Http(timeout=settings.GOOGLE_API_TIMEOUT_SECONDS)
+        _thread_state.http = http
+    return http
+
+
+def _thread_session() -> requests.Session:
+    session = getattr(_thread_state, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_state.session = session
+    return session
+
+
+def _calendar_discovery_document() -> dict:
+    """
+    The Calendar v3 discovery document bundled with google-api-python-client,
+    parsed once per process so building a service never hits the network.
+    """
+    global _discovery_document
+    if _discovery_document is None:
+        _discovery_document = json.loads(get_static_doc("calendar", "v3"))
+    return _discovery_document
+
+
+def _build_service(creds: Credentials):
+    client_options = None
+    if settings.GOOGLE_CALENDAR_API_URL:
+        client_options = {"api_endpoint": settings.GOOGLE_CALENDAR_API_URL}
+    authed_http = AuthorizedHttp(creds, http=_thread_http())
+    return build_from_document(
+        _calendar_discovery_document(), http=authed_http, client_options=client_options
+    )
+
+
+async def _run(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), fn, *args)
+
+
+def build_credentials(integrations: UserIntegrations) -> Credentials:
+    return Credentials(
+        token=integrations.google_access_token,
+        refresh_token=integrations.google_refresh_token,
+        token_uri=settings.GOOGLE_TOKEN_URI,
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+    )
+
+
+async def refresh_credentials(creds: Credentials) -> None:
+    def _refresh():
+        creds.refresh(Request(session=_thread_session()))
+
+    with metrics.google_api_call("token.refresh"):
+        await _run(_refresh)
+
+
+async def list_events(creds: Credentials, **params) -> dict:
+    """
+    One page of `events().list` for the given credentials.
+    If the access token is rejected, the authorized transport refreshes it in place
+    (callers can compare `creds.token` afterwards to persist the new one).
+    """
+    def _list():
+        return _build_service(creds).events().list(**params).execute()
+
+    with metrics.google_api_call("events.list"):
+        return await _run(_list)
+
+
+async def iter_event_pages(creds: Credentials, **params) -> AsyncIterator[dict]:
+    """
+    Follow `nextPageToken` and yield each `events().list` page as it arrives,
+    so callers can process a calendar of any size one page at a time.
+    """
+    page_token = None
+    while True:
+        page_params = dict(params, pageToken=page_token) if page_token else params
+        page = await list_events(creds, **page_params)
+        yield page
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            return
+
+
+def _parse_event_time(value: dict) -> datetime:
+    raw = value.get('dateTime') or value.get('date')  # If date, it's YYYY-MM-DD
+    if 'T' in raw:
+        # Parse ISO format (e.g. 2025-12-10T01:00:00+05:00)
+        parsed = datetime.fromisoformat(raw)
+        # Convert to UTC to ensure consistent storage; if naive, assume UTC
+        if parsed.tzinfo:
+            return parsed.astimezone(timezone.utc)
+        return parsed.replace(tzinfo=timezone.utc)
+    # All day event (YYYY-MM-DD), treat as start of day UTC
+    return datetime.strptime(raw, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+def event_to_meeting(event: dict, user_id: ObjectId) -> dict:
+    """
+    Map a Calendar API event resource to a meeting document.
+    """
+    try:
+        start_obj = _parse_event_time(event.get('start'))
+        end_obj = _parse_event_time(event.get('end'))
+    except ValueError:
+        # Fallback
+        start_obj = datetime.now(timezone.utc)
+        end_obj = start_obj + timedelta(hours=1)
+
+    is_online = 'conferenceData' in event or 'location' in event and ('zoom' in event['location'] or 'meet' in event['location'])
+
+    attendees = [a.get('email') for a in event.get('attendees', []) if a.get('email')]
+
+    return {
+        "google_event_id": event['id'],
+        "title": event.get('summary', 'No Title'),
+        "start_time": start_obj,
+        "end_time": end_obj,
+        "is_online": is_online,
+        "location": event.get('location'),
+        "participants": attendees,
+        "summary_link": None,
+        "is_recorded": False,  # Cannot determine easily from Calendar API
+        "status": "pending",
+        "user_id": user_id,
+    }
@@ -0,0 +1,186 @@
+"""
+Background health monitor behind /livez, /readyz and /healthz.
+
+Orchestrator probes hit every worker every few seconds, so the probe endpoints
+never touch a dependency themselves. Instead the monitor runs two tasks:
+
+  probe     every HEALTH_CHECK_INTERVAL_SECONDS pings Mongo (and the response
+            cache's Redis, when that backend is in use) with a timeout of
+            HEALTH_CHECK_TIMEOUT_SECONDS and records the outcome and latency
+  loop lag  sleeps HEALTH_LOOP_LAG_INTERVAL_SECONDS at a time and records how much
+            later than asked it woke up, i.e. how long callbacks wait for the loop
+
+/livez only says the process is serving. /readyz is 200 while the last Mongo
+probe succeeded and is recent, the connection pool isn't saturated (checked-out
+share of MONGO_MAX_POOL_SIZE, or checkouts timing out since the last probe), the
+recent loop lag is within HEALTH_MAX_LOOP_LAG_MS and the app isn't shutting down;
+503 otherwise, with the failing checks. Redis being down only degrades the
+response cache to misses, so it is reported but doesn't make a worker unready.
+
+"Shutting down" is set by main.py when the shutdown signal arrives. uvicorn stops
+accepting connections at the same moment, so only requests on connections still
+open while it drains can see it; take the worker out of the load balancer before
+signalling it (e.g. a preStop delay) rather than relying on /readyz for that.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+from backend import database, metrics
+from backend.config import settings
+from backend.services.response_cache import response_cache
+
+
+class HealthMonitor:
+    def __init__(
+        self,
+        interval_seconds: float,
+        timeout_seconds: float,
+        lag_interval_seconds: float,
+        max_loop_lag_ms: float,
+        max_pool_utilization: float,
+    ):
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.lag_interval_seconds = lag_interval_seconds
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.max_pool_utilization = max_pool_utilization
+        self._tasks = []
+        self.started_at = time.monotonic()
+        self.shutting_down = False
+
+        self.probes = 0
+        self.db_ok: Optional[bool] = None
+        self.db_latency_ms: Optional[float] = None
+        self.db_error: Optional[str] = None
+        self.cache_ok: Optional[bool] = None
+        self.cache_error: Optional[str] = None
+        self.last_probe_at: Optional[float] = None
+        self.pool_utilization = 0.0
+        self.pool_checkout_failures = 0
+        self._seen_checkout_failures = 0
+        self.loop_lag_ms = 0.0
+        # Lag samples covering about one probe interval
+        self._lag_samples = deque(maxlen=max(1, int(interval_seconds / lag_interval_seconds)))
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self.shutting_down = False
+        self._tasks.append(asyncio.create_task(self._probe_loop()))
+        self._tasks.append(asyncio.create_task(self._lag_loop()))
+
+    def begin_shutdown(self) -> None:
+        self.shutting_down = True
+
+    async def stop(self) -> None:
+        self.shutting_down = True
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    @property
+    def db_status(self) -> str:
+        """
+        The /healthz "db" value as of the last probe.
+        """
+        if self.db_ok is None:
+            return "unknown"
+        return "connected" if self.db_ok else "disconnected"
+
+    @property
+    def recent_loop_lag_ms(self) -> float:
+        return max(self._lag_samples, default=0.0)
+
+    def readiness(self) -> dict:
+        """
+        The readiness verdict from the cached probe results; no I/O.
+        """
+        failures = []
+        if self.shutting_down:
+            failures.append("shutting down")
+        if self.db_ok is None:
+            failures.append("database not probed yet")
+        elif not self.db_ok:
+            failures.append(f"database unreachable: {self.db_error}")
+        elif time.monotonic() - self.last_probe_at > 3 * self.interval_seconds + self.timeout_seconds:
+            failures.append("database probe is stale")
+        if self.pool_utilization >= self.max_pool_utilization:
+            failures.append(f"connection pool {self.pool_utilization:.0%} checked out")
+        if self.pool_checkout_failures:
+            failures.append(f"{self.pool_checkout_failures} connection checkouts failed since the last probe")
+        if self.recent_loop_lag_ms > self.max_loop_lag_ms:
+            failures.append(f"event loop lag {self.recent_loop_lag_ms:.0f} ms")
+        return {"ready": not failures, "failures": failures, "checks": self.stats()}
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._tasks),
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1),
+            "probes": self.probes,
+            "last_probe_age_seconds": round(time.monotonic() - self.last_probe_at, 1) if self.last_probe_at else None,
+            "db": self.db_status,
+            "db_latency_ms": self.db_latency_ms,
+            "response_cache": None if self.cache_ok is None else ("ok" if self.cache_ok else self.cache_error),
+            "pool_utilization": round(self.pool_utilization, 3),
+            "loop_lag_ms": round(self.loop_lag_ms, 2),
+            "recent_max_loop_lag_ms": round(self.recent_loop_lag_ms, 2),
+        }
+
+    async def probe(self) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(database.get_client().admin.command("ping"), self.timeout_seconds)
+            self.db_ok, self.db_error = True, None
+            self.db_latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        except asyncio.TimeoutError:
+            self.db_ok, self.db_error = False, f"no reply within {self.timeout_seconds}s"
+        except Exception as e:
+            self.db_ok, self.db_error = False, str(e)
+
+        if response_cache.backend is not None:
+            try:
+                await asyncio.wait_for(response_cache.probe(), self.timeout_seconds)
+                self.cache_ok, self.cache_error = True, None
+            except Exception as e:
+                self.cache_ok, self.cache_error = False, str(e) or type(e).__name__
+
+        pool = database.pool_monitor.stats()
+        self.pool_utilization = pool["checked_out"] / pool["max_pool_size"] if pool["max_pool_size"] else 0.0
+        self.pool_checkout_failures = pool["checkout_failures"] - self._seen_checkout_failures
+        self._seen_checkout_failures = pool["checkout_failures"]
+        self.probes += 1
+        self.last_probe_at = time.monotonic()
+
+    async def _probe_loop(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Health monitor error: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def _lag_loop(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval_seconds)
+            lag_seconds = max(0.0, time.perf_counter() - started - self.lag_interval_seconds)
+            metrics.EVENT_LOOP_LAG.observe(lag_seconds)
+            self.loop_lag_ms = lag_seconds * 1000
+            self._lag_samples.append(self.loop_lag_ms)
+
+health_monitor = HealthMonitor(
+    interval_seconds=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout_seconds=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+    lag_interval_seconds=settings.HEALTH_LOOP_LAG_INTERVAL_SECONDS,
+    max_loop_lag_ms=settings.HEALTH_MAX_LOOP_LAG_MS,
+    max_pool_utilization=settings.HEALTH_MAX_POOL_UTILIZATION,
+)
@@ -0,0 +1,286 @@
+"""
+Read-through cache of rendered list responses (GET /meetings/, GET /action-items/,
+GET /dashboard/).
+
+Entries are keyed by route, user and the response's ETag. The ETag already covers
+the query string, resolved defaults and the user's change versions of the scopes
+the route reads (see backend/etags.py), so as soon as a write bumps a version the
+old entries can no longer be hit, on every worker. On top of that
+`change_versions.record_change` drops the user's entries for the changed scope,
+so superseded responses don't sit in the cache until they are evicted.
+
+A hit still costs the version read the ETag is built from, but skips the list
+query and the serialization. Backends (RESPONSE_CACHE_BACKEND):
+
+  memory  an LRU per worker, bounded by RESPONSE_CACHE_MAX_BYTES
+  redis   a Redis-compatible server at REDIS_URL shared by all workers. Needs the
+          redis package; Redis' own maxmemory policy bounds its size
+  none    no caching
+
+Entries larger than RESPONSE_CACHE_MAX_ENTRY_BYTES are not cached, and every
+entry expires after RESPONSE_CACHE_TTL_SECONDS.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Sequence, Set, Tuple
+
+import orjson
+from fastapi import Response
+
+from backend.config import settings
+
+# Rough per-entry bookkeeping cost on top of the body, key and headers
+ENTRY_OVERHEAD_BYTES = 400
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse, int, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self.bytes = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, cached, _, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return cached
+
+    async def set(self, key: str, cached: CachedResponse, tags: Sequence[str]) -> None:
+        size = len(key) + len(cached.body) + sum(len(k) + len(v) for k, v in cached.headers.items()) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, cached, size, tuple(tags))
+        self.bytes += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def invalidate(self, tag: str) -> int:
+        keys = self._tags.pop(tag, ())
+        for key in list(keys):
+            self._remove(key)
+        return len(keys)
+
+    def memory(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+    async def probe(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, _, size, tags = entry
+        self.bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend:
+    """
+    Each entry is a hash (body, headers) with a TTL; each user and scope has a set
+    of its entry keys so invalidation can delete exactly those.
+    """
+    name = "redis"
+    prefix = "response_cache:"
+
+    def __init__(self, url: str, ttl_seconds: float):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the redis package (pip install redis)") from e
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self._redis = redis.from_url(url)
+        # Refreshed by probe(), which the health monitor calls on its interval
+        self._memory: dict = {}
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        body, headers = await self._redis.hmget(self.prefix + key, ["body", "headers"])
+        if body is None or headers is None:
+            return None
+        return CachedResponse(body, orjson.loads(headers))
+
+    async def set(self, key: str, cached: CachedResponse, tags: Sequence[str]) -> None:
+        key = self.prefix + key
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={"body": cached.body, "headers": orjson.dumps(cached.headers)})
+            pipe.expire(key, self.ttl_seconds)
+            for tag in tags:
+                pipe.sadd(self.prefix + "tag:" + tag, key)
+                pipe.expire(self.prefix + "tag:" + tag, self.ttl_seconds)
+            await pipe.execute()
+
+    async def invalidate(self, tag: str) -> int:
+        tag_key = self.prefix + "tag:" + tag
+        keys = await self._redis.smembers(tag_key)
+        await self._redis.delete(tag_key, *keys)
+        return len(keys)
+
+    def memory(self) -> dict:
+        return self._memory
+
+    async def probe(self) -> None:
+        info = await self._redis.info("memory")
+        self._memory = {"used_memory": info.get("used_memory"), "maxmemory": info.get("maxmemory")}
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class ResponseCache:
+    def __init__(self, backend: str, max_bytes: int, max_entry_bytes: int, ttl_seconds: float, redis_url: str):
+        self.backend_name = backend
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self.backend = None
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """
+        Create the backend; until then (and with RESPONSE_CACHE_BACKEND=none)
+        every lookup misses and nothing is stored.
+        """
+        if self.backend is not None or self.ttl_seconds <= 0:
+            return
+        if self.backend_name == "memory":
+            self.backend = MemoryBackend(self.max_bytes, self.ttl_seconds)
+        elif self.backend_name == "redis":
+            self.backend = RedisBackend(self.redis_url, self.ttl_seconds)
+
+    async def stop(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+            self.backend = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "backend": self.backend.name if self.backend is not None else "none",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "stores": self.stores,
+            "skipped": self.skipped,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+        if self.backend is not None:
+            stats["memory"] = self.backend.memory()
+        return stats
+
+    async def probe(self) -> None:
+        """
+        Check the backend is reachable and refresh its memory figures; raises if
+        it isn't. Called by the health monitor (services/health.py).
+        """
+        if self.backend is not None:
+            await self.backend.probe()
+
+    @staticmethod
+    def _key(route: str, user_id: str, response: Response) -> Optional[str]:
+        etag = response.headers.get("etag")
+        if not etag:
+            return None
+        return f"{route}:{user_id}:" + etag.strip('"')
+
+    async def lookup(self, route: str, user_id: str, response: Response) -> Optional[Response]:
+        """
+        The cached response for `route` if there is one for the ETag that
+        etags.not_modified put on `response`.
+        """
+        if self.backend is None:
+            return None
+        key = self._key(route, user_id, response)
+        if key is None:
+            return None
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            print(f"Response cache: lookup failed: {e}")
+            return None
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Response(content=cached.body, headers=cached.headers)
+
+    async def store(self, route: str, user_id: str, scopes: Sequence[str], response: Response, rendered: Response) -> Response:
+        """
+        Keep `rendered` (a Response with its body already encoded) under the ETag
+        on `response`, dropped again when any of the user's `scopes` changes.
+        Returns `rendered`.
+        """
+        if self.backend is None:
+            return rendered
+        key = self._key(route, user_id, response)
+        if key is None:
+            return rendered
+        if len(rendered.body) > self.max_entry_bytes:
+            self.skipped += 1
+            return rendered
+        headers = {name: value for name, value in rendered.headers.items() if name != "content-length"}
+        try:
+            await self.backend.set(key, CachedResponse(bytes(rendered.body), headers), [f"{user_id}:{scope}" for scope in scopes])
+            self.stores += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"Response cache: store failed: {e}")
+        return rendered
+
+    async def invalidate(self, user_id: str, scope: str) -> None:
+        """
+        Drop the user's responses that read `scope`. Called by
+        change_versions.record_change for every change.
+        """
+        if self.backend is None:
+            return
+        try:
+            self.invalidations += await self.backend.invalidate(f"{user_id}:{scope}")
+        except Exception as e:
+            self.errors += 1
+            print(f"Response cache: invalidation failed: {e}")
+
+response_cache = ResponseCache(
+    backend=settings.RESPONSE_CACHE_BACKEND,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    max_entry_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL,
+)
@@ -0,0 +1,245 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+from backend.config import settings
+from backend.database import db
+from backend.models.user import UserResponse
+from backend.services import calendar_sync
+
+CONNECTED_USERS = {
+    "integrations.google_calendar": True,
+    "integrations.google_refresh_token": {"$nin": [None, ""]},
+}
+
+
+class CalendarSyncScheduler:
+    """
+    Keeps every Google-connected user's meetings fresh in the background.
+
+    Each tick reads the `calendar_sync_state` documents that are due (their
+    `last_synced_at` watermark is older than the interval and nobody holds their
+    lease), so its round trips grow with the work due rather than with the number of
+    users. State documents are seeded when a user connects Google (and once at
+    start for users connected before). A user is claimed with a lease on their state
+    document once a sync slot is free, so several app workers can run the scheduler
+    without syncing the same user twice.
+
+    Each sync reuses the window stored by the user's last sync. A user whose sync
+    fails (e.g. a revoked Google token) is retried with exponential backoff, up to
+    `max_backoff_seconds` between attempts, rather than on every tick.
+    """
+
+    def __init__(
+        self, interval_seconds: float, concurrency: int, jitter_seconds: float, lease_seconds: float,
+        max_backoff_seconds: float,
+    ):
+        self.interval_seconds = interval_seconds
+        self.concurrency = concurrency
+        self.jitter_seconds = jitter_seconds
+        self.lease_seconds = lease_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._task: Optional[asyncio.Task] = None
+
+        self.ticks = 0
+        self.syncs_total = 0
+        self.failures_total = 0
+        self.last_tick_synced = 0
+        self.last_tick_duration_seconds = 0.0
+        self.last_tick_finished_at: Optional[datetime] = None
+        self.max_lag_seconds = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        duration = self.last_tick_duration_seconds
+        return {
+            "running": self._task is not None,
+            "ticks": self.ticks,
+            "syncs_total": self.syncs_total,
+            "failures_total": self.failures_total,
+            "last_tick_synced": self.last_tick_synced,
+            "last_tick_duration_seconds": duration,
+            "last_tick_throughput_per_second": self.last_tick_synced / duration if duration else 0.0,
+            "last_tick_finished_at": self.last_tick_finished_at,
+            # Age of the stalest watermark seen in the last tick
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+    async def _run(self) -> None:
+        try:
+            await self._seed_states()
+        except Exception as e:
+            print(f"Calendar sync scheduler couldn't seed sync states: {e}")
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Calendar sync scheduler error: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> int:
+        """
+        Sync every user that is due. Returns the number of successful syncs.
+        """
+        started = time.monotonic()
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        synced = 0
+        max_lag = 0.0
+
+        async def sync_user(user: UserResponse):
+            nonlocal synced
+            try:
+                if self.jitter_seconds:
+                    await asyncio.sleep(random.uniform(0, self.jitter_seconds))
+                if await self._sync_user(user):
+                    synced += 1
+            finally:
+                slots.release()
+
+        now = datetime.utcnow()
+        due = await db.calendar_sync_state.find(self._due_filter(now), {"user_id": 1}).to_list(None)
+        user_ids = [state["user_id"] for state in due]
+        users = {
+            user_doc["_id"]: user_doc
+            async for user_doc in db.users.find({"_id": {"$in": user_ids}, **CONNECTED_USERS})
+        }
+        disconnected = [user_id for user_id in user_ids if user_id not in users]
+        if disconnected:
+            # Not due again before the next interval, or until they reconnect
+            await db.calendar_sync_state.update_many(
+                {"user_id": {"$in": disconnected}},
+                {"$set": {"next_attempt_at": now + timedelta(seconds=self.interval_seconds)}},
+            )
+
+        for user_id, user_doc in users.items():
+            # Claim only once a slot is free, so the lease isn't spent waiting for one
+            await slots.acquire()
+            lag = await self._claim(user_id)
+            if lag is None:
+                slots.release()
+                continue
+            max_lag = max(max_lag, lag)
+            task = asyncio.create_task(sync_user(UserResponse(**user_doc)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+        self.ticks += 1
+        self.last_tick_synced = synced
+        self.last_tick_duration_seconds = time.monotonic() - started
+        self.last_tick_finished_at = datetime.utcnow()
+        self.max_lag_seconds = max_lag
+        return synced
+
+    def _due_filter(self, now: datetime) -> dict:
+        return {
+            "$and": [
+                {"$or": [
+                    {"last_synced_at": None},
+                    {"last_synced_at": {"$lt": now - timedelta(seconds=self.interval_seconds)}},
+                ]},
+                {"$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]},
+                {"$or": [{"next_attempt_at": None}, {"next_attempt_at": {"$lte": now}}]},
+            ],
+        }
+
+    async def _claim(self, user_id: ObjectId) -> Optional[float]:
+        """
+        Take the sync lease for a user whose watermark is due.
+        Returns the watermark's age in seconds, or None if the user isn't due any more
+        or is being synced elsewhere.
+        """
+        now = datetime.utcnow()
+        state = await db.calendar_sync_state.find_one_and_update(
+            {"user_id": user_id, **self._due_filter(now)},
+            {"$set": {"lease_until": now + timedelta(seconds=self.lease_seconds)}},
+        )
+        if state is None:
+            return None
+        last_synced_at = state.get("last_synced_at")
+        if last_synced_at is None:
+            return 0.0
+        return (now - last_synced_at.replace(tzinfo=None)).total_seconds()
+
+    async def _seed_states(self) -> None:
+        """
+        Create the missing sync states of users who connected Google before states
+        were seeded on connect.
+        """
+        user_ids = [user_doc["_id"] async for user_doc in db.users.find(CONNECTED_USERS, {"_id": 1})]
+        seeded = {
+            state["user_id"]
+            async for state in db.calendar_sync_state.find({"user_id": {"$in": user_ids}}, {"user_id": 1})
+        }
+        missing = [user_id for user_id in user_ids if user_id not in seeded]
+        if missing:
+            await db.calendar_sync_state.bulk_write(
+                [UpdateOne({"user_id": user_id}, {"$setOnInsert": {"user_id": user_id}}, upsert=True) for user_id in missing],
+                ordered=False,
+            )
+
+    def backoff_seconds(self, failures: int) -> float:
+        """
+        Delay before the next attempt after `failures` consecutive failed syncs.
+        """
+        return min(self.interval_seconds * 2 ** (failures - 1), self.max_backoff_seconds)
+
+    async def _sync_user(self, user: UserResponse) -> bool:
+        user_id = ObjectId(user.id)
+        try:
+            # No window: the sync reuses the one stored by the user's last sync
+            await calendar_sync.sync_google_calendar(user)
+            self.syncs_total += 1
+            await db.calendar_sync_state.update_one(
+                {"user_id": user_id},
+                {"$unset": {"lease_until": "", "last_error": "", "failures": "", "next_attempt_at": ""}},
+            )
+            return True
+        except Exception as e:
+            self.failures_total += 1
+            print(f"Background calendar sync failed for user {user.id}: {e}")
+            now = datetime.utcnow()
+            state = await db.calendar_sync_state.find_one_and_update(
+                {"user_id": user_id},
+                {"$set": {"last_error": str(e), "last_attempt_at": now},
+                 "$inc": {"failures": 1},
+                 "$unset": {"lease_until": ""}},
+                return_document=ReturnDocument.AFTER,
+            )
+            failures = (state or {}).get("failures", 1)
+            await db.calendar_sync_state.update_one(
+                {"user_id": user_id},
+                {"$set": {"next_attempt_at": now + timedelta(seconds=self.backoff_seconds(failures))}},
+            )
+            return False
+
+
+sync_scheduler = CalendarSyncScheduler(
+    interval_seconds=settings.SYNC_SCHEDULER_INTERVAL_SECONDS,
+    concurrency=settings.SYNC_SCHEDULER_CONCURRENCY,
+    jitter_seconds=settings.SYNC_SCHEDULER_JITTER_SECONDS,
+    lease_seconds=settings.SYNC_SCHEDULER_LEASE_SECONDS,
+    max_backoff_seconds=settings.SYNC_SCHEDULER_MAX_BACKOFF_SECONDS,
+)
@@ -1,6 +1,7 @@
 import http.client
 import json
 import random
+import time
 
 # Reuse auth flow logic to get a token
 random_id = random.randint(1000, 9999)
@@ -147,4 +148,89 @@ if len(items_after_delete) != 1:
          print("Failed to retrieve executed item")
          exit(1)
 
+# 8. Multi-status filter with field projection
+print("\n--- Multi-Status Filter with Projection ---")
+status, raw_data = make_request(
+    "GET",
+    f"/action-items/?status=Pending&status=Executed&meeting_id={first_meeting_id}&fields=description",
+    headers=auth_headers,
+)
+print(f"Status: {status}")
+print(f"Response: {raw_data}")
+projected_items = json.loads(raw_data)
+if len(projected_items) != 2:
+    print(f"Expected 2 Pending/Executed items for the meeting, got {len(projected_items)}")
+    exit(1)
+if any(set(item) != {"_id", "description"} for item in projected_items):
+    print("Projection returned unexpected fields")
+    exit(1)
+
+# 9. Batch processing with one unknown meeting
+print("\n--- Process Meetings Batch ---")
+missing_meeting_id = "0" * 24
+batch_data = json.dumps({"meetings": [
+    {"meeting_id": first_meeting_id, "summary_text": "Invite: Schedule the retro.\nNext Step: Ship it due 2030-01-15"},
+    {"meeting_id": missing_meeting_id, "summary_text": "Task: Should not be stored."},
+]})
+status, raw_data = make_request("POST", "/action-items/meetings/process-batch", batch_data, auth_headers)
+print(f"Status: {status}")
+print(f"Response: {raw_data}")
+if status != 200:
+    print("Batch processing failed")
+    exit(1)
+
+batch_results = json.loads(raw_data)
+if [result["meeting_id"] for result in batch_results] != [first_meeting_id, missing_meeting_id]:
+    print("Batch results are not in request order")
+    exit(1)
+if len(batch_results[0]["action_items"]) != 2 or batch_results[0]["error"] is not None:
+    print("Expected 2 items for the owned meeting")
+    exit(1)
+if not batch_results[0]["action_items"][1]["due_date"].startswith("2030-01-15"):
+    print("Due date was not extracted")
+    exit(1)
+if batch_results[1]["error"] != "Meeting not found" or batch_results[1]["action_items"]:
+    print("Expected an error for the unknown meeting")
+    exit(1)
+
+batch_item_ids = [item["_id"] for item in batch_results[0]["action_items"]]
+
+# 10. Bulk update, execute and delete
+print("\n--- Bulk Update / Execute / Delete ---")
+bulk_update = json.dumps({"items": [{"id": batch_item_ids[0], "update": {"owner": "Dana"}}]})
+status, raw_data = make_request("POST", "/action-items/bulk/update", bulk_update, auth_headers)
+print(f"Update status: {status}, response: {raw_data}")
+if status != 200 or not json.loads(raw_data)[0]["ok"]:
+    print("Bulk update failed")
+    exit(1)
+
+bulk_ids = json.dumps({"ids": batch_item_ids + [missing_meeting_id, "not-an-id"]})
+status, raw_data = make_request("POST", "/action-items/bulk/execute", bulk_ids, auth_headers)
+print(f"Execute status: {status}, response: {raw_data}")
+bulk_results = json.loads(raw_data) if status == 202 else []
+if [result["ok"] for result in bulk_results] != [True, True, False, False]:
+    print("Unexpected bulk execute outcomes")
+    exit(1)
+
+# Execution is queued; wait for the workers to run both jobs
+for result in bulk_results[:2]:
+    for _ in range(50):
+        status, raw_data = make_request("GET", f"/action-items/jobs/{result['job_id']}", headers=auth_headers)
+        if json.loads(raw_data)["status"] in ("succeeded", "failed"):
+            break
+        time.sleep(0.2)
+
+status, raw_data = make_request("GET", f"/action-items/?status=Executed&meeting_id={first_meeting_id}", headers=auth_headers)
+executed = {item["_id"]: item for item in json.loads(raw_data)}
+if not set(batch_item_ids) <= set(executed) or executed[batch_item_ids[0]]["owner"] != "Dana":
+    print("Bulk changes were not applied")
+    exit(1)
+
+status, raw_data = make_request("POST", "/action-items/bulk/delete", bulk_ids, auth_headers)
+print(f"Delete status: {status}, response: {raw_data}")
+outcomes = [result["ok"] for result in json.loads(raw_data)] if status == 200 else []
+if outcomes != [True, True, False, False]:
+    print("Unexpected bulk delete outcomes")
+    exit(1)
+
 print("\n--- Action Flow Verification Successful ---")
\ No newline at end of file
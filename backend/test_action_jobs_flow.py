@@ -0,0 +1,177 @@
+import asyncio
+import os
+import sys
+from datetime import timedelta
+
+# Allow absolute imports from backend.* when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017/test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ["ACTION_JOBS_MAX_ATTEMPTS"] = "3"
+
+from bson import ObjectId
+
+from backend.database import db
+from backend.indexes import ensure_indexes
+from backend.models.action_item import ActionType
+from backend.services import action_jobs
+from backend.services.action_executors import ActionExecutor, PermanentActionError, RetryLater, SimulatedExecutor
+from backend.services.action_jobs import ActionJobWorkers
+
+user_id = str(ObjectId())
+
+
+class RejectingExecutor(ActionExecutor):
+    async def execute(self, item):
+        raise PermanentActionError("Invite has no attendees")
+
+
+async def create_item(action_type: ActionType) -> dict:
+    item = {"description": f"{action_type.value} item", "action_type": action_type.value,
+            "status": "Pending", "user_id": user_id}
+    await db.action_items.insert_one(item)
+    return item
+
+
+async def wait_for_job(job_id, timeout=5.0) -> dict:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await action_jobs.get_job(job_id, user_id)
+        if job["status"] in ("succeeded", "failed") or asyncio.get_running_loop().time() > deadline:
+            return job
+        await asyncio.sleep(0.05)
+
+
+async def main():
+    await ensure_indexes()
+    task_executor = SimulatedExecutor(delay_seconds=0.2)
+    flaky_executor = SimulatedExecutor(fail_times=2)
+    workers = ActionJobWorkers(
+        executors={ActionType.TASK: task_executor, ActionType.EMAIL: flaky_executor, ActionType.INVITE: RejectingExecutor()},
+        concurrency={ActionType.TASK: 2, ActionType.EMAIL: 1, ActionType.INVITE: 1},
+        poll_seconds=0.1,
+        lease_seconds=30,
+        backoff_seconds=0.05,
+        backoff_max_seconds=0.2,
+    )
+    # Route enqueue wake-ups to this pool instead of the app's
+    action_jobs.action_job_workers = workers
+    workers.start()
+
+    try:
+        # 1. Jobs run concurrently up to the type's worker count
+        print("--- Concurrent Task jobs ---")
+        items = [await create_item(ActionType.TASK) for _ in range(4)]
+        started = asyncio.get_running_loop().time()
+        jobs = [await action_jobs.enqueue(item, user_id) for item in items]
+        finished = [await wait_for_job(job["_id"]) for job in jobs]
+        elapsed = asyncio.get_running_loop().time() - started
+        print(f"4 jobs with 2 workers took {elapsed:.2f}s")
+        if any(job["status"] != "succeeded" for job in finished):
+            print(f"Expected every job to succeed: {finished}")
+            exit(1)
+        if not 0.35 < elapsed < 1.5:
+            print("Jobs did not run two at a time")
+            exit(1)
+        executed = await db.action_items.count_documents({"_id": {"$in": [item["_id"] for item in items]}, "status": "Executed"})
+        if executed != 4:
+            print(f"Expected 4 executed items, got {executed}")
+            exit(1)
+
+        # 2. Idempotency: the same item (or the same key) maps to the same job
+        print("\n--- Idempotency ---")
+        again = await action_jobs.enqueue(items[0], user_id)
+        if again["_id"] != jobs[0]["_id"] or task_executor.calls != 4:
+            print("Re-executing an item queued a second job")
+            exit(1)
+        keyed = await action_jobs.enqueue(items[0], user_id, "retry-1")
+        same_key = await action_jobs.enqueue_many([items[0], items[1]], user_id, "retry-1")
+        if keyed["_id"] == jobs[0]["_id"] or same_key[str(items[0]["_id"])]["_id"] != keyed["_id"]:
+            print("Idempotency keys were not honoured")
+            exit(1)
+        await wait_for_job(keyed["_id"])
+        await wait_for_job(same_key[str(items[1]["_id"])]["_id"])
+
+        # 3. Transient failures are retried with backoff
+        print("\n--- Retries ---")
+        email_job = await action_jobs.enqueue(await create_item(ActionType.EMAIL), user_id)
+        email_job = await wait_for_job(email_job["_id"])
+        print(f"Email job: {email_job['status']} after {email_job['attempts']} attempts")
+        if email_job["status"] != "succeeded" or email_job["attempts"] != 3:
+            print("Expected success on the third attempt")
+            exit(1)
+
+        # 4. Permanent errors fail immediately
+        print("\n--- Permanent failure ---")
+        invite_job = await action_jobs.enqueue(await create_item(ActionType.INVITE), user_id)
+        invite_job = await wait_for_job(invite_job["_id"])
+        print(f"Invite job: {invite_job['status']} ({invite_job.get('last_error')})")
+        if invite_job["status"] != "failed" or invite_job["attempts"] != 1:
+            print("Expected an immediate failure")
+            exit(1)
+        invite_item = await db.action_items.find_one({"_id": invite_job["action_item_id"]})
+        if invite_item["status"] != "Pending":
+            print("Failed job must leave the item pending")
+            exit(1)
+
+        # Executing it again without a key queues a new job, once
+        retry = await action_jobs.enqueue(invite_item, user_id)
+        print(f"Re-executed: {retry['status']} job {retry['_id']}")
+        if retry["_id"] == invite_job["_id"] or retry["status"] != "queued":
+            print("Expected a new queued job after a permanent failure")
+            exit(1)
+        if (await action_jobs.enqueue(invite_item, user_id))["_id"] != retry["_id"]:
+            print("A job that hasn't failed must still be reused")
+            exit(1)
+        if (await action_jobs.get_job(invite_job["_id"], user_id))["status"] != "failed":
+            print("The failed job must stay readable")
+            exit(1)
+        retry = await wait_for_job(retry["_id"])
+        retried = await action_jobs.enqueue_many([invite_item, items[0]], user_id)
+        if retried[str(invite_item["_id"])]["_id"] in (retry["_id"], invite_job["_id"]) or retried[str(items[0]["_id"])]["_id"] != jobs[0]["_id"]:
+            print("Bulk execution should only re-queue the failed item")
+            exit(1)
+        await wait_for_job(retried[str(invite_item["_id"])]["_id"])
+
+        # 5. A job whose lease expired is claimed again
+        print("\n--- Expired lease ---")
+        await workers.stop()
+        stuck = await action_jobs.enqueue(await create_item(ActionType.TASK), user_id)
+        await db.action_jobs.update_one(
+            {"_id": stuck["_id"]},
+            {"$set": {"status": "running", "lease_id": "dead-worker", "lease_until": stuck["created_at"] - timedelta(minutes=1)}},
+        )
+        ran = await workers.run_pending([ActionType.TASK])
+        if ran != 1:
+            print(f"Expected the expired job to be re-claimed once, ran {ran} jobs")
+            exit(1)
+        stuck = await action_jobs.get_job(stuck["_id"], user_id)
+        if stuck["status"] != "succeeded":
+            print(f"Expected the re-claimed job to succeed, got {stuck['status']}")
+            exit(1)
+
+        # 6. RetryLater reschedules without using up an attempt
+        print("\n--- Retry later ---")
+
+        class RateLimitedExecutor(ActionExecutor):
+            async def execute(self, item):
+                raise RetryLater(60)
+
+        workers.register_executor(ActionType.TASK, RateLimitedExecutor())
+        deferred = await action_jobs.enqueue(await create_item(ActionType.TASK), user_id)
+        await workers.run_pending([ActionType.TASK])
+        deferred = await action_jobs.get_job(deferred["_id"], user_id)
+        if deferred["status"] != "queued" or deferred["attempts"] != 0 or deferred["run_at"] <= deferred["created_at"]:
+            print(f"Expected a deferred job without a used attempt: {deferred}")
+            exit(1)
+        print(f"Stats: {workers.stats()['types']}")
+    finally:
+        await workers.stop()
+        await db.action_jobs.delete_many({"user_id": user_id})
+        await db.action_items.delete_many({"user_id": user_id})
+
+    print("\n--- Action Jobs Flow Verification Successful ---")
+
+
+asyncio.run(main())
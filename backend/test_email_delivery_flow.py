@@ -0,0 +1,123 @@
+import asyncio
+import os
+import socket
+import sys
+
+# Allow absolute imports from backend.* when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017/test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    print("This test needs a local SMTP stand-in: pip install aiosmtpd")
+    exit(1)
+
+from email.message import EmailMessage
+
+from backend.services.action_executors import EmailExecutor, PermanentActionError
+from backend.services.email_delivery import EmailDeliveryService, EmailRateLimited, SMTPTransport
+
+
+class Inbox:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def make_message(n: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "no-reply@example.com"
+    message["To"] = f"user{n}@example.com"
+    message["Subject"] = f"Message {n}"
+    message.set_content("Hello")
+    return message
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def main():
+    inbox = Inbox()
+    port = free_port()
+    controller = Controller(inbox, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    transport = SMTPTransport("127.0.0.1", port, pool_size=2)
+    delivery = EmailDeliveryService(transport, batch_size=20, linger_seconds=0.01, rate_per_minute=0, burst=0)
+    delivery.start()
+    try:
+        # 1. Many messages share a few pooled connections
+        print("--- Pooled, batched delivery ---")
+        await asyncio.gather(*(delivery.send(f"user-{n % 3}", make_message(n)) for n in range(60)))
+        stats = delivery.stats()
+        print(f"Stats: {stats}")
+        if len(inbox.messages) != 60 or stats["sent"] != 60:
+            print(f"Expected 60 delivered messages, got {len(inbox.messages)}")
+            exit(1)
+        if stats["transport"]["connections_opened"] > 2:
+            print("Connections were not reused")
+            exit(1)
+        if stats["batches"] >= 60:
+            print("Messages were not batched")
+            exit(1)
+
+        # 2. A connection the server dropped is reopened
+        print("\n--- Reconnect ---")
+        for connection in list(transport._idle.queue):
+            connection.close()
+        await delivery.send("user-0", make_message(60))
+        if len(inbox.messages) != 61:
+            print("Message was not delivered after the connection dropped")
+            exit(1)
+
+        # 3. Per-user rate limiting
+        print("\n--- Rate limiting ---")
+        delivery.rate_per_minute, delivery.burst = 60, 2
+        await delivery.send("limited", make_message(1))
+        await delivery.send("limited", make_message(2))
+        try:
+            await delivery.send("limited", make_message(3))
+            print("Third message should have been rate limited")
+            exit(1)
+        except EmailRateLimited as e:
+            print(f"Rate limited, retry after {e.retry_after:.2f}s")
+            if not 0 < e.retry_after <= 1.0:
+                print("Unexpected retry_after")
+                exit(1)
+        await delivery.send("someone-else", make_message(4))
+
+        # 4. Email executor
+        print("\n--- Email executor ---")
+        executor = EmailExecutor(delivery, "no-reply@example.com")
+        result = await executor.execute({
+            "user_id": "executor-user",
+            "description": "Email: send the report to dana@example.com",
+            "owner": None,
+        })
+        print(f"Result: {result}")
+        if result != {"recipients": ["dana@example.com"]} or inbox.messages[-1].rcpt_tos != ["dana@example.com"]:
+            print("Executor did not send to the address in the description")
+            exit(1)
+        try:
+            await executor.execute({"user_id": "executor-user", "description": "Email: John about the report"})
+            print("Expected a permanent error without a recipient")
+            exit(1)
+        except PermanentActionError as e:
+            print(f"Rejected: {e}")
+    finally:
+        await delivery.stop()
+        controller.stop()
+
+    print("\n--- Email Delivery Flow Verification Successful ---")
+
+
+asyncio.run(main())
@@ -0,0 +1,136 @@
+import http.client
+import json
+import queue
+import random
+import threading
+
+random_id = random.randint(1000, 9999)
+email = f"events_tester{random_id}@example.com"
+password = "password123"
+
+headers = {'Content-type': 'application/json'}
+
+def make_request(method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("localhost", 8000)
+    try:
+        conn.request(method, path, body, headers or {})
+        response = conn.getresponse()
+        data = response.read().decode()
+        return response.status, data
+    except ConnectionRefusedError:
+        print("Connection refused. Is the server running?")
+        exit(1)
+    finally:
+        conn.close()
+
+def open_stream(path, received):
+    """
+    Read server-sent events from `path` on a background thread into `received`
+    as (event, data) pairs.
+    """
+    conn = http.client.HTTPConnection("localhost", 8000, timeout=30)
+    conn.request("GET", path)
+    response = conn.getresponse()
+    if response.status != 200:
+        received.put(("error", response.status))
+        return conn
+
+    def read():
+        event, data = None, None
+        try:
+            for raw_line in response:
+                line = raw_line.decode().rstrip("\n")
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    data = json.loads(line[len("data: "):])
+                elif not line and event:
+                    received.put((event, data))
+                    event, data = None, None
+        except (OSError, ValueError, http.client.HTTPException):
+            pass
+
+    threading.Thread(target=read, daemon=True).start()
+    return conn
+
+def next_event(received, timeout=10):
+    try:
+        return received.get(timeout=timeout)
+    except queue.Empty:
+        print("No event arrived in time")
+        exit(1)
+
+# 1. Signup & Login to get token
+print(f"--- Signup & Login ({email}) ---")
+user_data = json.dumps({"email": email, "password": password})
+make_request("POST", "/auth/signup", user_data, headers)
+status, raw_data = make_request("POST", "/auth/login", user_data, headers)
+if status != 200:
+    print(f"Login failed with status {status}")
+    exit(1)
+token = json.loads(raw_data).get('access_token')
+auth_headers = {'Authorization': f'Bearer {token}', 'Content-type': 'application/json'}
+
+# 2. Streams need a token
+print("\n--- Unauthenticated stream ---")
+status, _ = make_request("GET", "/events/stream")
+print(f"Status: {status}")
+if status != 401:
+    print("Expected 401 without a token")
+    exit(1)
+
+# 3. Open a stream the way EventSource would, with ?token=
+print("\n--- Open stream ---")
+received = queue.Queue()
+open_stream(f"/events/stream?token={token}", received)
+event, data = next_event(received)
+print(f"{event}: {data}")
+if event != "hello" or "versions" not in data:
+    print("Expected a hello event with the current versions")
+    exit(1)
+
+# 4. Writes show up as events
+print("\n--- Meeting sync ---")
+make_request("POST", "/meetings/sync", headers=auth_headers)
+event, data = next_event(received)
+print(f"{event}: {data}")
+if event != "meetings.synced" or data["scope"] != "meetings":
+    print("Expected a meetings.synced event")
+    exit(1)
+
+print("\n--- Action item created and updated ---")
+status, raw_data = make_request("POST", "/action-items/", json.dumps({"description": "Send recap", "action_type": "Task"}), auth_headers)
+item_id = json.loads(raw_data)["_id"]
+event, data = next_event(received)
+print(f"{event}: {data}")
+if event != "action_item.created" or data["ids"] != [item_id]:
+    print("Expected an action_item.created event for the new item")
+    exit(1)
+created_version = data["version"]
+
+make_request("PATCH", f"/action-items/{item_id}", json.dumps({"status": "Completed"}), auth_headers)
+event, data = next_event(received)
+print(f"{event}: {data}")
+if event != "action_item.status_changed" or data["status"] != "Completed" or data["version"] != created_version + 1:
+    print("Expected an action_item.status_changed event with the next version")
+    exit(1)
+
+# 5. Other users' changes are not delivered
+print("\n--- Isolation ---")
+other_email = f"events_other{random_id}@example.com"
+other_data = json.dumps({"email": other_email, "password": password})
+make_request("POST", "/auth/signup", other_data, headers)
+_, raw_data = make_request("POST", "/auth/login", other_data, headers)
+other_headers = {'Authorization': f"Bearer {json.loads(raw_data)['access_token']}", 'Content-type': 'application/json'}
+make_request("POST", "/action-items/", json.dumps({"description": "Not yours", "action_type": "Task"}), other_headers)
+make_request("DELETE", f"/action-items/{item_id}", headers=auth_headers)
+event, data = next_event(received)
+print(f"{event}: {data}")
+if event != "action_item.deleted" or data["ids"] != [item_id]:
+    print("Expected only this user's action_item.deleted event")
+    exit(1)
+
+status, raw_data = make_request("GET", "/metrics")
+print("Broker: " + ", ".join(line for line in raw_data.splitlines() if line.startswith("app_events_")))
+
+print("\n--- Events Flow Verification Successful ---")
@@ -1,6 +1,7 @@
 import http.client
 import json
 import random
+import time
 
 # Reuse auth flow logic to get a token
 random_id = random.randint(1000, 9999)
@@ -87,12 +88,31 @@ status, raw_data = make_request("POST", f"/action-items/{item_id}/execute", head
 print(f"Status: {status}")
 print(f"Response: {raw_data}")
 
-if status != 200:
-    print("Execution failed")
+if status != 202:
+    print("Execution was not accepted")
+    exit(1)
+
+job_id = json.loads(raw_data)["job_id"]
+
+# Executing again returns the same job instead of queueing another
+status, raw_data = make_request("POST", f"/action-items/{item_id}/execute", headers=auth_headers)
+if status != 202 or json.loads(raw_data)["job_id"] != job_id:
+    print("Repeated execute did not return the original job")
     exit(1)
 
-if json.loads(raw_data)["status"] != "executed":
-    print("Unexpected response status")
+# 6. Poll the job until a worker has run it
+print(f"\n--- Poll Job ({job_id}) ---")
+for _ in range(50):
+    status, raw_data = make_request("GET", f"/action-items/jobs/{job_id}", headers=auth_headers)
+    job = json.loads(raw_data)
+    if status != 200 or job["status"] in ("succeeded", "failed"):
+        break
+    time.sleep(0.2)
+print(f"Status: {status}")
+print(f"Response: {raw_data}")
+
+if status != 200 or job["status"] != "succeeded":
+    print("Job did not succeed")
     exit(1)
 
 # Verify status update via GET
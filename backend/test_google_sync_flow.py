@@ -0,0 +1,202 @@
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Allow absolute imports from backend.* when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.fake_calendar_api import FakeCalendarServer, sample_event
+
+fake = FakeCalendarServer().start()
+os.environ["GOOGLE_CALENDAR_API_URL"] = fake.calendar_url
+os.environ["GOOGLE_TOKEN_URI"] = fake.token_url
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017/test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "fake-client-id")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "fake-client-secret")
+os.environ["GOOGLE_SYNC_PAGE_SIZE"] = "50"
+os.environ["GOOGLE_SYNC_BATCH_SIZE"] = "120"
+
+from backend.models.user import UserIntegrations
+from backend.services import google_calendar
+
+now = datetime.now(timezone.utc).replace(microsecond=0)
+fake.put_event(sample_event("evt-1", "Standup", now, location="zoom.us/j/1"))
+fake.put_event(sample_event("evt-2", "Review", now, attendees=[{"email": "a@example.com"}, {}]))
+
+
+async def main():
+    integrations = UserIntegrations(
+        google_calendar=True,
+        google_refresh_token="fake-refresh-token",
+        google_access_token="fake-access-token",
+    )
+
+    # 1. List events without blocking the loop
+    print("--- List events while the API is slow ---")
+    fake.delay_seconds = 0.5
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    creds = google_calendar.build_credentials(integrations)
+    result = await google_calendar.list_events(creds, calendarId="primary", singleEvents=True)
+    ticker_task.cancel()
+    fake.delay_seconds = 0
+    print(f"Got {len(result['items'])} events, event loop ticked {ticks} times meanwhile")
+
+    if len(result["items"]) != 2:
+        print("Expected 2 events")
+        exit(1)
+    if ticks < 10:
+        print("Event loop was blocked during the Calendar call")
+        exit(1)
+
+    # 2. Discovery document must come from the bundled copy
+    if any("discovery" in path for _, path in fake.requests):
+        print(f"Discovery document was fetched over HTTP: {fake.requests}")
+        exit(1)
+
+    # 3. Expired access token is refreshed transparently
+    print("\n--- Refresh rejected access token ---")
+    fake.valid_tokens.discard("fake-access-token")
+    creds = google_calendar.build_credentials(integrations)
+    await google_calendar.list_events(creds, calendarId="primary")
+    print(f"Token after call: {creds.token}")
+    if not creds.token.startswith("fake-refreshed-token"):
+        print("Token was not refreshed")
+        exit(1)
+
+    # 4. Concurrent syncs share the worker pool
+    print("\n--- Concurrent list calls ---")
+    fake.delay_seconds = 0.2
+    started = time.perf_counter()
+    await asyncio.gather(*[google_calendar.list_events(creds, calendarId="primary") for _ in range(4)])
+    elapsed = time.perf_counter() - started
+    fake.delay_seconds = 0
+    print(f"4 concurrent calls took {elapsed:.2f}s")
+    if elapsed > 0.6:
+        print("Calls were serialized")
+        exit(1)
+
+    # 5. Event mapping
+    from bson import ObjectId
+    meeting = google_calendar.event_to_meeting(result["items"][1], ObjectId())
+    if meeting["participants"] != ["a@example.com"] or meeting["start_time"] != now:
+        print(f"Unexpected meeting mapping: {meeting}")
+        exit(1)
+
+    # 6. Incremental sync against the configured database
+    print("\n--- Full then incremental calendar sync ---")
+    from backend.database import db
+    from backend.models.user import UserResponse
+    from backend.services import calendar_sync
+
+    inserted = await db.users.insert_one({
+        "email": f"sync_tester{random.randint(1000, 9999)}@example.com",
+        "hashed_password": "",
+        "is_active": True,
+        "integrations": integrations.model_dump(),
+    })
+    user = UserResponse(**await db.users.find_one({"_id": inserted.inserted_id}))
+    user_id = inserted.inserted_id
+    try:
+        result = await calendar_sync.sync_google_calendar(user)
+        print(f"First sync: {result}")
+        if result != {"synced_count": 2, "mode": "full"}:
+            print("Expected a full sync of 2 events")
+            exit(1)
+
+        standup = await db.meetings.find_one({"user_id": user_id, "google_event_id": "evt-1"})
+        await db.meetings.update_one({"_id": standup["_id"]}, {"$set": {"status": "processed"}})
+
+        fake.put_event(sample_event("evt-1", "Standup (moved)", now, minutes=45))
+        fake.cancel_event("evt-2")
+        fake.put_event(sample_event("evt-3", "Retro", now))
+        result = await calendar_sync.sync_google_calendar(user)
+        print(f"Second sync: {result}")
+        if result != {"synced_count": 3, "mode": "incremental"}:
+            print("Expected an incremental sync of 3 changes")
+            exit(1)
+
+        meetings = {m["google_event_id"]: m for m in await db.meetings.find({"user_id": user_id}).to_list(None)}
+        if sorted(meetings) != ["evt-1", "evt-3"]:
+            print(f"Unexpected meetings after incremental sync: {sorted(meetings)}")
+            exit(1)
+        moved = meetings["evt-1"]
+        if moved["_id"] != standup["_id"] or moved["status"] != "processed" or moved["title"] != "Standup (moved)":
+            print(f"Existing meeting was not updated in place: {moved}")
+            exit(1)
+
+        # 7. An expired sync token triggers a full resync of the window only
+        past = await db.meetings.insert_one({
+            "user_id": user_id, "google_event_id": "evt-past", "title": "Last quarter's planning",
+            "start_time": now - timedelta(days=60), "end_time": now - timedelta(days=60, minutes=-30),
+            "status": "processed", "sync_run": "earlier",
+        })
+        await db.action_items.insert_one({
+            "user_id": str(user_id), "meeting_id": str(past.inserted_id), "type": "Task", "description": "Follow up",
+        })
+        await db.meetings.insert_one({
+            "user_id": user_id, "google_event_id": "evt-deleted", "title": "Removed while the token was stale",
+            "start_time": now, "end_time": now + timedelta(minutes=30), "status": "pending", "sync_run": "earlier",
+        })
+        state = await db.calendar_sync_state.find_one({"user_id": user_id})
+        fake.expired_sync_tokens.add(state["sync_token"])
+        result = await calendar_sync.sync_google_calendar(user)
+        fake.expired_sync_tokens.clear()
+        print(f"Sync after 410: {result}")
+        if result["mode"] != "full":
+            print("Expected a full resync after 410 Gone")
+            exit(1)
+        remaining = {m["google_event_id"] for m in await db.meetings.find({"user_id": user_id}).to_list(None)}
+        if "evt-past" not in remaining or "evt-deleted" in remaining:
+            print(f"Full resync should only drop stale meetings inside its window: {sorted(remaining)}")
+            exit(1)
+
+        # 8. A new window forces a full sync of it, paged through
+        print("\n--- Paginated sync of a large calendar ---")
+        for i in range(300):
+            fake.put_event(sample_event(f"bulk-{i}", f"Block {i}", now + timedelta(days=5, minutes=i)))
+        pages_before = fake.pages_served
+        result = await calendar_sync.sync_google_calendar(user, calendar_sync.SyncWindow(days_back=1, days_ahead=7))
+        pages = fake.pages_served - pages_before
+        print(f"Wide window sync: {result} over {pages} pages")
+        if result != {"synced_count": 302, "mode": "full"} or pages != 7:
+            print("Expected a full sync of 302 events over 7 pages")
+            exit(1)
+        if await db.meetings.count_documents({"user_id": user_id}) != 303:
+            print("Not every page was written, or the past meeting was dropped")
+            exit(1)
+
+        # Later syncs without a window keep the stored one and stay incremental
+        fake.put_event(sample_event("evt-4", "Planning", now + timedelta(days=6)))
+        result = await calendar_sync.sync_google_calendar(user)
+        print(f"Sync with the stored window: {result}")
+        if result != {"synced_count": 1, "mode": "incremental"}:
+            print("Expected an incremental sync of the one new event")
+            exit(1)
+        state = await db.calendar_sync_state.find_one({"user_id": user_id})
+        if state["window"] != [1, 7]:
+            print(f"Expected the wider window to be kept: {state['window']}")
+            exit(1)
+    finally:
+        await db.meetings.delete_many({"user_id": user_id})
+        await db.action_items.delete_many({"user_id": str(user_id)})
+        await db.calendar_sync_state.delete_many({"user_id": user_id})
+        await db.users.delete_one({"_id": user_id})
+
+    google_calendar.shutdown()
+
+
+asyncio.run(main())
+fake.stop()
+print("\n--- Google Sync Flow Verification Successful ---")
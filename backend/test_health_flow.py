@@ -0,0 +1,60 @@
+import http.client
+import json
+import time
+
+def make_request(method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("localhost", 8000)
+    try:
+        conn.request(method, path, body, headers or {})
+        response = conn.getresponse()
+        data = response.read().decode()
+        return response.status, data
+    except ConnectionRefusedError:
+        print("Connection refused. Is the server running?")
+        exit(1)
+    finally:
+        conn.close()
+
+# 1. Liveness
+print("--- Liveness ---")
+status, data = make_request("GET", "/livez")
+print(f"Status: {status}, {data}")
+if status != 200:
+    print("Expected /livez to answer 200")
+    exit(1)
+
+# 2. Readiness, once the monitor has probed the database
+print("\n--- Readiness ---")
+for _ in range(20):
+    status, raw_data = make_request("GET", "/readyz")
+    if status == 200:
+        break
+    time.sleep(0.5)
+data = json.loads(raw_data)
+print(f"Status: {status}, {data}")
+if status != 200 or data["checks"]["db"] != "connected" or "loop_lag_ms" not in data["checks"]:
+    print("Expected a ready worker with a connected database")
+    exit(1)
+
+# 3. Probes are answered from the cached results, not by pinging Mongo
+print("\n--- Cached probes ---")
+probes = data["checks"]["probes"]
+started = time.perf_counter()
+for _ in range(50):
+    make_request("GET", "/readyz")
+elapsed_ms = (time.perf_counter() - started) * 1000
+status, raw_data = make_request("GET", "/healthz")
+health = json.loads(raw_data)
+status, raw_data = make_request("GET", "/readyz")
+probes_after = json.loads(raw_data)["checks"]["probes"]
+print(f"50 /readyz calls in {elapsed_ms:.0f} ms, probes {probes} -> {probes_after}")
+if health["db"] != "connected" or probes_after > probes + 1:
+    print("Expected /readyz and /healthz to reuse the monitor's probe")
+    exit(1)
+
+# 4. /healthz is public, so it only reports status
+if set(health) != {"status", "db"}:
+    print(f"/healthz exposes more than its status: {sorted(health)}")
+    exit(1)
+
+print("\n--- Health Flow Verification Successful ---")
@@ -22,6 +22,19 @@ def make_request(method, path, body=None, headers=None):
     finally:
         conn.close()
 
+def make_request_with_headers(method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("localhost", 8000)
+    try:
+        conn.request(method, path, body, headers or {})
+        response = conn.getresponse()
+        data = response.read().decode()
+        return response.status, data, response.headers
+    except ConnectionRefusedError:
+        print("Connection refused. Is the server running?")
+        exit(1)
+    finally:
+        conn.close()
+
 # 1. Signup & Login to get token
 print(f"--- Signup & Login ({email}) ---")
 user_data = json.dumps({"email": email, "password": password})
@@ -76,4 +89,125 @@ if updated_meeting['status'] != 'completed':
     print("Status update failed!")
     exit(1)
 
+# 5. Paginate Meetings
+print("\n--- Paginate Meetings (limit=2) ---")
+paged_ids = []
+cursor = None
+while True:
+    path = "/meetings/?limit=2" + (f"&cursor={cursor}" if cursor else "")
+    status, raw_data, response_headers = make_request_with_headers("GET", path, headers=auth_headers)
+    if status != 200:
+        print(f"Pagination failed: {raw_data}")
+        exit(1)
+    paged_ids.extend(m['_id'] for m in json.loads(raw_data))
+    cursor = response_headers.get("X-Next-Cursor")
+    if not cursor:
+        break
+print(f"Paged through {len(paged_ids)} meetings")
+
+if sorted(paged_ids) != sorted(m['_id'] for m in meetings):
+    print("Paginated meetings don't match the full list!")
+    exit(1)
+
+# 6. Date Filter
+print("\n--- Date Filter ---")
+status, raw_data = make_request("GET", "/meetings/?date=2001-01-01&tz=America/New_York", headers=auth_headers)
+print(f"Status: {status}")
+if status != 200 or json.loads(raw_data):
+    print("Expected no meetings on 2001-01-01")
+    exit(1)
+
+# 7. Daily dashboard
+print("\n--- Daily Dashboard ---")
+summary = json.dumps({"summary_text": "Task: Prepare the agenda\nEmail: Send the notes to the team"})
+status, _ = make_request("POST", f"/action-items/meetings/{first_meeting_id}/process", summary, auth_headers)
+if status != 200:
+    print("Processing the meeting summary failed")
+    exit(1)
+
+day = meetings[0]['start_time'][:10]
+status, raw_data = make_request("GET", f"/dashboard/?date={day}", headers=auth_headers)
+print(f"Status: {status}")
+dashboard = json.loads(raw_data)
+print(f"Meeting counts: {dashboard.get('meeting_counts')}, action item counts: {dashboard.get('action_item_counts')}")
+if status != 200:
+    print(f"Dashboard failed: {raw_data}")
+    exit(1)
+
+expected_ids = [m['_id'] for m in meetings if m['start_time'][:10] == day]
+dashboard_ids = [m['_id'] for m in dashboard['meetings']]
+if dashboard_ids != expected_ids:
+    print("Dashboard meetings don't match the meetings of that day!")
+    exit(1)
+first = next(m for m in dashboard['meetings'] if m['_id'] == first_meeting_id)
+if len(first['action_items']) != 2 or dashboard['action_item_counts']['Pending'] < 2:
+    print("Action items are missing from the dashboard!")
+    exit(1)
+if dashboard['meeting_counts'].get('completed', 0) < 1 or sum(dashboard['meeting_counts'].values()) != len(expected_ids):
+    print("Meeting counts are wrong!")
+    exit(1)
+
+# 8. Conditional GETs
+print("\n--- Conditional GETs ---")
+for path in ["/meetings/", "/action-items/", f"/dashboard/?date={day}"]:
+    status, _, response_headers = make_request_with_headers("GET", path, headers=auth_headers)
+    etag = response_headers.get("ETag")
+    status, raw_data, _ = make_request_with_headers("GET", path, headers={**auth_headers, "If-None-Match": etag})
+    print(f"{path}: ETag {etag}, revalidation status {status}")
+    if not etag or status != 304 or raw_data:
+        print(f"Expected 304 for an unchanged {path}")
+        exit(1)
+
+status, _, response_headers = make_request_with_headers("GET", "/meetings/", headers=auth_headers)
+meetings_etag = response_headers.get("ETag")
+status, _, response_headers = make_request_with_headers("GET", "/action-items/", headers=auth_headers)
+items_etag = response_headers.get("ETag")
+
+make_request("PATCH", f"/meetings/{first_meeting_id}/status", json.dumps({"status": "processed"}), auth_headers)
+status, _, response_headers = make_request_with_headers("GET", "/meetings/", headers={**auth_headers, "If-None-Match": meetings_etag})
+if status != 200 or response_headers.get("ETag") == meetings_etag:
+    print("Meetings still reported unchanged after a status update")
+    exit(1)
+status, _ = make_request("GET", "/action-items/", headers={**auth_headers, "If-None-Match": items_etag})
+if status != 304:
+    print("A meeting update must not change the action items version")
+    exit(1)
+
+make_request("POST", "/action-items/", json.dumps({"description": "Follow up", "action_type": "Task"}), auth_headers)
+status, _ = make_request("GET", "/action-items/", headers={**auth_headers, "If-None-Match": items_etag})
+if status != 200:
+    print("Action items still reported unchanged after a create")
+    exit(1)
+print("Writes invalidate the ETags of their own lists")
+
+# 9. Response cache
+print("\n--- Response cache ---")
+def cache_stats():
+    # From /metrics: app_response_cache_<field> gauges, memory ones only with a backend
+    lines = make_request("GET", "/metrics")[1].splitlines()
+    stats = {}
+    for line in lines:
+        if line.startswith("app_response_cache_"):
+            name, value = line.rsplit(" ", 1)
+            stats[name[len("app_response_cache_"):]] = float(value)
+    stats["backend"] = "none" if not any(name.startswith("memory_") for name in stats) else "enabled"
+    return stats
+
+_, first_body = make_request("GET", "/meetings/?limit=2", headers=auth_headers)
+before = cache_stats()
+status, cached_body, response_headers = make_request_with_headers("GET", "/meetings/?limit=2", headers=auth_headers)
+after = cache_stats()
+print(f"Cache: {after}")
+if after["backend"] != "none" and (after["hits"] != before["hits"] + 1 or cached_body != first_body or not response_headers.get("X-Next-Cursor")):
+    print("Expected the repeated request to be served from the cache with the same body and headers")
+    exit(1)
+
+make_request("PATCH", f"/meetings/{first_meeting_id}/status", json.dumps({"status": "pending"}), auth_headers)
+_, fresh_body = make_request("GET", "/meetings/?limit=2", headers=auth_headers)
+statuses = {meeting["_id"]: meeting["status"] for meeting in json.loads(fresh_body)}
+if statuses.get(first_meeting_id) != "pending":
+    print("Cached meetings served after a status update")
+    exit(1)
+print("Writes drop the cached responses of their own lists")
+
 print("\n--- Meeting Flow Verification Successful ---")
\ No newline at end of file
@@ -0,0 +1,77 @@
+import http.client
+import json
+import random
+
+random_id = random.randint(1000, 9999)
+email = f"metrics_tester{random_id}@example.com"
+password = "password123"
+
+headers = {'Content-type': 'application/json'}
+
+def make_request(method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("localhost", 8000)
+    try:
+        conn.request(method, path, body, headers or {})
+        response = conn.getresponse()
+        data = response.read().decode()
+        return response.status, data, response.headers
+    except ConnectionRefusedError:
+        print("Connection refused. Is the server running?")
+        exit(1)
+    finally:
+        conn.close()
+
+# 1. Signup & Login to get token
+print(f"--- Signup & Login ({email}) ---")
+user_data = json.dumps({"email": email, "password": password})
+make_request("POST", "/auth/signup", user_data, headers)
+status, raw_data, _ = make_request("POST", "/auth/login", user_data, headers)
+if status != 200:
+    print(f"Login failed with status {status}")
+    exit(1)
+token = json.loads(raw_data).get('access_token')
+auth_headers = {'Authorization': f'Bearer {token}', 'Content-type': 'application/json'}
+
+# 2. Server-Timing breaks the request down
+print("\n--- Server-Timing ---")
+make_request("POST", "/meetings/sync", headers=auth_headers)
+status, _, response_headers = make_request("GET", "/meetings/", headers=auth_headers)
+server_timing = response_headers.get("Server-Timing", "")
+print(f"Server-Timing: {server_timing}")
+phases = {entry.split(";")[0].strip() for entry in server_timing.split(",")}
+if not {"db", "auth", "serialize", "app"} <= phases:
+    print("Expected db, auth, serialize and app timings")
+    exit(1)
+
+# 3. Extraction is counted
+print("\n--- Extraction ---")
+status, raw_data, _ = make_request("GET", "/meetings/", headers=auth_headers)
+meeting_id = json.loads(raw_data)[0]["_id"]
+summary = json.dumps({"summary_text": "Action: Ship metrics\nEmail: Send the dashboard link"})
+status, _, _ = make_request("POST", f"/action-items/meetings/{meeting_id}/process", summary, auth_headers)
+print(f"Process status: {status}")
+
+# 4. /metrics
+print("\n--- /metrics ---")
+status, body, response_headers = make_request("GET", "/metrics")
+print(f"Status: {status}, {response_headers.get('Content-Type')}, {len(body)} bytes")
+expected = [
+    'http_requests_total{method="GET",route="/meetings/",status="200"}',
+    'http_request_duration_seconds_bucket{le="0.001",method="GET",route="/meetings/"}',
+    'http_request_mongo_commands_count{route="/meetings/"}',
+    'extraction_summaries_total{mode="inline"}',
+    'extraction_action_items_total{mode="inline"}',
+    "event_loop_lag_seconds_count",
+    "app_principal_cache_hits",
+    'app_action_jobs_workers{type="Email"}',
+    "app_response_cache_memory_bytes",
+]
+missing = [line for line in expected if line not in body]
+for line in body.splitlines():
+    if line.startswith(("http_requests_total", "extraction_")):
+        print(line)
+if status != 200 or missing:
+    print(f"Missing from /metrics: {missing}")
+    exit(1)
+
+print("\n--- Metrics Flow Verification Successful ---")
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import sys
+
+# Allow absolute imports from backend.* when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017/test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+from backend.auth.principal_cache import PrincipalCache
+from backend.models.user import UserResponse
+
+email = "principal_tester@example.com"
+loads = 0
+
+
+async def slow_loader(subject):
+    global loads
+    loads += 1
+    await asyncio.sleep(0.1)
+    return UserResponse(_id="0" * 24, email=subject)
+
+
+async def main():
+    global loads
+    cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+
+    # 1. Concurrent misses share one load
+    print("--- Coalesced misses ---")
+    principals = await asyncio.gather(*[cache.get(email, slow_loader) for _ in range(5)])
+    print(f"{loads} load(s) for 5 lookups, stats {cache.stats()}")
+    if loads != 1 or any(principal.email != email for principal in principals):
+        print("Expected one load shared by every lookup")
+        exit(1)
+
+    # 2. Cancelling the loading request doesn't fail the ones waiting on it
+    print("\n--- Cancelled leader ---")
+    cache.invalidate(email)
+    loads = 0
+    leader = asyncio.create_task(cache.get(email, slow_loader))
+    await asyncio.sleep(0.01)
+    waiters = [asyncio.create_task(cache.get(email, slow_loader)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    print(f"Waiters got {[type(result).__name__ for result in results]} after {loads} load(s)")
+    if not leader.cancelled() or any(not isinstance(result, UserResponse) for result in results):
+        print("Expected the waiters to retry and get the principal")
+        exit(1)
+    if loads != 2:
+        print("Expected the waiters to share one retried load")
+        exit(1)
+
+    # 3. A cancelled waiter is still cancelled
+    print("\n--- Cancelled waiter ---")
+    cache.invalidate(email)
+    leader = asyncio.create_task(cache.get(email, slow_loader))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(cache.get(email, slow_loader))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    principal = await leader
+    await asyncio.sleep(0)
+    if not waiter.cancelled() or principal.email != email:
+        print("Expected only the cancelled waiter to be cancelled")
+        exit(1)
+
+
+asyncio.run(main())
+print("\n--- Principal Cache Flow Verification Successful ---")
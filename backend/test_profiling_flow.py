@@ -0,0 +1,102 @@
+import hashlib
+import hmac
+import http.client
+import json
+import os
+import time
+
+# The server must list this email in ADMIN_EMAILS; set PROFILING_SECRET for both
+# to also check arming through the signed header
+email = os.environ.get("PROFILING_TEST_ADMIN", "profiling_admin@example.com")
+secret = os.environ.get("PROFILING_SECRET", "")
+password = "password123"
+
+headers = {'Content-type': 'application/json'}
+
+def make_request(method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("localhost", 8000)
+    try:
+        conn.request(method, path, body, headers or {})
+        response = conn.getresponse()
+        data = response.read().decode()
+        return response.status, data
+    except ConnectionRefusedError:
+        print("Connection refused. Is the server running?")
+        exit(1)
+    finally:
+        conn.close()
+
+# 1. Signup & Login as the admin
+print(f"--- Signup & Login ({email}) ---")
+user_data = json.dumps({"email": email, "password": password})
+make_request("POST", "/auth/signup", user_data, headers)
+status, raw_data = make_request("POST", "/auth/login", user_data, headers)
+if status != 200:
+    print(f"Login failed with status {status}")
+    exit(1)
+token = json.loads(raw_data).get('access_token')
+auth_headers = {'Authorization': f'Bearer {token}', 'Content-type': 'application/json'}
+make_request("POST", "/meetings/sync", headers=auth_headers)
+
+# 2. Arm a profile for the next requests to GET /meetings/
+print("\n--- Arm ---")
+status, raw_data = make_request("POST", "/admin/profiles", json.dumps({"route": "/meetings/", "requests": 20, "interval_ms": 1}), auth_headers)
+print(f"Status: {status}, {raw_data}")
+if status == 403:
+    print(f"Start the server with ADMIN_EMAILS={email}")
+    exit(1)
+if status != 201:
+    print("Failed to arm a profile")
+    exit(1)
+profile_id = json.loads(raw_data)["id"]
+
+status, _ = make_request("POST", "/admin/profiles", json.dumps({"route": "/meetings/"}), auth_headers)
+if status != 409:
+    print("Expected 409 while a profile is running")
+    exit(1)
+
+# 3. Requests to other routes don't count, the 20th meetings request ends it
+for _ in range(5):
+    make_request("GET", "/action-items/", headers=auth_headers)
+for _ in range(20):
+    make_request("GET", "/meetings/", headers=auth_headers)
+
+status, raw_data = make_request("GET", "/admin/profiles", headers=auth_headers)
+profile = json.loads(raw_data)[0]
+print(f"Profile: {profile}")
+if profile["id"] != profile_id or profile["ended_at"] is None or profile["profiled_requests"] != 20:
+    print("Expected the profile to end after 20 matching requests")
+    exit(1)
+
+# 4. Download the collapsed stacks
+print("\n--- Download ---")
+status, collapsed = make_request("GET", f"/admin/profiles/{profile_id}", headers=auth_headers)
+lines = collapsed.splitlines()
+print(f"Status: {status}, {len(lines)} distinct stacks")
+for line in lines[:3]:
+    print(line[:160])
+if status != 200 or profile["samples"] == 0 or not all(line.startswith("GET /meetings/;") for line in lines):
+    print("Expected collapsed stacks of GET /meetings/ only")
+    exit(1)
+
+# 5. Arming with a signed header
+print("\n--- Signed header ---")
+if not secret:
+    print("PROFILING_SECRET not set, skipped")
+else:
+    payload = f"route=/meetings/;requests=1;seconds=30;expires={int(time.time()) + 60}"
+    make_request("GET", "/meetings/", headers={**auth_headers, "X-Profile": f"{payload};signature=forged"})
+    status, raw_data = make_request("GET", "/admin/profiles", headers=auth_headers)
+    if json.loads(raw_data)[0]["id"] != profile_id:
+        print("A forged header armed a profile")
+        exit(1)
+    signature = hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
+    make_request("GET", "/meetings/", headers={**auth_headers, "X-Profile": f"{payload};signature={signature}"})
+    status, raw_data = make_request("GET", "/admin/profiles", headers=auth_headers)
+    latest = json.loads(raw_data)[0]
+    print(f"Profile: {latest}")
+    if latest["armed_by"] != "header" or latest["profiled_requests"] != 1:
+        print("Expected the signed header to profile its own request")
+        exit(1)
+
+print("\n--- Profiling Flow Verification Successful ---")